@@ -0,0 +1,81 @@
+"""Compare the overhead per value of the operation loop with the compiled operations.
+
+Run with ``python benchmarks/bench_compile_operations.py``
+"""
+from collections.abc import Callable
+from timeit import Timer
+
+from sml2mqtt.mqtt import MqttObj
+from sml2mqtt.sml_value import SmlValue
+from sml2mqtt.sml_value.base import ValueOperationBase
+from sml2mqtt.sml_value.operations import (
+    FactorOperation,
+    OffsetOperation,
+    OnChangeFilterOperation,
+    OrOperation,
+    RangeFilterOperation,
+    RefreshActionOperation,
+    RoundOperation,
+    SequenceOperation,
+    SkipZeroMeterOperation,
+)
+
+
+def default_filters() -> list[ValueOperationBase]:
+    return [OnChangeFilterOperation(), RefreshActionOperation(120)]
+
+
+def energy_meter() -> list[ValueOperationBase]:
+    return [FactorOperation(1 / 1000), SkipZeroMeterOperation(), RoundOperation(3), *default_filters()]
+
+
+def math_chain() -> list[ValueOperationBase]:
+    return [FactorOperation(3), OffsetOperation(100), RoundOperation(2), RangeFilterOperation(0, 10_000),
+            *default_filters()]
+
+
+def nested() -> list[ValueOperationBase]:
+    o = OrOperation()
+    o.add_operation(SequenceOperation().add_operation(FactorOperation(2)).add_operation(OnChangeFilterOperation()))
+    o.add_operation(RefreshActionOperation(60))
+    return [RangeFilterOperation(None, 5000), o]
+
+
+CHAINS: dict[str, Callable[[], list[ValueOperationBase]]] = {
+    'default filters': default_filters,
+    'energy meter': energy_meter,
+    'math chain': math_chain,
+    'nested': nested,
+}
+
+
+def create_value(factory: Callable[[], list[ValueOperationBase]], *, compiled: bool) -> SmlValue:
+    value = SmlValue('0100010800ff', MqttObj())
+    for op in factory():
+        value.add_operation(op)
+    if compiled:
+        value.compile_operations()
+    return value
+
+
+def main() -> None:
+    number = 100_000
+    values = [1000.5 + i for i in range(100)]
+
+    def run(value: SmlValue) -> Callable[[], None]:
+        process = value.process_operations
+
+        def func() -> None:
+            for v in values:
+                process(v, None)
+        return func
+
+    print(f'{"":16s} {"loop":>9s} {"compiled":>9s} {"speedup":>8s}')
+    for name, factory in CHAINS.items():
+        loop = min(Timer(run(create_value(factory, compiled=False))).repeat(5, number // 100)) / number
+        comp = min(Timer(run(create_value(factory, compiled=True))).repeat(5, number // 100)) / number
+        print(f'{name:16s} {loop * 1e9:7.0f}ns {comp * 1e9:7.0f}ns {loop / comp:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""Compare the default asyncio event loop with uvloop for the I/O of many devices.
+
+- serial: the frames are written to pipes which are read with a protocol, like the serial source does
+- http: the frames are requested from a local aiohttp server, like the http source does
+- mqtt: messages are published to a minimal local broker with the mqtt client
+
+uvloop is skipped if it is not installed (``pip install sml2mqtt[uvloop]``).
+
+Run with ``python benchmarks/bench_event_loop.py`` or ``python -m benchmarks.bench_event_loop``
+"""
+import sys
+from pathlib import Path
+
+
+# The repository root has to be importable for the shared benchmark code and the sample data of the tests,
+# also if the script is run directly with ``python benchmarks/<name>.py``
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import importlib.util
+import logging
+import os
+from time import perf_counter
+
+from aiohttp import ClientSession, web
+from aiomqtt import Client
+from benchmarks.bench_pipeline import STREAMS, create_device, default_config
+
+from sml2mqtt.__args__ import CMD_ARGS
+from sml2mqtt.mqtt import mqtt_obj
+from sml2mqtt.mqtt.mqtt import publish_batch
+from sml2mqtt.runtime import run_event_loop
+from sml2mqtt.sml_device import ALL_DEVICES, SmlDevice
+
+
+DEVICES = 50
+ROUNDS = 200
+CHUNK_SIZE = 64
+MESSAGES = 50_000
+BATCH_SIZE = 100
+
+STREAM = STREAMS['data 1']
+
+
+class PipeProtocol(asyncio.Protocol):
+    def __init__(self, device: SmlDevice) -> None:
+        self.device = device
+
+    def data_received(self, data: bytes) -> None:
+        self.device.on_source_data(data)
+
+
+async def wait_for_frames(devices: list[SmlDevice], frames: int) -> None:
+    while any(device.frames < frames for device in devices):
+        await asyncio.sleep(0)
+
+
+async def bench_serial(devices: list[SmlDevice]) -> float:
+    loop = asyncio.get_running_loop()
+
+    writers = []
+    readers = []
+    for device in devices:
+        r, w = os.pipe()
+        transport, _ = await loop.connect_read_pipe(lambda d=device: PipeProtocol(d), os.fdopen(r, 'rb', 0))
+        readers.append(transport)
+        writers.append(os.fdopen(w, 'wb', 0))
+
+    frames = min(device.frames for device in devices)
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        # serial ports deliver the data in small chunks
+        for pos in range(0, len(STREAM), CHUNK_SIZE):
+            for writer in writers:
+                writer.write(STREAM[pos: pos + CHUNK_SIZE])
+            await asyncio.sleep(0)
+        frames += 1
+        await wait_for_frames(devices, frames)
+    duration = perf_counter() - start
+
+    for transport in readers:
+        transport.close()
+    for writer in writers:
+        writer.close()
+    return DEVICES * ROUNDS / duration
+
+
+async def bench_http(devices: list[SmlDevice]) -> float:
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(body=STREAM)
+
+    app = web.Application()
+    app.router.add_get('/', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    async def poll(session: ClientSession, device: SmlDevice) -> None:
+        for _ in range(ROUNDS):
+            async with session.get(f'http://127.0.0.1:{port:d}/') as resp:
+                device.on_source_data(await resp.read())
+
+    start = perf_counter()
+    async with ClientSession() as session:
+        await asyncio.gather(*(poll(session, device) for device in devices))
+    duration = perf_counter() - start
+
+    await runner.cleanup()
+    return DEVICES * ROUNDS / duration
+
+
+async def handle_mqtt_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    # Minimal broker: accept the connection and discard everything else
+    await reader.read(1024)
+    writer.write(b'\x20\x02\x00\x00')
+    while await reader.read(64 * 1024):
+        pass
+    writer.close()
+
+
+async def bench_mqtt() -> float:
+    server = await asyncio.start_server(handle_mqtt_client, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    batch = [(f'sml2mqtt/device_{i % DEVICES:d}/0100010800ff', b'253.9184', 0, False, 0.)
+             for i in range(BATCH_SIZE)]
+
+    async with Client('127.0.0.1', port) as client:
+        start = perf_counter()
+        for _ in range(MESSAGES // BATCH_SIZE):
+            await publish_batch(client, batch)
+        duration = perf_counter() - start
+
+    server.close()
+    await server.wait_closed()
+    return MESSAGES / duration
+
+
+async def bench(name: str) -> None:
+    ALL_DEVICES._devices = ()
+    devices = [create_device(f'{name:s} {i:d}', STREAM, default_config) for i in range(DEVICES)]
+
+    serial = await bench_serial(devices)
+    http = await bench_http(devices)
+    mqtt = await bench_mqtt()
+    print(f'{name:10s} {serial:16.0f} {http:16.0f} {mqtt:16.0f}')
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+
+    def pub_func(topic: str, value: bytes, qos: int, retain: bool) -> None:
+        pass
+
+    mqtt_obj.pub_func = pub_func
+
+    print(f'{DEVICES:d} devices')
+    print(f'{"":10s} {"serial frames/s":>16s} {"http frames/s":>16s} {"mqtt msg/s":>16s}')
+    for name in ('asyncio', 'uvloop'):
+        if name == 'uvloop' and importlib.util.find_spec('uvloop') is None:
+            print(f'{name:10s} not installed')
+            continue
+
+        CMD_ARGS.event_loop = name
+        run_event_loop(bench(name))
+
+
+if __name__ == '__main__':
+    main()
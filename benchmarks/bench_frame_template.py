@@ -0,0 +1,48 @@
+"""Compare the decoding of the frame values through the learned frame template with parsing the frame.
+
+Run with ``python benchmarks/bench_frame_template.py``
+"""
+import logging
+from binascii import a2b_hex
+from timeit import Timer
+
+from sml2mqtt.const import EnhancedSmlFrame
+from sml2mqtt.sml_device.frame_template import FrameTemplate
+
+
+FRAMES = {
+    'frame 1': (
+        '760500531efa620062007263010176010105001bb4fe0b0a0149534b0005020de272620165001bb32e620163a71400760500531e'
+        'fb620062007263070177010b0a0149534b0005020de2070100620affff72620165001bb32e757707010060320101010101010449'
+        '534b0177070100600100ff010101010b0a0149534b0005020de20177070100010800ff65001c010401621e52ff650026bea90177'
+        '070100020800ff0101621e52ff62000177070100100700ff0101621b52005301100101016350ba00760500531efc620062007263'
+        '0201710163ba1900'
+    ),
+    'frame 2': (
+        '7605065850a66200620072630101760107ffffffffffff05021d70370b0a014c475a0003403b4972620165021d7707016326de'
+        '007605065850a762006200726307017707ffffffffffff0b0a014c475a0003403b49070100620affff72620165021d77077577'
+        '0701006032010101010101044c475a0177070100600100ff010101010b0a014c475a0003403b490177070100010800ff65001c'
+        '010472620165021d7707621e52ff690000000003152c450177070100020800ff0172620165021d7707621e52ff690000000000'
+        '0000000177070100100700ff0101621b52005900000000000000fb010101637264007605065850a86200620072630201710163'
+        '1c8c00'
+    ),
+}
+
+
+def main() -> None:
+    log = logging.getLogger('benchmark')
+    number = 10_000
+
+    print(f'{"":10s} {"parse":>10s} {"template":>10s} {"speedup":>8s}')
+    for name, data in FRAMES.items():
+        frame = EnhancedSmlFrame(a2b_hex(data))
+        template = FrameTemplate.create(frame, frame.get_frame_values(log))
+        assert template is not None
+
+        parse = min(Timer(lambda: frame.get_frame_values(log)).repeat(5, number)) / number
+        decode = min(Timer(lambda: template.get_frame_values(frame)).repeat(5, number)) / number
+        print(f'{name:10s} {parse * 1e6:8.1f}us {decode * 1e6:8.1f}us {parse / decode:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
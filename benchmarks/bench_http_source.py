@@ -0,0 +1,93 @@
+"""Poll many gateways which serve the same frame and compare the http source with and without
+conditional requests / skipping of unchanged responses.
+
+A local aiohttp server simulates the gateways. It supports ETag, so with ``skip unchanged`` it
+answers the repeated requests with 304. The CPU time of the process (server + client) is reported.
+
+Run with ``python benchmarks/bench_http_source.py`` or ``python -m benchmarks.bench_http_source``
+"""
+import sys
+from pathlib import Path
+
+
+# The repository root has to be importable for the shared benchmark code and the sample data of the tests,
+# also if the script is run directly with ``python benchmarks/<name>.py``
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import logging
+from time import perf_counter, process_time
+
+from aiohttp import ClientTimeout, hdrs, web
+from benchmarks.bench_pipeline import STREAMS, create_device, default_config
+
+from sml2mqtt.mqtt import mqtt_obj
+from sml2mqtt.sml_device import ALL_DEVICES
+from sml2mqtt.sml_source.http import HttpSource, close_session
+
+
+GATEWAYS = 50
+INTERVAL = 0.05
+DURATION = 5
+
+STREAM = STREAMS['data 1']
+
+
+async def handle(request: web.Request) -> web.Response:
+    if request.headers.get(hdrs.IF_NONE_MATCH) == '"1"':
+        return web.Response(status=304)
+    return web.Response(body=STREAM, headers={hdrs.ETAG: '"1"'})
+
+
+async def bench(port: int, *, skip_unchanged: bool) -> tuple[float, int]:
+    ALL_DEVICES._devices = ()
+    devices = [create_device(f'gateway {i:d}', STREAM, default_config) for i in range(GATEWAYS)]
+    sources = [
+        HttpSource(device, f'http://127.0.0.1:{port:d}/?gateway={i:d}', INTERVAL, None, ClientTimeout(5),
+                   skip_unchanged=skip_unchanged)
+        for i, device in enumerate(devices)
+    ]
+
+    start = process_time()
+    end = perf_counter() + DURATION
+    for source in sources:
+        source.start()
+    await asyncio.sleep(end - perf_counter())
+    duration = process_time() - start
+
+    for source in sources:
+        await source.cancel_and_wait()
+    return duration, sum(device.frames for device in devices)
+
+
+async def main_async() -> None:
+    app = web.Application()
+    app.router.add_get('/', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    print(f'{GATEWAYS:d} gateways polled every {INTERVAL:.2f}s for {DURATION:d}s')
+    print(f'{"":20s} {"cpu time":>9s} {"frames":>8s}')
+    for skip_unchanged in (False, True):
+        cpu, frames = await bench(port, skip_unchanged=skip_unchanged)
+        print(f'{f"skip unchanged={skip_unchanged}":20s} {cpu:8.2f}s {frames:8d}')
+
+    await close_session()
+    await runner.cleanup()
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+
+    def pub_func(topic: str, value: bytes, qos: int, retain: bool) -> None:
+        pass
+
+    mqtt_obj.pub_func = pub_func
+    asyncio.run(main_async())
+
+
+if __name__ == '__main__':
+    main()
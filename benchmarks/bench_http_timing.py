@@ -0,0 +1,66 @@
+"""Simulate a gateway which gets a new frame periodically and compare the fixed interval
+of the previous implementation with the adaptive ``PollTiming`` of the http source.
+
+For every combination of update period and configured interval the requests per update and the time from the
+update of the gateway until the data is requested (staleness) are reported.
+
+Run from the repository root with ``python -m benchmarks.bench_http_timing``
+"""
+import random
+
+from sml2mqtt.sml_source.http import PollTiming
+
+
+UPDATES = 2_000
+TIMEOUT = 6
+JITTER = 0.02
+
+
+class FixedTiming:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+
+    def on_response(self, now: float, *, changed: bool) -> None:
+        pass
+
+    def get_delay(self, now: float) -> float:
+        return self.interval
+
+
+def simulate(period: float, timing: PollTiming | FixedTiming) -> tuple[float, float, float]:
+    rnd = random.Random(1)
+    updates = [0.3 + i * period + rnd.uniform(-JITTER, JITTER) for i in range(UPDATES)]
+
+    requests = 0
+    staleness = []
+    seen = -1
+    now = 0.
+    while now < updates[-1]:
+        requests += 1
+        # index of the newest update which is available at the gateway
+        latest = seen
+        while latest + 1 < len(updates) and updates[latest + 1] <= now:
+            latest += 1
+
+        changed = latest != seen
+        if changed:
+            staleness.append(now - updates[latest])
+            seen = latest
+
+        timing.on_response(now, changed=changed)
+        now += timing.get_delay(now)
+
+    return requests / UPDATES, sum(staleness) / len(staleness), max(staleness)
+
+
+def main() -> None:
+    print(f'{"period":>6s} {"interval":>8s} {"":8s} {"requests/update":>15s} {"staleness mean":>14s} {"max":>6s}')
+    for period, interval in ((1, 1), (1, 2), (2, 1), (2.5, 1), (5, 2), (10, 3)):
+        for name, timing in (('fixed', FixedTiming(interval)), ('adaptive', PollTiming(interval, TIMEOUT / 2))):
+            requests, mean, max_staleness = simulate(period, timing)
+            print(f'{period:5.1f}s {interval:7.1f}s {name:8s} {requests:15.2f} {mean * 1e3:12.0f}ms '
+                  f'{max_staleness:5.2f}s')
+
+
+if __name__ == '__main__':
+    main()
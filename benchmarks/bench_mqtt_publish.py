@@ -0,0 +1,57 @@
+"""Compare the encoding of the payloads of a frame with and without the cached payload of the topic.
+
+Run with ``python benchmarks/bench_mqtt_publish.py``
+"""
+from collections.abc import Callable
+from timeit import Timer
+
+from sml2mqtt.mqtt import MqttObj, mqtt_obj
+
+
+def encode_publish(topic: str, value: int | float | str | bytes, qos: int, retain: bool) -> None:
+    # the mqtt lib encodes the payload when it is published
+    if not isinstance(value, bytes):
+        str(value).encode()
+
+
+def raw_publish(obj: MqttObj, value: int | float | str) -> None:
+    encode_publish(obj.topic, value, obj.qos, obj.retain)
+
+
+def create_frames(count: int, changing: int) -> list[list[int | float | str]]:
+    # A typical frame of a meter: 20 values of which only some change with every frame
+    frames = []
+    for i in range(count):
+        values: list[int | float | str] = [f'meter_{n:d}' for n in range(4)]
+        values.extend(round(1234.5 + n / 10, 1) for n in range(8))
+        values.extend(230 + n for n in range(8))
+        for n in range(changing):
+            values[4 + n] = round(values[4 + n] + i / 10, 1)
+        frames.append(values)
+    return frames
+
+
+def main() -> None:
+    number = 2_000
+    base = MqttObj('meter', 0, False).update()
+    objs = [base.create_child(f'value_{n:d}').update() for n in range(20)]
+
+    mqtt_obj.pub_func = encode_publish
+
+    def run(frames: list[list[int | float | str]], publish: Callable[[MqttObj, int | float | str], None]) -> Callable[[], None]:
+        def func() -> None:
+            for frame in frames:
+                for obj, value in zip(objs, frame, strict=True):
+                    publish(obj, value)
+        return func
+
+    print(f'{"changing values":16s} {"raw":>9s} {"cached":>9s} {"speedup":>8s}')
+    for changing in (0, 4, 8):
+        frames = create_frames(10, changing)
+        raw = min(Timer(run(frames, raw_publish)).repeat(5, number // 10)) / number / 20
+        cached = min(Timer(run(frames, MqttObj.publish)).repeat(5, number // 10)) / number / 20
+        print(f'{changing:16d} {raw * 1e9:7.0f}ns {cached * 1e9:7.0f}ns {raw / cached:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
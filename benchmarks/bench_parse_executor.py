@@ -0,0 +1,110 @@
+"""Measure how long the event loop is blocked while the frames of many devices are parsed.
+
+All devices receive a frame at the same time, which is what happens when many meters send with the same interval.
+The frame template is disabled, so every frame is parsed completely. While the frames are processed a task
+measures how late it is woken up by the event loop (lag). The parsing is done in the event loop ("none")
+or in the executor which is configured with ``parse executor``.
+
+Run with ``python benchmarks/bench_parse_executor.py`` or ``python -m benchmarks.bench_parse_executor``
+"""
+import sys
+from pathlib import Path
+
+
+# The repository root has to be importable for the shared benchmark code and the sample data of the tests,
+# also if the script is run directly with ``python benchmarks/<name>.py``
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import logging
+from time import perf_counter
+
+from benchmarks.bench_pipeline import STREAMS, percentile
+
+from sml2mqtt import CONFIG
+from sml2mqtt.mqtt import mqtt_obj
+from sml2mqtt.runtime import shutdown as shutdown_module
+from sml2mqtt.sml_device import ALL_DEVICES, DeviceStatus, SmlDevice, frame_parser
+
+
+DEVICES = 20
+ROUNDS = 50
+ROUND_INTERVAL = 0.05
+LAG_INTERVAL = 0.001
+
+
+async def measure_lag(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(perf_counter() - start - LAG_INTERVAL)
+
+
+async def wait_for_devices(devices: list[SmlDevice]) -> None:
+    while any(d.frame_parser is not None and (d.frame_parser.frames or d.frame_parser._event.is_set())
+              for d in devices):
+        await asyncio.sleep(0.001)
+
+
+async def run(kind: str, stream: bytes) -> tuple[float, list[float]]:
+    CONFIG.general.parse_executor = kind
+    shutdown_module.SHUTDOWN_OBJS = ()
+    ALL_DEVICES._devices = ()
+
+    devices = [ALL_DEVICES.add_device(SmlDevice(f'{kind:s} {i:d}')) for i in range(DEVICES)]
+    for device in devices:
+        if device.frame_parser is not None:
+            device.frame_parser.start()
+        # the first frame sets up the device
+        device.on_source_data(stream)
+    await wait_for_devices(devices)
+
+    # start the processes of the pool before the measurement
+    if (executor := frame_parser.get_parse_executor()) is not None:
+        await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(executor, sum, ()) for _ in range(32)))
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(measure_lag(lags, stop))
+
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        for device in devices:
+            device.on_source_data(stream)
+        await asyncio.sleep(ROUND_INTERVAL)
+    await wait_for_devices(devices)
+    duration = perf_counter() - start
+
+    stop.set()
+    await monitor
+
+    for device in devices:
+        assert device.status is DeviceStatus.OK, device.status
+        if device.frame_parser is not None:
+            await device.frame_parser.cancel_and_wait()
+    await frame_parser.shutdown_parse_executor()
+
+    lags.sort()
+    return duration, lags
+
+
+async def a_main() -> None:
+    logging.disable(logging.WARNING)
+    def pub_func(topic: str, value: bytes, qos: int, retain: bool) -> None:
+        pass
+
+    mqtt_obj.pub_func = pub_func
+    CONFIG.general.frame_template = False
+
+    print(f'{DEVICES:d} devices, {ROUNDS:d} frames per device, {ROUND_INTERVAL * 1e3:.0f}ms between the frames')
+    print(f'{"":18s} {"duration":>9s} {"lag p50":>9s} {"lag p99":>9s} {"lag max":>9s}')
+    for stream_name, stream in STREAMS.items():
+        for kind in ('none', 'thread', 'process'):
+            duration, lags = await run(kind, stream)
+            print(f'{stream_name + " " + kind:18s} {duration:8.2f}s '
+                  f'{percentile(lags, 0.5) * 1e3:7.2f}ms {percentile(lags, 0.99) * 1e3:7.2f}ms '
+                  f'{lags[-1] * 1e3:7.2f}ms')
+
+
+if __name__ == '__main__':
+    asyncio.run(a_main())
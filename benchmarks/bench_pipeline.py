@@ -0,0 +1,137 @@
+"""Measure the processing of the frames from ``tests/sml_data.py`` through the whole device:
+stream reader -> frame values -> operations of the values -> mqtt publish (stubbed).
+
+For every frame and configuration the frames per second, the percentiles of the processing time of a frame
+and the peak of the memory which is allocated while processing a frame are reported.
+
+Run with ``python benchmarks/bench_pipeline.py`` or ``python -m benchmarks.bench_pipeline``
+"""
+import sys
+from pathlib import Path
+
+
+# The repository root has to be importable for the shared benchmark code and the sample data of the tests,
+# also if the script is run directly with ``python benchmarks/<name>.py``
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import gc
+import logging
+import tracemalloc
+from collections.abc import Callable
+from time import perf_counter_ns
+
+from smllib.crc import x25
+from tests.sml_data import SML_DATA_1, SML_FRAME_1, SML_FRAME_2
+
+from sml2mqtt import CONFIG
+from sml2mqtt.config.device import SmlDeviceConfig, SmlValueConfig
+from sml2mqtt.mqtt import mqtt_obj
+from sml2mqtt.sml_device import ALL_DEVICES, DeviceStatus, SmlDevice
+from sml2mqtt.sml_device.stream_reader_group import SML_END, SML_ESCAPE, SML_START, StreamReaderGroup
+
+
+def create_transport(frame: bytes) -> bytes:
+    """Add the sml transport layer (escaping, padding and crc) to a frame"""
+    data = frame.replace(SML_ESCAPE, SML_ESCAPE * 2)
+    padding = -len(data) % 4
+    msg = SML_START + data + b'\x00' * padding + SML_END + bytes([padding])
+    return msg + x25.get_crc(msg).to_bytes(2, 'big')
+
+
+STREAMS: dict[str, bytes] = {
+    'data 1': SML_DATA_1,
+    'frame 1': create_transport(SML_FRAME_1),
+    'frame 2': create_transport(SML_FRAME_2),
+}
+
+
+def default_config(obis_ids: list[str]) -> SmlDeviceConfig | None:
+    return None
+
+
+def heavy_config(obis_ids: list[str]) -> SmlDeviceConfig:
+    # Every value is published for every frame, so this is the worst case
+    operations = [
+        {'factor': 3}, {'offset': 100}, {'round': 2},
+        {'type': 'range filter', 'min': -1_000_000, 'max': 1_000_000_000},
+        {'type': 'delta filter', 'min': 0},
+        {'refresh action': 120},
+    ]
+    return SmlDeviceConfig(values=[SmlValueConfig(obis=obis, operations=operations) for obis in obis_ids])
+
+
+CONFIGS: dict[str, Callable[[list[str]], SmlDeviceConfig | None]] = {
+    'default': default_config,
+    'heavy': heavy_config,
+}
+
+
+def create_device(name: str, stream: bytes, factory: Callable[[list[str]], SmlDeviceConfig | None]) -> SmlDevice:
+    reader = StreamReaderGroup(*CONFIG.general.crc)
+    reader.add(stream)
+    values = reader.get_frame().get_frame_values(logging.getLogger('benchmark'))
+    device_id = next(str(values.get_value(obis).get_value())
+                     for obis in CONFIG.general.device_id_obis if values.get_value(obis) is not None)
+
+    # The first frame sets up the values from the config of the device
+    CONFIG.devices.clear()
+    if (cfg := factory([obis for obis, entry in values.items(set()) if isinstance(entry.value, int)])) is not None:
+        CONFIG.devices[device_id] = cfg
+
+    # The device must be known, otherwise the status check initiates the shutdown
+    device = ALL_DEVICES.add_device(SmlDevice(name))
+    device.on_source_data(stream)
+    assert device.status is DeviceStatus.OK, device.status
+    return device
+
+
+def percentile(values: list[int], p: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+
+    published = 0
+
+    def pub_func(topic: str, value: bytes, qos: int, retain: bool) -> None:
+        nonlocal published
+        published += 1
+
+    mqtt_obj.pub_func = pub_func
+
+    number = 20_000
+    mem_number = 500
+
+    print(f'{"":18s} {"frames/s":>9s} {"p50":>8s} {"p90":>8s} {"p99":>8s} {"mem/frame":>10s} {"published":>10s}')
+    for stream_name, stream in STREAMS.items():
+        for cfg_name, factory in CONFIGS.items():
+            device = create_device(f'{stream_name:s} {cfg_name:s}', stream, factory)
+            process = device.on_source_data
+
+            published = 0
+            times: list[int] = []
+            gc.collect()
+            for _ in range(number):
+                start = perf_counter_ns()
+                process(stream)
+                times.append(perf_counter_ns() - start)
+            publish_count = published / number
+
+            tracemalloc.start()
+            peak = 0
+            for _ in range(mem_number):
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                process(stream)
+                peak += tracemalloc.get_traced_memory()[1] - base
+            tracemalloc.stop()
+
+            times.sort()
+            print(f'{stream_name + " " + cfg_name:18s} {number / (sum(times) / 1e9):9.0f} '
+                  f'{percentile(times, 0.5) / 1e3:6.1f}us {percentile(times, 0.9) / 1e3:6.1f}us '
+                  f'{percentile(times, 0.99) / 1e3:6.1f}us {peak / mem_number / 1024:7.1f}kB {publish_count:10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compare passing every chunk of the serial port to the device with passing only complete frames.
+
+The data of a frame is split in small chunks, like it is received on a serial port with a low baudrate.
+For every chunk size the calls of the device and the processing time per frame are reported.
+
+Run with ``python benchmarks/bench_serial_frames.py`` or ``python -m benchmarks.bench_serial_frames``
+"""
+import sys
+from pathlib import Path
+
+
+# The repository root has to be importable for the shared benchmark code and the sample data of the tests,
+# also if the script is run directly with ``python benchmarks/<name>.py``
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import logging
+from time import perf_counter
+
+from benchmarks.bench_pipeline import STREAMS, create_device, default_config
+
+from sml2mqtt.mqtt import mqtt_obj
+from sml2mqtt.sml_device import ALL_DEVICES
+from sml2mqtt.sml_source.serial import SerialSource, get_byte_time
+
+
+NUMBER = 2_000
+STREAM = STREAMS['data 1']
+
+
+class Transport:
+    _max_read_size = 0
+
+    def pause_reading(self) -> None:
+        pass
+
+
+def measure(process, chunks: list[bytes]) -> float:
+    start = perf_counter()
+    for _ in range(NUMBER):
+        for chunk in chunks:
+            process(chunk)
+    return (perf_counter() - start) / NUMBER
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+
+    def pub_func(topic: str, value: bytes, qos: int, retain: bool) -> None:
+        pass
+
+    mqtt_obj.pub_func = pub_func
+
+    print(f'{len(STREAM):d} bytes per frame')
+    print(f'{"":16s} {"device calls/frame":>19s} {"per chunk":>10s} {"per frame":>10s}')
+    for chunk_size in (8, 32, 128):
+        chunks = [STREAM[i: i + chunk_size] for i in range(0, len(STREAM), chunk_size)]
+
+        ALL_DEVICES._devices = ()
+        device = create_device(f'chunk {chunk_size:d}', STREAM, default_config)
+        per_chunk = measure(device.on_source_data, chunks)
+
+        calls = 0
+        on_source_data = device.on_source_data
+
+        def count_calls(data: bytes) -> None:
+            nonlocal calls
+            calls += 1
+            on_source_data(data)
+
+        device.on_source_data = count_calls
+        source = SerialSource(device, 'bench', get_byte_time(9600, 8, 'N', 1))
+        source.connection_made(Transport())
+        per_frame = measure(source.data_received, chunks)
+
+        print(f'{f"{chunk_size:d} byte chunks":16s} {len(chunks):9d} -> {calls / NUMBER:<6.0f} '
+              f'{per_chunk * 1e6:8.1f}us {per_frame * 1e6:8.1f}us')
+
+
+if __name__ == '__main__':
+    main()
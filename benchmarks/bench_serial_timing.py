@@ -0,0 +1,87 @@
+"""Simulate a meter which sends a frame every second on a serial port and compare the fixed read interval
+of the previous implementation with the adaptive ``ReadTiming`` of the serial source.
+
+For every baudrate the number of reads per frame (wakeups) and the time from the last byte of the frame
+on the wire until the frame is passed to the device (latency) are reported.
+
+Run with ``python benchmarks/bench_serial_timing.py`` or ``python -m benchmarks.bench_serial_timing``
+"""
+import sys
+from pathlib import Path
+
+
+# The repository root has to be importable for the shared benchmark code and the sample data of the tests,
+# also if the script is run directly with ``python benchmarks/<name>.py``
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from collections.abc import Callable
+
+from tests.sml_data import SML_DATA_1
+
+from sml2mqtt.sml_source.serial import ReadTiming, find_frame_end, get_byte_time
+
+
+FRAMES = 200
+PERIOD = 1.0
+
+
+class FixedTiming:
+    def on_frame(self, size: int, now: float) -> None:
+        pass
+
+    def get_pause(self, now: float, buffered: int) -> float:
+        return 0.2
+
+
+def simulate(byte_time: float, timing: ReadTiming | FixedTiming) -> tuple[float, float, float]:
+    frame = SML_DATA_1
+    # time when each byte was received by the serial port
+    arrival = [k * PERIOD + (i + 1) * byte_time for k in range(FRAMES) for i in range(len(frame))]
+    data = frame * FRAMES
+
+    reads = 0
+    latencies = []
+    buffered = 0
+    pos = 0
+    now = 0.
+    while pos < len(data):
+        # reading is active: the read happens as soon as data is available
+        now = max(now, arrival[pos])
+        end = pos
+        while end < len(data) and arrival[end] <= now:
+            end += 1
+
+        reads += 1
+        buf = data[pos - buffered: end]
+        if (size := find_frame_end(buf, 0)) != -1:
+            timing.on_frame(size, now)
+            buffered = len(buf) - size
+        else:
+            buffered = len(buf)
+        for frame_end in range(pos, end):
+            if frame_end % len(frame) == len(frame) - 1:
+                latencies.append(now - arrival[frame_end])
+        pos = end
+
+        now += timing.get_pause(now, buffered)
+
+    return reads / FRAMES, sum(latencies) / len(latencies), max(latencies)
+
+
+def main() -> None:
+    factories: dict[str, Callable[[float], ReadTiming | FixedTiming]] = {
+        'fixed 0.2s': lambda byte_time: FixedTiming(),
+        'adaptive': ReadTiming,
+    }
+
+    print(f'{len(SML_DATA_1):d} bytes per frame, one frame every {PERIOD:.1f}s')
+    print(f'{"":20s} {"reads/frame":>12s} {"latency mean":>13s} {"latency max":>12s}')
+    for baudrate in (9600, 115200):
+        byte_time = get_byte_time(baudrate, 8, 'N', 1)
+        for name, factory in factories.items():
+            reads, mean, max_latency = simulate(byte_time, factory(byte_time))
+            print(f'{f"{baudrate:d} {name:s}":20s} {reads:12.1f} {mean * 1e3:11.1f}ms {max_latency * 1e3:10.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
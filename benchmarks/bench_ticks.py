@@ -0,0 +1,93 @@
+"""Keep the values of stalled meters refreshing and compare polling all values in a fixed interval
+with the deadlines of the ``TICK_SCHEDULER``.
+
+Every value has a refresh action with a different period. The CPU time and the number of processed ticks are
+reported. Polling needs a short interval to refresh on time, the scheduler only processes the values which are due.
+
+Run from the repository root with ``python -m benchmarks.bench_ticks``
+"""
+import asyncio
+from time import monotonic, perf_counter, process_time
+
+from sml2mqtt.mqtt import MqttObj, mqtt_obj
+from sml2mqtt.sml_value import SmlValue
+from sml2mqtt.sml_value.operations import OnChangeFilterOperation, RefreshActionOperation
+
+
+VALUES = 5_000
+DURATION = 5
+POLL_INTERVAL = 0.1
+
+
+def create_values() -> list[SmlValue]:
+    mqtt = MqttObj(topic_fragment='bench', qos=0, retain=False).update()
+
+    values = []
+    for i in range(VALUES):
+        value = SmlValue(f'{i:012x}', mqtt.create_child(f'value{i:d}'))
+        value.add_operation(OnChangeFilterOperation())
+        value.add_operation(RefreshActionOperation(1 + i % 10 / 10))
+        # the last frame before the meter stalled
+        value.process_operations(i, None)
+        values.append(value)
+    return values
+
+
+async def bench_poll() -> tuple[float, int]:
+    values = create_values()
+    ticks = 0
+
+    start = process_time()
+    end = perf_counter() + DURATION
+    while perf_counter() < end:
+        now = monotonic()
+        for value in values:
+            value.process_tick(now)
+        ticks += len(values)
+        await asyncio.sleep(POLL_INTERVAL)
+    return process_time() - start, ticks
+
+
+async def bench_scheduler() -> tuple[float, int]:
+    values = create_values()
+    ticks = 0
+
+    for value in values:
+        process_tick = value.process_tick
+
+        def counted(timestamp: float, process_tick=process_tick) -> float | None:
+            nonlocal ticks
+            ticks += 1
+            return process_tick(timestamp)
+
+        value.process_tick = counted
+        value.start_ticks()
+
+    start = process_time()
+    await asyncio.sleep(DURATION)
+    duration = process_time() - start
+
+    for value in values:
+        value.stop_ticks()
+    return duration, ticks
+
+
+async def main_async() -> None:
+    print(f'{VALUES:d} values with a refresh every 1 - 1.9s, the meter stalls for {DURATION:d}s')
+    print(f'{"":22s} {"cpu time":>9s} {"ticks":>8s}')
+    cpu, ticks = await bench_poll()
+    print(f'{f"poll every {POLL_INTERVAL:.1f}s":22s} {cpu:8.2f}s {ticks:8d}')
+    cpu, ticks = await bench_scheduler()
+    print(f'{"scheduler":22s} {cpu:8.2f}s {ticks:8d}')
+
+
+def main() -> None:
+    def pub_func(topic: str, value: bytes, qos: int, retain: bool) -> None:
+        pass
+
+    mqtt_obj.pub_func = pub_func
+    asyncio.run(main_async())
+
+
+if __name__ == '__main__':
+    main()
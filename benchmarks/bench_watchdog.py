@@ -0,0 +1,101 @@
+"""Feed the watchdogs of many devices and compare one task per watchdog of the previous implementation
+with the shared ``WatchdogScheduler``.
+
+The CPU time of the feeds and the time the event loop spends on the watchdogs are reported.
+
+Run from the repository root with ``python -m benchmarks.bench_watchdog``
+"""
+import asyncio
+from asyncio import Event, TimeoutError, wait_for
+from time import perf_counter, process_time
+
+from sml2mqtt.const import Task
+from sml2mqtt.sml_device.watchdog import Watchdog
+
+
+DEVICES = 500
+FEED_INTERVAL = 0.01
+DURATION = 3
+TIMEOUT = 6
+
+
+class Device:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.timeouts = 0
+
+    def on_timeout(self) -> None:
+        self.timeouts += 1
+
+    def on_error(self, e: Exception) -> None:
+        raise e
+
+
+class TaskWatchdog:
+    """The previous implementation: every watchdog waits for the feed in its own task"""
+
+    def __init__(self, device: Device) -> None:
+        self.device = device
+        self._timeout = TIMEOUT
+        self._event = Event()
+        self._task = Task(self._wd_task, name=f'Watchdog Task {device.name:s}')
+
+    def set_timeout(self, timeout: float):
+        self._timeout = timeout
+        return self
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def cancel_and_wait(self) -> bool:
+        return await self._task.cancel_and_wait()
+
+    def feed(self) -> None:
+        self._event.set()
+
+    async def _wd_task(self) -> None:
+        while True:
+            self._event.clear()
+            try:
+                await wait_for(self._event.wait(), self._timeout)
+                continue
+            except TimeoutError:
+                pass
+            self.device.on_timeout()
+
+
+async def bench(factory: type[Watchdog | TaskWatchdog]) -> tuple[float, float]:
+    watchdogs = [factory(Device(f'device {i:d}')).set_timeout(TIMEOUT) for i in range(DEVICES)]
+    for watchdog in watchdogs:
+        watchdog.start()
+
+    feed = 0.
+    start = process_time()
+    end = perf_counter() + DURATION
+    while perf_counter() < end:
+        feed_start = process_time()
+        for watchdog in watchdogs:
+            watchdog.feed()
+        feed += process_time() - feed_start
+        await asyncio.sleep(FEED_INTERVAL)
+    total = process_time() - start
+
+    for watchdog in watchdogs:
+        await watchdog.cancel_and_wait()
+    return feed, total - feed
+
+
+async def main_async() -> None:
+    print(f'{DEVICES:d} watchdogs fed every {FEED_INTERVAL:.2f}s for {DURATION:d}s')
+    print(f'{"":12s} {"feed cpu":>9s} {"loop cpu":>9s}')
+    for name, factory in (('task', TaskWatchdog), ('scheduler', Watchdog)):
+        feed, loop = await bench(factory)
+        print(f'{name:12s} {feed:8.3f}s {loop:8.3f}s')
+
+
+def main() -> None:
+    asyncio.run(main_async())
+
+
+if __name__ == '__main__':
+    main()
@@ -56,6 +56,9 @@ setuptools.setup(
     package_dir={'': 'src'},
     python_requires='>=3.10',
     install_requires=load_req(),
+    extras_require={
+        'uvloop': ['uvloop >= 0.19; sys_platform != "win32"'],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Framework :: AsyncIO',
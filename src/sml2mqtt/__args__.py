@@ -8,6 +8,7 @@ from typing import Final
 class CommandArgs:
     config: Path | None = None
     analyze: bool = False
+    event_loop: str | None = None
 
 
 CMD_ARGS: Final = CommandArgs
@@ -32,9 +33,16 @@ def get_command_line_args(args=None) -> type[CommandArgs]:
         action='store_true',
         default=False
     )
+    parser.add_argument(
+        '--event-loop',
+        help='Implementation of the event loop, overrides the value from the configuration file',
+        choices=['asyncio', 'uvloop'],
+        default=None
+    )
     args = parser.parse_args(args)
     CMD_ARGS.config = find_config_folder(args.config)
     CMD_ARGS.analyze = args.analyze or bool(os.environ.get(env_var_name, ''))
+    CMD_ARGS.event_loop = args.event_loop
 
     return CMD_ARGS
 
@@ -4,15 +4,22 @@ import sys
 import traceback
 from typing import Final
 
-from sml2mqtt import mqtt
+from sml2mqtt import metrics, mqtt
 from sml2mqtt.__args__ import CMD_ARGS, get_command_line_args
 from sml2mqtt.__log__ import log, setup_log
 from sml2mqtt.config import CONFIG, cleanup_validation_errors
 from sml2mqtt.config.logging import LoggingFallback
 from sml2mqtt.const.task import wait_for_tasks
-from sml2mqtt.runtime import do_shutdown_async, on_shutdown, signal_handler_setup
-from sml2mqtt.sml_device import ALL_DEVICES, SmlDevice
-from sml2mqtt.sml_source import create_source
+from sml2mqtt.runtime import (
+    LOOP_MONITOR,
+    do_shutdown_async,
+    on_shutdown,
+    run_event_loop,
+    signal_handler_setup,
+    wait_for_shutdown,
+)
+from sml2mqtt.sml_device import ALL_DEVICES, create_devices
+from sml2mqtt.workers import WorkerGroup, get_input_groups
 
 
 async def a_main() -> None:
@@ -21,25 +28,35 @@ async def a_main() -> None:
 
     on_shutdown(ALL_DEVICES.cancel_and_wait, 'Stop devices')
 
+    # The workers have to be stopped before the mqtt connection
+    workers: WorkerGroup | None = None
+    if (workers_cfg := CONFIG.workers).processes > 1 and not CMD_ARGS.analyze:
+        workers = WorkerGroup(workers_cfg.processes, shared_mqtt=workers_cfg.mqtt == 'shared')
+        on_shutdown(workers.cancel_and_wait, 'Stop workers')
+
     try:
         if analyze := CMD_ARGS.analyze:
             mqtt.patch_analyze()
-        else:
+        elif workers is None or workers.shared_mqtt:
             # initial mqtt connect
             await mqtt.start()
             await mqtt.wait_for_connect(5)
+            await mqtt.start_diagnostics()
+            await metrics.start_metrics_server()
 
-        # Create device for each input
-        for input_cfg in CONFIG.inputs:
-            device = ALL_DEVICES.add_device(SmlDevice(input_cfg.get_device_name()))
-            device.set_source(await create_source(device, settings=input_cfg))
-            device.watchdog.set_timeout(input_cfg.timeout)
-            if analyze:
-                device.frame_handler = device.analyze_frame
+        if not analyze:
+            LOOP_MONITOR.start()
 
-        # Start all devices
-        log.debug(f'Starting {len(ALL_DEVICES):d} device{"" if len(ALL_DEVICES) == 1 else "s":s}')
-        await ALL_DEVICES.start()
+        if workers is not None:
+            log.debug(f'Distributing {len(CONFIG.inputs):d} inputs on {workers.count:d} processes')
+            workers.start(len(CONFIG.inputs), get_input_groups(CONFIG.inputs))
+        else:
+            # Create device for each input
+            await create_devices(CONFIG.inputs, analyze=analyze)
+
+            # Start all devices
+            log.debug(f'Starting {len(ALL_DEVICES):d} device{"" if len(ALL_DEVICES) == 1 else "s":s}')
+            await ALL_DEVICES.start()
 
     except Exception as e:
         log.error(f'{e.__class__.__name__} during startup: {e}')
@@ -48,6 +65,10 @@ async def a_main() -> None:
 
         await do_shutdown_async()
 
+    # Not every device has a task of its own (e.g. udp source in analyze mode),
+    # so the program runs until the shutdown is started
+    await wait_for_shutdown()
+
     # Keep tasks running
     await wait_for_tasks()
 
@@ -82,7 +103,7 @@ def main() -> int | str:
         # setup mqtt base topic
         mqtt.setup_base_topic(CONFIG.mqtt.topic, CONFIG.mqtt.defaults.qos, CONFIG.mqtt.defaults.retain)
 
-        asyncio.run(a_main())
+        run_event_loop(a_main())
     except Exception as e:
         for line in traceback.format_exc().splitlines():
             log.error(line)
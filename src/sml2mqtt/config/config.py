@@ -1,10 +1,15 @@
+from typing import Literal
+
 from easyconfig import AppBaseModel, BaseModel, Field, create_app_config
 
 from .device import SmlDeviceConfig, SmlValueConfig
+from .diagnostics import DiagnosticsSettings
 from .inputs import SerialSourceSettings, SmlSourceSettingType
 from .logging import LoggingSettings
+from .metrics import MetricsSettings
 from .mqtt import MqttConfig, OptionalMqttPublishConfig
 from .types import LowerStr, ObisHex
+from .workers import WorkersSettings
 
 
 class GeneralSettings(BaseModel):
@@ -35,6 +40,37 @@ class GeneralSettings(BaseModel):
         description='Which crc algorithms are used to calculate the checksum of the smart meter',
         alias='crc', in_file=False
     )
+    buffer_size: int = Field(
+        50 * 1024, ge=1024,
+        description='Maximum size of the receive buffer of each device in bytes',
+        alias='buffer size', in_file=False
+    )
+    frame_cache: bool = Field(
+        False,
+        description='Reuse the values of the previous frame instead of parsing the frame again '
+                    'if the reported values did not change. The time of the values (valTime) is not compared, '
+                    'so on a reuse it is the one of the last parsed frame. '
+                    'Use the frame template if the time of the values is required',
+        alias='frame cache', in_file=False
+    )
+    frame_template: bool = Field(
+        False,
+        description='Learn the layout of the frame and decode the values of subsequent frames '
+                    'directly from the learned positions',
+        alias='frame template', in_file=False
+    )
+    parse_executor: Literal['none', 'thread', 'process'] = Field(
+        'none',
+        description='Parse the frames in a thread or process pool so the event loop is not blocked while a frame '
+                    'is parsed. The frames of a device are still processed in order',
+        alias='parse executor', in_file=False
+    )
+    event_loop: Literal['asyncio', 'uvloop'] = Field(
+        'asyncio',
+        description='Implementation of the event loop. "uvloop" is faster but has to be installed separately, '
+                    'if it is not available the default event loop is used',
+        alias='event loop', in_file=False
+    )
 
 
 class Settings(AppBaseModel):
@@ -43,6 +79,9 @@ class Settings(AppBaseModel):
     general: GeneralSettings = Field(default_factory=GeneralSettings)
     inputs: list[SmlSourceSettingType] = Field(default_factory=list)
     devices: dict[LowerStr, SmlDeviceConfig] = Field({}, description='Device configuration by ID or url',)
+    diagnostics: DiagnosticsSettings = Field(default_factory=DiagnosticsSettings, in_file=False)
+    metrics: MetricsSettings = Field(default_factory=MetricsSettings, in_file=False)
+    workers: WorkersSettings = Field(default_factory=WorkersSettings, in_file=False)
 
 
 def default_config() -> Settings:
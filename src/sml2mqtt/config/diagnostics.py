@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from easyconfig import BaseModel, Field
+from pydantic import model_validator
+
+from sml2mqtt.config.mqtt import OptionalMqttPublishConfig
+
+
+class LoopMonitorSettings(BaseModel):
+    enabled: bool = Field(False, description='Measure how long the event loop is blocked')
+    interval: float = Field(
+        0.1, ge=0.01, description='Interval in seconds in which the delay of the event loop is measured'
+    )
+    slow_callback: float = Field(
+        0.05, gt=0, alias='slow callback',
+        description='Processing of the received data of a device which takes longer than this (in seconds) '
+                    'is reported as slow callback'
+    )
+    watchdog_grace: bool = Field(
+        False, alias='watchdog grace',
+        description='Extend the timeout of the watchdog by the time the event loop was blocked'
+    )
+
+
+class DiagnosticsSettings(BaseModel):
+    interval: int = Field(
+        0, ge=0, description='Interval in seconds in which the diagnostic values are published. 0 disables publishing'
+    )
+    mqtt: OptionalMqttPublishConfig = Field(
+        default_factory=lambda: OptionalMqttPublishConfig(topic='diagnostics'),
+        description='Topic under which the diagnostic values are published'
+    )
+    device_stats: bool = Field(
+        False, alias='device stats',
+        description='Measure the processing time of every stage of the devices. '
+                    'The statistics are published every interval on the "stats" topic of the device'
+    )
+    loop_monitor: LoopMonitorSettings = Field(
+        default_factory=LoopMonitorSettings, alias='loop monitor',
+        description='Monitor the delay of the event loop and the slowest callbacks of the devices'
+    )
+
+    @model_validator(mode='after')
+    def _check_interval(self) -> DiagnosticsSettings:
+        if self.device_stats and not self.interval:
+            msg = 'Device stats require an interval'
+            raise ValueError(msg)
+        return self
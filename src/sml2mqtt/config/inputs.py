@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Annotated, Literal, TypeAlias
 
 import serial
@@ -5,6 +6,7 @@ from aiohttp import ClientTimeout
 from easyconfig import BaseModel, Field
 from pydantic import (
     AnyHttpUrl,
+    IPvAnyAddress,
     StrictFloat,
     StrictInt,
     constr,
@@ -87,6 +89,16 @@ class HttpSourceSettings(SmlSourceSettingsBase):
         default=None, alias='request timeout', description='Dedicated timeout for the http request',
         in_file=False
     )
+    skip_unchanged: bool = Field(
+        default=True, alias='skip unchanged',
+        description='Send conditional requests (ETag / Last-Modified) and skip responses which are unchanged',
+        in_file=False
+    )
+    adaptive_interval: bool = Field(
+        default=True, alias='adaptive interval',
+        description='Learn when the gateway has new data and request it shortly after instead of every interval',
+        in_file=False
+    )
 
     @override
     def get_device_name(self) -> str:
@@ -113,4 +125,88 @@ class HttpSourceSettings(SmlSourceSettingsBase):
         return ClientTimeout(total=value)
 
 
-SmlSourceSettingType: TypeAlias = Annotated[HttpSourceSettings | SerialSourceSettings, Field(discriminator='type')]
+class TcpSourceSettings(SmlSourceSettingsBase):
+    type: Literal['tcp']
+
+    host: constr(strip_whitespace=True, min_length=1, strict=True) = Field(
+        ..., description='Hostname or IP of the serial-over-IP bridge (e.g. ser2net, ESP-Link)')
+    port: StrictInt = Field(..., ge=1, le=65535, description='Port of the bridge')
+    timeout: StrictInt | StrictFloat = Field(
+        default=6, description='Seconds after which a timeout will be detected (default=6)')
+
+    reconnect_delay: StrictInt | StrictFloat = Field(
+        default=60, gt=0, alias='reconnect delay', in_file=False,
+        description='Maximum delay between two connection attempts. The delay doubles with every failed attempt')
+
+    @override
+    def get_device_name(self) -> str:
+        return f'{self.host:s}:{self.port:d}'
+
+
+class UdpSourceSettings(SmlSourceSettingsBase):
+    type: Literal['udp']
+
+    port: StrictInt = Field(..., ge=1, le=65535, description='Port on which the packets are received')
+    sender: IPvAnyAddress | None = Field(
+        default=None, description='Address of the gateway. All packets from this address are passed to the device')
+    prefix: constr(strip_whitespace=True, min_length=2, strict=True, pattern=r'^([0-9a-fA-F]{2})+$') | None = Field(
+        default=None,
+        description='Hex prefix of the packets of the device, the prefix is removed before the data is processed')
+    timeout: StrictInt | StrictFloat = Field(
+        default=6, description='Seconds after which a timeout will be detected (default=6)')
+
+    bind: IPvAnyAddress = Field(
+        default='0.0.0.0', description='Address the socket is bound to', in_file=False)  # noqa: S104
+    multicast_group: IPvAnyAddress | None = Field(
+        default=None, alias='multicast group', description='Multicast group which is joined', in_file=False)
+
+    @model_validator(mode='after')
+    def check_sender_or_prefix(self):
+        if (self.sender is None) == (self.prefix is None):
+            msg = 'Either sender or prefix must be set'
+            raise ValueError(msg)
+        if self.multicast_group is not None and not self.multicast_group.is_multicast:
+            msg = f'{self.multicast_group} is not a multicast address'
+            raise ValueError(msg)
+        return self
+
+    def get_endpoint(self) -> tuple[str, int]:
+        """Inputs with the same endpoint share one socket"""
+        return str(self.bind), self.port
+
+    @override
+    def get_device_name(self) -> str:
+        if self.sender is not None:
+            return str(self.sender)
+        return f'udp_{self.prefix.lower():s}'
+
+
+class FileSourceSettings(SmlSourceSettingsBase):
+    type: Literal['file']
+
+    path: constr(strip_whitespace=True, min_length=1, strict=True) = Field(
+        ..., description='File with the recorded sml data (absolute or relative to config file)')
+    format: Literal['binary', 'hex'] = Field(
+        default='binary', description='Format of the file. For "hex" all whitespace is ignored')
+    timeout: StrictInt | StrictFloat = Field(
+        default=6, description='Seconds after which a timeout will be detected (default=6)')
+
+    speed: StrictInt | StrictFloat = Field(
+        default=1, ge=0, description='Replay speed: 1 is real time, 10 is ten times faster, 0 is as fast as possible')
+    interval: StrictInt | StrictFloat = Field(
+        default=0.2, gt=0, description='Delay between two chunks in real time')
+    chunk_size: StrictInt = Field(
+        default=192, ge=1, alias='chunk size',
+        description='Number of bytes which are passed at once. The default matches a serial port with 9600 baud')
+    repeat: StrictInt = Field(
+        default=1, ge=0, description='How often the file is replayed. 0 replays the file until the program stops')
+
+    @override
+    def get_device_name(self) -> str:
+        return Path(self.path).stem
+
+
+SmlSourceSettingType: TypeAlias = Annotated[
+    HttpSourceSettings | SerialSourceSettings | TcpSourceSettings | UdpSourceSettings | FileSourceSettings,
+    Field(discriminator='type')
+]
@@ -0,0 +1,10 @@
+from easyconfig import BaseModel, Field
+
+
+class MetricsSettings(BaseModel):
+    enabled: bool = Field(
+        False, description='Provide the metrics in the OpenMetrics format on http://host:port/metrics')
+    host: str = Field(
+        '0.0.0.0', description='Interface on which the metrics server listens')  # noqa: S104
+    port: int = Field(
+        9488, ge=1, le=65535, description='Port of the metrics server')
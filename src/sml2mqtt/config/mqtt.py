@@ -1,8 +1,9 @@
 import random
 import string
+from typing import Literal
 
-from easyconfig import BaseModel
-from pydantic import Field, StrictBool, field_validator, model_validator
+from easyconfig import BaseModel, Field
+from pydantic import StrictBool, field_validator, model_validator
 
 from sml2mqtt.config.mqtt_tls import MqttTlsOptions
 from sml2mqtt.config.types import MqttQosInt, MqttTopicStr, StrippedStr
@@ -56,6 +57,23 @@ class MqttConnection(BaseModel):
     tls: MqttTlsOptions | None = Field(None)
 
 
+class MqttQueueConfig(BaseModel):
+    size: int = Field(
+        1000, ge=1, description='Maximum number of messages which are queued for publishing')
+    policy: Literal['drop oldest', 'drop newest', 'keep latest per topic'] = Field(
+        'drop oldest', description='Which message will be dropped if the queue is full. '
+                                   '"keep latest per topic" queues only the latest value of every topic')
+    spill_file: str | None = Field(
+        None, alias='spill file',
+        description='File (absolute or relative to config file) where messages with QoS >= 1 are stored if they '
+                    'would be dropped or are still queued on shutdown. They will be published later in the order '
+                    'they were stored before the messages which are queued at that time. '
+                    'Messages which were published while they were stored in the file are newer, '
+                    'so for the same topic these newer values will be published first.')
+    spill_size: int = Field(
+        1024 * 1024, ge=1024, alias='spill size', description='Maximum size of the spill file in bytes')
+
+
 class MqttConfig(BaseModel):
     connection: MqttConnection = Field(
         default_factory=MqttConnection)
@@ -65,3 +83,5 @@ class MqttConfig(BaseModel):
         default_factory=MqttDefaultPublishConfig)
     last_will: OptionalMqttPublishConfig = Field(
         default_factory=lambda: OptionalMqttPublishConfig(topic='status'), alias='last will')
+    queue: MqttQueueConfig = Field(
+        default_factory=MqttQueueConfig, in_file=False)
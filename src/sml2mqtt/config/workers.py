@@ -0,0 +1,13 @@
+from typing import Literal
+
+from easyconfig import BaseModel, Field
+
+
+class WorkersSettings(BaseModel):
+    processes: int = Field(
+        1, ge=1, description='Number of processes on which the inputs are distributed. '
+                             'With 1 everything runs in the main process')
+    mqtt: Literal['shared', 'per process'] = Field(
+        'shared', description='"shared": the main process publishes the values of all processes with one connection. '
+                              '"per process": every process has its own mqtt connection and its own status topic '
+                              '(status topic with "/worker_<n>" appended)')
@@ -1,5 +1,5 @@
 from .date_time_finder import DateTimeFinder, get_now
 from .protocols import DeviceProto, SourceProto
-from .sml_helpers import EnhancedSmlFrame, SmlFrameValues
+from .sml_helpers import SML_END, SML_ESCAPE, SML_START, EnhancedSmlFrame, SmlFrameValues
 from .task import DeviceTask, Task, create_task
 from .time_series import DurationType, TimeSeries, get_duration
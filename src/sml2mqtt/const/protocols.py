@@ -11,6 +11,9 @@ class DeviceProto(Protocol):
     def on_source_data(self, data: bytes) -> None:
         ...
 
+    def on_source_unchanged(self) -> None:
+        ...
+
     def on_source_failed(self, reason: str) -> None:
         ...
 
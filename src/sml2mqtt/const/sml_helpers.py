@@ -14,6 +14,107 @@ if TYPE_CHECKING:
     from smllib.sml import SmlListEntry
 
 
+SML_START: Final = b'\x1B\x1B\x1B\x1B\x01\x01\x01\x01'
+SML_END: Final = b'\x1B\x1B\x1B\x1B\x1A'
+SML_ESCAPE: Final = b'\x1B\x1B\x1B\x1B'
+
+
+def skip_sml_value(buf: bytes, pos: int) -> int:
+    """Return the position after the sml value that starts at pos. No objects are created, only the
+    type-length fields are evaluated."""
+    open_values = 1
+    while open_values:
+        open_values -= 1
+
+        tl = buf[pos]
+
+        # End of a SmlMsg
+        if not tl:
+            pos += 1
+            continue
+
+        is_list = tl & 0x70 == 0x70  # noqa: PLR2004
+        size = tl & 0x0F
+        tl_size = 1
+        while tl & 0x80:
+            tl = buf[pos + tl_size]
+            size = size << 4 | tl & 0x0F
+            tl_size += 1
+
+        if is_list:
+            open_values += size
+            pos += tl_size
+        else:
+            # size includes the type-length field
+            pos += size
+    return pos
+
+
+def get_sml_list_size(buf: bytes, pos: int) -> tuple[int, int]:
+    """Return the number of entries of the sml list at pos and the position of the first entry"""
+    tl = buf[pos]
+    if tl & 0x70 != 0x70:  # noqa: PLR2004
+        msg = f'Expected list at {pos:d}'
+        raise ValueError(msg)
+
+    count = tl & 0x0F
+    pos += 1
+    while tl & 0x80:
+        tl = buf[pos]
+        count = count << 4 | tl & 0x0F
+        pos += 1
+    return count, pos
+
+
+def get_list_entry_positions(buf: bytes) -> list[int]:
+    """Return the start positions of all list entries of all SmlGetListResponse messages in the frame.
+    Only the type-length fields of the messages are evaluated, so this is much cheaper than parsing the frame.
+    """
+    ret = []
+
+    pos = 0
+    end = len(buf)
+    while pos < end:
+        # padding
+        if not buf[pos]:
+            pos += 1
+            continue
+
+        # SmlMessage: transaction id, group no, abort on error, message body, crc, end of message
+        if buf[pos] != 0x76:  # noqa: PLR2004
+            msg = f'No start of SML Message found at {pos:d}'
+            raise ValueError(msg)
+
+        body = pos + 1
+        for _ in range(3):
+            body = skip_sml_value(buf, body)
+        msg_end = skip_sml_value(buf, pos)
+        pos = msg_end
+
+        # message body is a choice: type, content
+        choice_tl = buf[body + 1]
+        if buf[body] != 0x72 or choice_tl & 0xF0 != 0x60:  # noqa: PLR2004
+            continue
+        if int.from_bytes(buf[body + 2: body + 1 + (choice_tl & 0x0F)], 'big') != 0x0701:  # noqa: PLR2004
+            continue
+
+        # SmlGetListResponse: client id, server id, list name, act sensor time, val list, ...
+        val_list = skip_sml_value(buf, body + 1) + 1
+        for _ in range(4):
+            val_list = skip_sml_value(buf, val_list)
+
+        count, entry = get_sml_list_size(buf, val_list)
+        for _ in range(count):
+            ret.append(entry)
+            entry = skip_sml_value(buf, entry)
+
+        if entry > msg_end:
+            msg = f'List entries exceed message at {val_list:d}'
+            raise ValueError(msg)
+
+    return ret
+
+
 class EnhancedSmlFrame(SmlFrame):
 
     def __init__(self, *args, **kwargs) -> None:
@@ -33,7 +134,7 @@ class EnhancedSmlFrame(SmlFrame):
             yield from obj.format_msg().splitlines()
         yield ''
 
-    def get_frame_values(self, log: Logger) -> SmlFrameValues:
+    def get_list_entries(self, log: Logger) -> list[SmlListEntry]:
 
         # try shortcut, if that fails try parsing the whole frame
         try:
@@ -46,7 +147,37 @@ class EnhancedSmlFrame(SmlFrame):
                 for val in getattr(msg.message_body, 'val_list', []):
                     sml_objs.append(val)
 
-        return SmlFrameValues.create(self.timestamp, sml_objs)
+        return sml_objs
+
+    def get_frame_values(self, log: Logger) -> SmlFrameValues:
+        return SmlFrameValues.create(self.timestamp, self.get_list_entries(log))
+
+    def get_values_key(self) -> bytes | None:
+        """Return the bytes of all list entries in the frame without the time of the entries.
+        Fields which change with every frame (e.g. transaction id, seconds index or crc) are not part of the list
+        entries, so the key stays the same as long as the reported values do not change.
+        """
+        buf = self.bytes
+        parts = []
+
+        try:
+            for start in get_list_entry_positions(buf):
+                # obis and status
+                val_time = skip_sml_value(buf, skip_sml_value(buf, start + 1))
+                parts.append(buf[start:val_time])
+
+                # skip val_time, keep unit, scaler, value and signature
+                unit = skip_sml_value(buf, val_time)
+                end = unit
+                for _ in range(4):
+                    end = skip_sml_value(buf, end)
+                parts.append(buf[unit:end])
+        except (IndexError, ValueError):
+            return None
+
+        if not parts:
+            return None
+        return b''.join(parts)
 
 
 class SmlFrameValues:
@@ -61,6 +192,11 @@ class SmlFrameValues:
         self.timestamp: Final = timestamp
         self.values: Final[dict[str, SmlListEntry]] = {}
 
+    def copy(self, timestamp: float) -> SmlFrameValues:
+        c = self.__class__(timestamp)
+        c.values.update(self.values)
+        return c
+
     def __getattr__(self, item: str) -> SmlListEntry:
         return self.values[item]
 
@@ -0,0 +1,2 @@
+from .metrics import get_metrics
+from .server import start_metrics_server
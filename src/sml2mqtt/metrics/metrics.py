@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final, Literal
+
+from sml2mqtt.mqtt import mqtt
+from sml2mqtt.sml_device import ALL_DEVICES
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+CONTENT_TYPE: Final = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+PREFIX: Final = 'sml2mqtt_'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricFamily:
+    def __init__(self, name: str, metric_type: Literal['counter', 'gauge', 'summary'], description: str) -> None:
+        self.name: Final = PREFIX + name
+        self.type: Final = metric_type
+        self.description: Final = description
+        self.samples: Final[list[tuple[str, dict[str, str], int | float]]] = []
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} {self.name:s} samples={len(self.samples):d}>'
+
+    def add(self, value: int | float, suffix: str = '', **labels: str) -> MetricFamily:
+        if not suffix and self.type == 'counter':
+            suffix = '_total'
+        self.samples.append((suffix, labels, value))
+        return self
+
+    def render(self) -> Iterator[str]:
+        yield f'# TYPE {self.name:s} {self.type:s}'
+        yield f'# HELP {self.name:s} {_escape(self.description):s}'
+        for suffix, labels, value in self.samples:
+            label_str = ','.join(f'{name:s}="{_escape(value):s}"' for name, value in labels.items())
+            yield f'{self.name:s}{suffix:s}{{{label_str:s}}} {value}' if label_str else \
+                f'{self.name:s}{suffix:s} {value}'
+
+
+def collect_device_metrics() -> list[MetricFamily]:
+    frames = MetricFamily('frames', 'counter', 'Number of received frames')
+    crc_errors = MetricFamily('crc_errors', 'counter', 'Number of frames with a crc error')
+    status = MetricFamily('device_status_changes', 'counter', 'Number of changes to the device status')
+    timeouts = MetricFamily('watchdog_timeouts', 'counter', 'Number of watchdog timeouts')
+    processed = MetricFamily('value_processed', 'counter', 'Number of values that were passed to the operations')
+    published = MetricFamily('value_published', 'counter', 'Number of values that passed all operations')
+
+    for device in ALL_DEVICES:
+        name = device.name
+        frames.add(device.frames, device=name)
+        for crc, count in device.crc_errors.items():
+            crc_errors.add(count, device=name, crc=crc)
+        for device_status, count in device.status_changes.items():
+            status.add(count, device=name, status=device_status)
+        timeouts.add(device.timeouts, device=name)
+
+        for value in device.sml_values:
+            processed.add(value.processed, device=name, obis=value.obis)
+            published.add(value.published, device=name, obis=value.obis)
+
+    return [frames, crc_errors, status, timeouts, processed, published]
+
+
+def collect_mqtt_metrics() -> list[MetricFamily]:
+    if (queue := mqtt.QUEUE) is None:
+        return []
+
+    return [
+        MetricFamily('mqtt_queue_size', 'gauge', 'Number of messages which are waiting to be published')
+        .add(len(queue)),
+        MetricFamily('mqtt_published', 'counter', 'Number of published messages').add(queue.published),
+        MetricFamily('mqtt_dropped', 'counter', 'Number of messages dropped because the queue was full')
+        .add(queue.dropped),
+        MetricFamily('mqtt_spilled', 'counter', 'Number of messages stored in the spill file').add(queue.spilled),
+        MetricFamily('mqtt_publish_latency_seconds', 'summary', 'Time from queueing to publishing a message')
+        .add(queue.latency_sum, '_sum').add(queue.published, '_count'),
+    ]
+
+
+def render_metrics(families: Iterable[MetricFamily]) -> str:
+    lines = [line for family in families for line in family.render()]
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def get_metrics() -> str:
+    return render_metrics([*collect_device_metrics(), *collect_mqtt_metrics()])
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from aiohttp import web
+
+import sml2mqtt
+from sml2mqtt.__log__ import get_logger
+from sml2mqtt.runtime import on_shutdown
+
+from .metrics import CONTENT_TYPE, get_metrics
+
+
+log = get_logger('metrics')
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    # the values are only collected when the metrics are requested
+    return web.Response(body=get_metrics().encode(), headers={'Content-Type': CONTENT_TYPE})
+
+
+def create_app() -> web.Application:
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    return app
+
+
+async def start_metrics_server() -> None:
+    cfg = sml2mqtt.config.CONFIG.metrics
+    if not cfg.enabled:
+        return None
+
+    runner = web.AppRunner(create_app(), access_log=None)
+    await runner.setup()
+    on_shutdown(runner.cleanup, 'Stop metrics server')
+
+    await web.TCPSite(runner, cfg.host, cfg.port).start()
+    log.debug(f'Metrics available on http://{cfg.host:s}:{cfg.port:d}/metrics')
+    return None
@@ -5,3 +5,8 @@ from .mqtt import publish, start, wait_for_connect
 # isort: split
 
 from .mqtt_obj import BASE_TOPIC, MqttObj, check_for_duplicate_topics, patch_analyze, setup_base_topic
+
+
+# isort: split
+
+from .diagnostics import register_diagnostics, start_diagnostics
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from asyncio import sleep
+from typing import TYPE_CHECKING, Final
+
+import sml2mqtt
+from sml2mqtt.const import Task
+from sml2mqtt.runtime import on_shutdown
+
+from .mqtt_obj import BASE_TOPIC
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .mqtt_obj import MqttObj
+
+
+DIAGNOSTICS: Final[dict[str, Callable[[], dict[str, int | float | str]]]] = {}
+
+TASK: Task | None = None
+
+
+def register_diagnostics(name: str, func: Callable[[], dict[str, int | float | str]]) -> None:
+    """Register a function which returns the diagnostic values. They are published as name/value"""
+    if name in DIAGNOSTICS:
+        msg = f'Diagnostics for "{name:s}" already registered'
+        raise ValueError(msg)
+    DIAGNOSTICS[name] = func
+
+
+def publish_values(parent: MqttObj, topics: dict[tuple[str, str], MqttObj],
+                   name: str, values: dict[str, int | float | str]) -> None:
+    """Publish the values as parent/name/key. The created mqtt objects are stored in topics."""
+    for key, value in values.items():
+        if (obj := topics.get((name, key))) is None:
+            obj = topics[(name, key)] = parent.create_child(f'{name:s}/{key:s}')
+        obj.publish(value)
+
+
+def publish_diagnostics(parent: MqttObj, topics: dict[tuple[str, str], MqttObj]) -> None:
+    for name, func in DIAGNOSTICS.items():
+        publish_values(parent, topics, name, func())
+
+
+async def _diagnostics_task() -> None:
+    cfg = sml2mqtt.config.CONFIG.diagnostics
+
+    parent = BASE_TOPIC.create_child('diagnostics').set_config(cfg.mqtt)
+    topics: dict[tuple[str, str], MqttObj] = {}
+
+    while True:
+        await sleep(cfg.interval)
+        publish_diagnostics(parent, topics)
+
+
+async def start_diagnostics() -> None:
+    global TASK
+
+    if not sml2mqtt.config.CONFIG.diagnostics.interval:
+        return None
+
+    assert TASK is None
+    TASK = Task(_diagnostics_task, name='Diagnostics Task')
+
+    on_shutdown(TASK.cancel_and_wait, 'Shutdown diagnostics')
+    TASK.start()
+    return None
@@ -1,5 +1,6 @@
 import traceback
-from asyncio import CancelledError, Event, Queue, TimeoutError, wait_for
+from asyncio import CancelledError, Event, TimeoutError, gather, wait_for
+from pathlib import Path
 from typing import Final
 
 from aiomqtt import Client, MqttError, Will
@@ -11,23 +12,31 @@ from sml2mqtt.errors import InitialMqttConnectionFailedError
 from sml2mqtt.mqtt import DynDelay
 from sml2mqtt.runtime import on_shutdown
 
+from .publish_queue import QUEUE_ITEM, PublishQueue, SpillFile
+
 
 log = _parent_logger.getChild('mqtt')
 
 
 TASK: Task | None = None
 IS_CONNECTED: Event | None = None
+QUEUE: PublishQueue | None = None
 
 
 async def start() -> None:
-    global IS_CONNECTED, TASK
+    global IS_CONNECTED, QUEUE, TASK
+
+    from .diagnostics import register_diagnostics
 
     assert TASK is None
 
     IS_CONNECTED = Event()
+    QUEUE = create_queue()
+    register_diagnostics('mqtt', QUEUE.get_diagnostics)
     TASK = Task(_mqtt_task, name='MQTT Task')
 
     on_shutdown(TASK.cancel_and_wait, 'Shutdown mqtt')
+    on_shutdown(spill_pending, 'Store pending mqtt messages')
     TASK.start()
 
 
@@ -44,12 +53,29 @@ async def wait_for_connect(timeout: float):
     return None
 
 
-QUEUE: Queue[tuple[str, int | float | str | bytes, int, bool]] | None = None
+def create_queue() -> PublishQueue:
+    cfg = sml2mqtt.config.CONFIG.mqtt.queue
 
+    spill = None
+    if cfg.spill_file:
+        path = Path(cfg.spill_file)
+        if not path.is_absolute():
+            path = sml2mqtt.CMD_ARGS.config.parent / path
+        spill = SpillFile(path.resolve(), cfg.spill_size)
+
+    queue = PublishQueue(cfg.size, cfg.policy, spill)
+    if count := queue.load_spilled():
+        log.debug(f'Loaded {count:d} messages from {spill.path}')
+    return queue
 
-async def _mqtt_task() -> None:
-    global QUEUE
 
+async def spill_pending() -> None:
+    # keep the messages which were not yet published
+    if QUEUE is not None and (count := QUEUE.spill_pending()):
+        log.debug(f'Stored {count:d} messages in {QUEUE.spill.path}')
+
+
+async def _mqtt_task() -> None:
     from .mqtt_obj import BASE_TOPIC
     config = sml2mqtt.config.CONFIG
 
@@ -92,7 +118,6 @@ async def _mqtt_task() -> None:
             async with client:
                 log.debug('Success!')
                 delay.reset()
-                QUEUE = Queue()
                 IS_CONNECTED.set()
 
                 try:
@@ -101,9 +126,23 @@ async def _mqtt_task() -> None:
 
                     # worker to publish things
                     while True:
-                        topic, value, qos, retain = await QUEUE.get()
-                        await client.publish(topic, value, qos, retain)
-                        QUEUE.task_done()
+                        await QUEUE.wait()
+                        batch = QUEUE.get_batch()
+
+                        try:
+                            failed = await publish_batch(client, batch)
+                        except BaseException:
+                            # e.g. cancelled while publishing, so it's unknown which messages were published
+                            QUEUE.put_back(batch)
+                            raise
+
+                        if failed:
+                            put_back_failed(batch, failed)
+                            raise failed[0][1]
+
+                        QUEUE.on_published(batch)
+                        QUEUE.flush_spill()
+                        QUEUE.load_spilled()
 
                 except CancelledError:
                     # The last will testament only gets sent on abnormal disconnect
@@ -122,10 +161,39 @@ async def _mqtt_task() -> None:
                 log.error(line)
 
         finally:
-            QUEUE = None
             IS_CONNECTED.clear()
+            # the messages which could not be published are stored while there is no connection
+            QUEUE.flush_spill()
+
+
+async def publish_batch(client: Client, batch: list[QUEUE_ITEM]) -> list[tuple[QUEUE_ITEM, Exception]]:
+    """Publish the items and return the items which could not be published together with the error"""
+    if len(batch) == 1:
+        topic, value, qos, retain, _ = item = batch[0]
+        try:
+            await client.publish(topic, value, qos, retain)
+        except Exception as e:
+            return [(item, e)]
+        return []
+
+    # publish everything at once so we don't wait for every message
+    results = await gather(
+        *(client.publish(topic, value, qos, retain) for topic, value, qos, retain, _ in batch),
+        return_exceptions=True
+    )
+    return [
+        (item, result if isinstance(result, Exception) else MqttError(f'Publish failed: {result!r}'))
+        for item, result in zip(batch, results, strict=True) if isinstance(result, BaseException)
+    ]
+
+
+def put_back_failed(batch: list[QUEUE_ITEM], failed: list[tuple[QUEUE_ITEM, Exception]]) -> None:
+    # only the messages which could not be published are queued again, so there are no duplicates
+    QUEUE.put_back(item for item, _ in failed)
+    failed_ids = {id(item) for item, _ in failed}
+    QUEUE.on_published(item for item in batch if id(item) not in failed_ids)
 
 
 def publish(topic: str, value: int | float | str | bytes, qos: int, retain: bool) -> None:
     if QUEUE is not None:
-        QUEUE.put_nowait((topic, value, qos, retain))
+        QUEUE.put(topic, value, qos, retain)
@@ -1,5 +1,6 @@
 import dataclasses
 from collections.abc import Callable, Generator
+from time import perf_counter
 from typing import Any, Final
 
 from sml2mqtt.__log__ import get_logger
@@ -9,11 +10,22 @@ from sml2mqtt.mqtt import publish
 from .errors import MqttConfigValuesMissingError, MqttTopicEmpty, TopicFragmentExpectedError
 
 
-pub_func: Callable[[str, int | float | str, int, bool], Any] = publish
+pub_func: Callable[[str, bytes, int, bool], Any] = publish
 
 
-def publish_analyze(topic: str, value: int | float | str, qos: int, retain: bool) -> None:
-    get_logger('mqtt.pub').info(f'{topic}: {value} (QOS: {qos}, retain: {retain})')
+def publish_analyze(topic: str, value: bytes, qos: int, retain: bool) -> None:
+    get_logger('mqtt.pub').info(f'{topic}: {value.decode()} (QOS: {qos}, retain: {retain})')
+
+
+def encode_payload(value: str | int | float | bytes) -> bytes:
+    # Same result as the payload encoding in the mqtt lib
+    if type(value) is int:
+        return b'%d' % value
+    if isinstance(value, str):
+        return value.encode()
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
 
 
 def patch_analyze() -> None:
@@ -50,8 +62,28 @@ class MqttObj:
         self.parent: MqttObj | None = None
         self.children: list[MqttObj] = []
 
+        # Encoded payload of the last published value
+        self._payload_value: str | int | float | bytes | None = None
+        self._payload: bytes | None = None
+
+        # Receives the duration of the publish if the device stats are enabled
+        self.record_publish_time: Callable[[float], Any] | None = None
+
     def publish(self, value: str | int | float) -> None:
-        pub_func(self.topic, value, self.qos, self.retain)
+        # values are often republished, so the payload is only encoded if the value changes
+        if (payload := self._payload) is None or value != self._payload_value or \
+                type(value) is not type(self._payload_value):
+            self._payload = payload = encode_payload(value)
+            self._payload_value = value
+
+        if (record := self.record_publish_time) is None:
+            pub_func(self.topic, payload, self.qos, self.retain)
+            return None
+
+        start = perf_counter()
+        pub_func(self.topic, payload, self.qos, self.retain)
+        record(perf_counter() - start)
+        return None
 
     def update(self) -> 'MqttObj':
         self._merge_values()
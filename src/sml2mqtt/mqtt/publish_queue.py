@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import json
+from asyncio import Event
+from collections import deque
+from time import monotonic
+from typing import TYPE_CHECKING, Final, Literal
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+
+# topic, value, qos, retain, timestamp
+QUEUE_ITEM = tuple[str, int | float | str | bytes, int, bool, float]
+
+QUEUE_POLICY = Literal['drop oldest', 'drop newest', 'keep latest per topic']
+
+
+class SpillFile:
+    """Stores messages with QoS >= 1 which could not be queued as json lines on disk.
+    The items are collected in memory and written in one batch with ``flush``.
+    The size of the file and the position of the first unread item are tracked in memory,
+    so the file is only accessed when the items are written or read and only the requested items are read.
+    """
+
+    def __init__(self, path: Path, max_size: int) -> None:
+        self.path: Final = path
+        self.max_size: Final = max_size
+
+        self._pending: Final[list[str]] = []
+        # position of the first item which was not yet read
+        self._offset: int = 0
+        try:
+            self._size: int = path.stat().st_size
+        except FileNotFoundError:
+            self._size = 0
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} {self.path}>'
+
+    def get_size(self) -> int:
+        """Size of the items which were not yet read including the items which are not yet written"""
+        return self._size - self._offset
+
+    def add(self, item: QUEUE_ITEM) -> bool:
+        """Store the item with the next flush. Returns False if the item doesn't fit into the file"""
+        topic, value, qos, retain, _ = item
+        is_bytes = isinstance(value, bytes)
+        line = json.dumps([topic, value.hex() if is_bytes else value, qos, retain, is_bytes]) + '\n'
+
+        if self.get_size() + len(line) > self.max_size:
+            return False
+        self._size += len(line)
+        self._pending.append(line)
+        return True
+
+    def flush(self) -> int:
+        """Write the added items to the file and return how many items were written"""
+        if not (lines := self._pending):
+            return 0
+
+        with self.path.open('a', encoding='utf-8') as f:
+            f.writelines(lines)
+        count = len(lines)
+        lines.clear()
+        return count
+
+    def write(self, items: Iterable[QUEUE_ITEM]) -> int:
+        """Append the items to the file and return how many items were added"""
+        count = 0
+        for item in items:
+            if not self.add(item):
+                break
+            count += 1
+        self.flush()
+        return count
+
+    def read(self, count: int | None = None) -> list[QUEUE_ITEM]:
+        """Read the oldest items (all if no count is given). The file is removed when all items were read."""
+        self.flush()
+        if not self.get_size():
+            return []
+
+        now = monotonic()
+        items: list[QUEUE_ITEM] = []
+        # json is ascii, so the length of the line is the number of bytes
+        with self.path.open('rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                self._offset += len(line)
+                if not line.strip():
+                    continue
+                topic, value, qos, retain, is_bytes = json.loads(line)
+                items.append((topic, bytes.fromhex(value) if is_bytes else value, qos, retain, now))
+                if len(items) == count:
+                    break
+
+        if self._offset >= self._size:
+            self.path.unlink()
+            self._size = self._offset = 0
+        elif self._offset >= self.get_size():
+            # the read items take more space than the unread ones
+            self.compact()
+        return items
+
+    def compact(self) -> None:
+        """Remove the items which were already read from the file"""
+        self.flush()
+        if not self._offset:
+            return None
+
+        with self.path.open('rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        self.path.write_bytes(data)
+        self._size = len(data)
+        self._offset = 0
+        return None
+
+
+class PublishQueue:
+    """Bounded queue for the messages which will be published. If the queue is full a message is dropped according
+    to the policy. Messages with QoS >= 1 which would be dropped are stored in the spill file (if configured).
+    The spilled messages are only written to the file with ``flush_spill``, so the file is not accessed for
+    every message.
+    """
+
+    def __init__(self, size: int, policy: QUEUE_POLICY = 'drop oldest', spill: SpillFile | None = None) -> None:
+        if size < 1:
+            msg = f'Queue size must be at least 1: {size}'
+            raise ValueError(msg)
+
+        self.size: Final = size
+        self.policy: Final = policy
+        self.spill: Final = spill
+
+        self._per_topic: Final = policy == 'keep latest per topic'
+        self._items: Final[deque[QUEUE_ITEM]] = deque()
+        self._topics: Final[dict[str, QUEUE_ITEM]] = {}
+        self._event: Final = Event()
+
+        # counters
+        self.dropped: int = 0
+        self.spilled: int = 0
+        self.published: int = 0
+        self.latency_max: float = 0
+        self.latency_sum: float = 0
+
+    def __repr__(self) -> str:
+        return (f'<{self.__class__.__name__:s} {len(self):d}/{self.size:d} policy={self.policy:s} '
+                f'dropped={self.dropped:d} spilled={self.spilled:d}>')
+
+    def __len__(self) -> int:
+        return len(self._topics) if self._per_topic else len(self._items)
+
+    def put(self, topic: str, value: int | float | str | bytes, qos: int, retain: bool) -> None:
+        self._put((topic, value, qos, retain, monotonic()))
+        self._event.set()
+
+    def _put(self, item: QUEUE_ITEM) -> None:
+        if self._per_topic:
+            topics = self._topics
+            topic = item[0]
+            # replace the value but keep the position, so a topic that is updated frequently is not starved
+            if topic not in topics and len(topics) >= self.size:
+                self._drop(topics.pop(next(iter(topics))))
+            topics[topic] = item
+            return None
+
+        items = self._items
+        if len(items) >= self.size:
+            if self.policy == 'drop newest':
+                return self._drop(item)
+            self._drop(items.popleft())
+        items.append(item)
+        return None
+
+    def _drop(self, item: QUEUE_ITEM) -> None:
+        if item[2] and (spill := self.spill) is not None and spill.add(item):
+            self.spilled += 1
+            return None
+        self.dropped += 1
+        return None
+
+    async def wait(self) -> None:
+        while not len(self):
+            self._event.clear()
+            await self._event.wait()
+
+    def get_batch(self) -> list[QUEUE_ITEM]:
+        """Take all pending items. For QoS 0 and retained topics only the latest value is kept."""
+        if self._per_topic:
+            batch = list(self._topics.values())
+            self._topics.clear()
+            return batch
+
+        items: dict[str | int, QUEUE_ITEM] = {}
+        for count, item in enumerate(self._items):
+            _, _, qos, retain, _ = item
+            if not qos or retain:
+                # move to the end so the order of the topics stays the same
+                items.pop(item[0], None)
+                items[item[0]] = item
+            else:
+                items[count] = item
+        self._items.clear()
+        return list(items.values())
+
+    def put_back(self, items: Iterable[QUEUE_ITEM]) -> None:
+        """Queue the items with QoS >= 1 again, e.g. because the connection was lost while publishing"""
+        for item in items:
+            if item[2]:
+                self._put(item)
+        if len(self):
+            self._event.set()
+
+    def on_published(self, items: Iterable[QUEUE_ITEM]) -> None:
+        now = monotonic()
+        for item in items:
+            self.published += 1
+            latency = now - item[4]
+            self.latency_sum += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def flush_spill(self) -> int:
+        """Write the messages which were dropped since the last call to the spill file"""
+        if (spill := self.spill) is None:
+            return 0
+        return spill.flush()
+
+    def load_spilled(self) -> int:
+        """Load the oldest messages from the spill file as long as the queue has space.
+        They are older than the queued messages, so they are put in front of them."""
+        if (spill := self.spill) is None or not spill.get_size() or (free := self.size - len(self)) <= 0:
+            return 0
+
+        if not (items := spill.read(free)):
+            return 0
+
+        if self._per_topic:
+            # a queued value of the same topic is newer than the spilled value
+            topics = self._topics
+            queued = dict(topics)
+            topics.clear()
+            for item in items:
+                if item[0] not in queued:
+                    topics[item[0]] = item
+            count = len(topics)
+            topics.update(queued)
+        else:
+            self._items.extendleft(reversed(items))
+            count = len(items)
+
+        self._event.set()
+        return count
+
+    def spill_pending(self) -> int:
+        """Write all pending messages with QoS >= 1 to the spill file"""
+        if (spill := self.spill) is None:
+            return 0
+
+        items = self.get_batch()
+        count = spill.write(item for item in items if item[2])
+        self.spilled += count
+        # the messages which were already loaded must not be loaded again on the next start
+        spill.compact()
+        return count
+
+    def get_diagnostics(self) -> dict[str, int | float]:
+        latency = self.latency_max
+        self.latency_max = 0
+        return {
+            'queue': len(self),
+            'published': self.published,
+            'dropped': self.dropped,
+            'spilled': self.spilled,
+            'latency': round(latency * 1000, 1),
+        }
@@ -1 +1,4 @@
-from .shutdown import do_shutdown, do_shutdown_async, on_shutdown, signal_handler_setup
+from .event_loop import get_event_loop_name, run_event_loop
+from .loop_monitor import LOOP_MONITOR
+from .scheduler import DeadlineScheduler
+from .shutdown import do_shutdown, do_shutdown_async, on_shutdown, signal_handler_setup, wait_for_shutdown
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+import sml2mqtt
+from sml2mqtt.__args__ import CMD_ARGS
+
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+
+
+log = logging.getLogger('sml.event_loop')
+
+
+def get_event_loop_name() -> str:
+    """The event loop from the command line overrides the one from the configuration file"""
+    if (name := CMD_ARGS.event_loop) is not None:
+        return name
+    return sml2mqtt.config.CONFIG.general.event_loop
+
+
+def run_event_loop(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run the coroutine in the configured event loop. If uvloop is not available the default loop is used."""
+    if get_event_loop_name() == 'uvloop':
+        try:
+            import uvloop
+        except ImportError:
+            log.warning('uvloop is not installed - using the default event loop')
+        else:
+            log.debug(f'Using uvloop {uvloop.__version__}')
+            return uvloop.run(coro)
+
+    return asyncio.run(coro)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import heapq
+import logging
+from asyncio import sleep
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any, Final
+
+import sml2mqtt
+from sml2mqtt.const import Task
+
+from .shutdown import on_shutdown
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sml2mqtt.const import DeviceProto
+
+
+log = logging.getLogger('sml.loop')
+
+
+class LoopMonitor:
+    """Measures how late the event loop wakes up a sleeping task (lag) and which devices block the event loop.
+    Only the processing of the received data of the devices is timed, because that's where the work is done.
+    """
+
+    def __init__(self, slowest: int = 5) -> None:
+        self.slowest_count: Final = slowest
+
+        self.interval: float = 0.1
+        self.slow_callback: float = 0.05
+        self.grace: bool = False
+
+        # sum of all measured lags, is never reset
+        self.lag_total: float = 0
+
+        self.lag_max: float = 0
+        self.lag_sum: float = 0
+        self.lag_count: int = 0
+        self.slow_callbacks: int = 0
+        self._slowest: list[tuple[float, str]] = []
+
+        self._wakeup: float = 0
+        self._task: Task | None = None
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} running={self.is_running} lag_max={self.lag_max * 1000:.1f}ms>'
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def add_lag(self, lag: float) -> None:
+        self.lag_total += lag
+        self.lag_sum += lag
+        self.lag_count += 1
+        if lag > self.lag_max:
+            self.lag_max = lag
+
+    def get_lag_total(self) -> float:
+        # If the loop is currently blocked the monitor task was not able to measure the lag yet
+        return self.lag_total + max(0., monotonic() - self._wakeup) if self.is_running else self.lag_total
+
+    def get_grace(self, lag_start: float) -> float:
+        """Return the time the event loop was blocked since lag_start was taken with get_lag_total"""
+        if not self.grace:
+            return 0
+        return self.get_lag_total() - lag_start
+
+    def add_callback(self, name: str, duration: float) -> None:
+        if duration < self.slow_callback:
+            return None
+
+        self.slow_callbacks += 1
+        log.info(f'Slow callback of {name:s}: {duration * 1000:.1f}ms')
+
+        if len(self._slowest) < self.slowest_count:
+            heapq.heappush(self._slowest, (duration, name))
+        else:
+            heapq.heappushpop(self._slowest, (duration, name))
+        return None
+
+    def timed(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        add = self.add_callback
+
+        def timed_func(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add(name, perf_counter() - start)
+
+        return timed_func
+
+    def instrument(self, device: DeviceProto) -> None:
+        """Time the processing of the received data of the device. Does nothing if the monitor is not running."""
+        if self.is_running:
+            device.on_source_data = self.timed(device.name, device.on_source_data)
+
+    def get_diagnostics(self) -> dict[str, int | float | str]:
+        ret: dict[str, int | float | str] = {
+            'lag_max': round(self.lag_max * 1000, 1),
+            'lag_mean': round(self.lag_sum / self.lag_count * 1000, 2) if self.lag_count else 0,
+            'slow_callbacks': self.slow_callbacks,
+            'slowest': ', '.join(f'{name:s}: {duration * 1000:.1f}ms'
+                                 for duration, name in sorted(self._slowest, reverse=True)),
+        }
+
+        self.lag_max = 0
+        self.lag_sum = 0
+        self.lag_count = 0
+        self.slow_callbacks = 0
+        self._slowest.clear()
+        return ret
+
+    def start(self) -> None:
+        cfg = sml2mqtt.config.CONFIG.diagnostics.loop_monitor
+        if not cfg.enabled:
+            return None
+
+        from sml2mqtt.mqtt import register_diagnostics
+
+        assert self._task is None
+        self.interval = cfg.interval
+        self.slow_callback = cfg.slow_callback
+        self.grace = cfg.watchdog_grace
+
+        self._wakeup = monotonic() + self.interval
+        self._task = Task(self._monitor_task, name='Loop Monitor Task')
+        register_diagnostics('loop', self.get_diagnostics)
+
+        on_shutdown(self._task.cancel_and_wait, 'Stop loop monitor')
+        self._task.start()
+        return None
+
+    async def _monitor_task(self) -> None:
+        while True:
+            self._wakeup = monotonic() + self.interval
+            await sleep(self.interval)
+            self.add_lag(max(0., monotonic() - self._wakeup))
+
+
+LOOP_MONITOR: Final = LoopMonitor()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+import traceback
+from asyncio import get_running_loop
+from heapq import heappop, heappush
+from itertools import count
+from math import ceil
+from time import monotonic
+from typing import TYPE_CHECKING, Final, Protocol
+
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop, TimerHandle
+
+
+log = logging.getLogger('sml.scheduler')
+
+
+class SupportsDeadline(Protocol):
+    def check(self, now: float) -> float | None:
+        """Called when the deadline is due. Returns the next deadline or None to be removed."""
+        ...
+
+
+class DeadlineScheduler:
+    """Calls many objects when their deadline is due with one timer of the event loop.
+    The deadlines are kept in a heap and the objects are only queued once, so an object which moves its deadline
+    (e.g. a fed watchdog) doesn't have to touch the heap. The new deadline is returned when the old one is due.
+    """
+
+    # The timer is rounded up to a multiple of the resolution, so close deadlines are processed with one wakeup
+    RESOLUTION: Final = 0.01
+
+    def __init__(self, name: str) -> None:
+        self.name: Final = name
+
+        self._heap: Final[list[tuple[float, int, SupportsDeadline]]] = []
+        self._entries: Final[dict[SupportsDeadline, tuple[float, int, SupportsDeadline]]] = {}
+        self._nr: Final = count()
+
+        self._loop: AbstractEventLoop | None = None
+        self._handle: TimerHandle | None = None
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} {self.name:s} entries={len(self._heap):d}>'
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, obj: SupportsDeadline) -> bool:
+        return obj in self._entries
+
+    def clear(self) -> None:
+        if (handle := self._handle) is not None:
+            handle.cancel()
+            self._handle = None
+        self._heap.clear()
+        self._entries.clear()
+
+    def add(self, obj: SupportsDeadline, deadline: float) -> bool:
+        # Without a running event loop (e.g. frames which are processed in a benchmark) there is nothing
+        # which could call the objects, so nothing is scheduled
+        try:
+            loop = get_running_loop()
+        except RuntimeError:
+            return False
+
+        # e.g. every test runs in a new event loop
+        if loop is not self._loop:
+            self.clear()
+            self._loop = loop
+
+        entry = self._push(obj, deadline)
+        if self._heap[0] is entry:
+            self._schedule(deadline)
+        return True
+
+    def remove(self, obj: SupportsDeadline) -> bool:
+        # The entry in the heap is removed lazily when it's due
+        return self._entries.pop(obj, None) is not None
+
+    def _push(self, obj: SupportsDeadline, deadline: float) -> tuple[float, int, SupportsDeadline]:
+        entry = (deadline, next(self._nr), obj)
+        self._entries[obj] = entry
+        heappush(self._heap, entry)
+        return entry
+
+    def _schedule(self, deadline: float) -> None:
+        if (handle := self._handle) is not None:
+            handle.cancel()
+        wakeup = ceil(deadline / self.RESOLUTION) * self.RESOLUTION
+        self._handle = self._loop.call_later(max(0., wakeup - monotonic()), self._run)
+
+    def _run(self) -> None:
+        self._handle = None
+        now = monotonic()
+
+        heap = self._heap
+        entries = self._entries
+        while heap and heap[0][0] <= now:
+            entry = heappop(heap)
+            obj = entry[2]
+
+            # Entries of removed or re-added objects are skipped
+            if entries.get(obj) is not entry:
+                continue
+            del entries[obj]
+
+            try:
+                deadline = obj.check(now)
+            except Exception:
+                log.error(f'Error in {self.name:s} scheduler for {obj}')
+                for line in traceback.format_exc().splitlines():
+                    log.error(line)
+                continue
+
+            if deadline is not None:
+                self._push(obj, deadline)
+
+        if heap:
+            self._schedule(heap[0][0])
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging.handlers
 import signal
 import traceback
+from asyncio import Event
 from dataclasses import dataclass
 from threading import Lock
 from typing import TYPE_CHECKING, Final
@@ -55,15 +56,37 @@ SHUTDOWN_TASK: Final = Task(shutdown_coro, name='Shutdown Task')
 SHUTDOWN_LOCK: Final = Lock()
 SHUTDOWN_CALL: Task | None = None
 
+_SHUTDOWN_STARTED: bool = False
+_SHUTDOWN_EVENT: Event | None = None
+
+
+async def wait_for_shutdown() -> None:
+    """Wait until the shutdown was started. Returns immediately if it was already started."""
+    global _SHUTDOWN_EVENT
+
+    if _SHUTDOWN_STARTED:
+        return None
+
+    _SHUTDOWN_EVENT = event = Event()
+    try:
+        await event.wait()
+    finally:
+        _SHUTDOWN_EVENT = None
+    return None
+
 
 async def do_shutdown_async() -> None:
-    global SHUTDOWN_CALL
+    global SHUTDOWN_CALL, _SHUTDOWN_STARTED
 
     try:
         if not SHUTDOWN_TASK.is_running:
             print('Shutting down ...')
             log.info('Shutting down ...')
             SHUTDOWN_TASK.start()
+
+        _SHUTDOWN_STARTED = True
+        if (event := _SHUTDOWN_EVENT) is not None:
+            event.set()
     finally:
         with SHUTDOWN_LOCK:
             SHUTDOWN_CALL = None
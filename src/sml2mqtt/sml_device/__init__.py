@@ -1,2 +1,7 @@
 from .sml_device import DeviceStatus, SmlDevice
 from .sml_devices import ALL_DEVICES
+
+
+# isort: split
+
+from .create_devices import create_devices
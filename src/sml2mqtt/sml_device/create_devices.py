@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sml2mqtt.sml_source import create_source
+
+from .sml_device import SmlDevice
+from .sml_devices import ALL_DEVICES
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sml2mqtt.config.inputs import SmlSourceSettingType
+
+
+async def create_devices(inputs: Iterable[SmlSourceSettingType], *, analyze: bool = False) -> None:
+    """Create a device for each input"""
+    for input_cfg in inputs:
+        device = ALL_DEVICES.add_device(SmlDevice(input_cfg.get_device_name()))
+        device.set_source(await create_source(device, settings=input_cfg))
+        device.watchdog.set_timeout(input_cfg.timeout)
+        if analyze:
+            device.frame_handler = device.analyze_frame
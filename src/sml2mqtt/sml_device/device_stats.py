@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from asyncio import sleep
+from collections import deque
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any, Final, TypeVar
+
+from sml2mqtt import CONFIG
+from sml2mqtt.const import DeviceTask
+from sml2mqtt.mqtt.diagnostics import publish_values
+
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from sml2mqtt.mqtt import MqttObj
+    from sml2mqtt.sml_device import SmlDevice
+
+
+T = TypeVar('T')
+
+
+class StageTimes:
+    """Durations of one processing stage since the values were taken the last time.
+    Only the latest durations are kept for the percentiles, so the memory is bounded.
+    """
+
+    def __init__(self, size: int = 1000) -> None:
+        self.times: Final[deque[float]] = deque(maxlen=size)
+        self.count: int = 0
+        self.sum: float = 0
+
+    def add(self, duration: float) -> None:
+        self.times.append(duration)
+        self.count += 1
+        self.sum += duration
+
+    def get_values(self) -> dict[str, int | float]:
+        """Return count and mean, p50, p99, max in us and reset the values"""
+        ret: dict[str, int | float] = {'count': self.count}
+        if times := sorted(self.times):
+            ret['mean'] = round(self.sum / self.count * 1e6, 1)
+            ret['p50'] = round(times[len(times) // 2] * 1e6, 1)
+            ret['p99'] = round(times[min(len(times) - 1, len(times) * 99 // 100)] * 1e6, 1)
+            ret['max'] = round(times[-1] * 1e6, 1)
+
+        self.times.clear()
+        self.count = 0
+        self.sum = 0
+        return ret
+
+
+class DeviceStats:
+    """Measures the processing time of every stage of a device.
+    The device calls the stages through ``time`` only if the stats are enabled, so there is no overhead otherwise.
+
+    - total: processing of the received data (includes all other stages)
+    - ingest: adding the data to the buffer of the stream reader
+    - frame: extraction of the frame from the buffer (includes crc)
+    - crc: crc check of the frame
+    - values: creation of the frame values (includes the wait for the parse executor)
+    - process: processing of all values (includes publish)
+    - publish: enqueue of the mqtt messages
+
+    If the frame cache is enabled the hits and misses of the cache are reported, too.
+    """
+
+    def __init__(self, device: SmlDevice) -> None:
+        self.device: Final = device
+        self.stages: Final = {name: StageTimes() for name in (
+            'total', 'ingest', 'frame', 'crc', 'values', 'process', 'publish')}
+
+        self.mqtt_stats: Final = device.mqtt_device.create_child('stats')
+        self._topics: Final[dict[tuple[str, str], MqttObj]] = {}
+        self._last_publish: float = monotonic()
+
+        self._task: Final = DeviceTask(device, self._stats_task, name=f'Stats Task {device.name:s}')
+
+        device.stream_reader.record_crc_time = self.stages['crc'].add
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} {self.device.name:s}>'
+
+    def time(self, name: str, func: Callable[..., T], *args: Any) -> T:
+        start = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.stages[name].add(perf_counter() - start)
+
+    async def time_async(self, name: str, coro: Awaitable[T]) -> T:
+        start = perf_counter()
+        try:
+            return await coro
+        finally:
+            self.stages[name].add(perf_counter() - start)
+
+    def instrument_publish(self) -> None:
+        """Time the publish of all mqtt objects of the device. Must be called when the values are set up."""
+        record = self.stages['publish'].add
+        for obj in self.device.mqtt_device.iter_objs():
+            if obj is not self.mqtt_stats and obj.parent is not self.mqtt_stats:
+                obj.record_publish_time = record
+
+    def get_values(self) -> dict[str, dict[str, int | float]]:
+        now = monotonic()
+        total = self.stages['total'].sum
+        values = {name: stage.get_values() for name, stage in self.stages.items()}
+        if (cache := self.device.frame_cache) is not None:
+            values['cache'] = cache.get_values()
+
+        # percentage of the time the device was busy processing data
+        if (duration := now - self._last_publish) > 0:
+            values['total']['load'] = round(total / duration * 100, 2)
+        self._last_publish = now
+        return values
+
+    def publish(self) -> None:
+        for name, values in self.get_values().items():
+            publish_values(self.mqtt_stats, self._topics, name, values)
+
+    def start(self) -> None:
+        self._last_publish = monotonic()
+        self._task.start()
+
+    async def cancel_and_wait(self) -> bool:
+        return await self._task.cancel_and_wait()
+
+    async def _stats_task(self) -> None:
+        while True:
+            await sleep(CONFIG.diagnostics.interval)
+            self.publish()
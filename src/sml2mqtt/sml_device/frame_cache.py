@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sml2mqtt.const import EnhancedSmlFrame, SmlFrameValues
+
+
+class FrameValuesCache:
+    """Caches the values of the last frame. If the list entries of a frame are byte identical to the ones of the
+    previous frame the frame will not be parsed again and the values of the previous frame are reused.
+    """
+
+    def __init__(self, parse: Callable[[EnhancedSmlFrame], SmlFrameValues]) -> None:
+        self.parse: Final = parse
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._key: bytes | None = None
+        self._values: SmlFrameValues | None = None
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} hits={self.hits:d} misses={self.misses:d}>'
+
+    def get_values(self) -> dict[str, int]:
+        """Return hits and misses since the values were taken the last time"""
+        ret = {'hits': self.hits, 'misses': self.misses}
+        self.hits = 0
+        self.misses = 0
+        return ret
+
+    def clear(self) -> None:
+        self._key = None
+        self._values = None
+
+    def get_cached_values(self, frame: EnhancedSmlFrame) -> tuple[bytes | None, SmlFrameValues | None]:
+        """Return the key of the frame and the cached values or None if the frame has to be parsed"""
+        key = frame.get_values_key()
+
+        if key is not None and key == self._key and (values := self._values) is not None:
+            self.hits += 1
+            return key, values.copy(frame.timestamp)
+
+        self.misses += 1
+        return key, None
+
+    def set_values(self, key: bytes | None, values: SmlFrameValues) -> None:
+        self._key = key
+        self._values = values
+
+    def get_frame_values(self, frame: EnhancedSmlFrame) -> SmlFrameValues:
+        key, values = self.get_cached_values(frame)
+        if values is None:
+            values = self.parse(frame)
+            self.set_values(key, values)
+        return values
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import multiprocessing
+from asyncio import Event, get_running_loop
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from logging import Handler, Logger, LogRecord
+from typing import TYPE_CHECKING, Final
+
+from sml2mqtt import CONFIG
+from sml2mqtt.__args__ import CMD_ARGS
+from sml2mqtt.const import DeviceTask, EnhancedSmlFrame
+from sml2mqtt.runtime import on_shutdown
+
+
+if TYPE_CHECKING:
+    from smllib.sml import SmlListEntry
+
+    from sml2mqtt.sml_device import SmlDevice
+
+
+# Maximum number of frames per device which wait for the executor. If more frames arrive the oldest one is dropped.
+MAX_PENDING_FRAMES: Final = 10
+
+_EXECUTOR: Executor | None = None
+
+
+def get_parse_executor() -> Executor | None:
+    """Return the executor which is shared by all devices or None if the frames are parsed in the event loop"""
+    global _EXECUTOR
+
+    if (kind := CONFIG.general.parse_executor) == 'none' or CMD_ARGS.analyze:
+        return None
+
+    if _EXECUTOR is None:
+        if kind == 'thread':
+            _EXECUTOR = ThreadPoolExecutor(thread_name_prefix='Frame parser')
+        else:
+            _EXECUTOR = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        on_shutdown(shutdown_parse_executor, 'Stop frame parser')
+    return _EXECUTOR
+
+
+async def shutdown_parse_executor() -> None:
+    global _EXECUTOR
+
+    if (executor := _EXECUTOR) is None:
+        return None
+    _EXECUTOR = None
+    await get_running_loop().run_in_executor(None, partial(executor.shutdown, wait=True, cancel_futures=True))
+    return None
+
+
+class LogRecorder(Handler):
+    """Keeps the log messages, so they can be passed from a process of the pool to the device"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: Final[list[tuple[int, str]]] = []
+
+    def emit(self, record: LogRecord) -> None:
+        self.messages.append((record.levelno, record.getMessage()))
+
+
+def parse_list_entries(data: bytes, log_name: str) -> tuple[list[SmlListEntry], list[tuple[int, str]]]:
+    # Runs in a process of the pool. The frame can not be pickled (memoryview) and
+    # neither can the frame values, so the bytes are passed in and the list entries are returned.
+    # The process has no log handlers, so the log messages are returned, too, and logged by the device.
+    # The logger is not registered, so the logging configuration of the process is not changed
+    recorder = LogRecorder()
+    log = Logger(log_name)  # noqa: LOG001
+    log.addHandler(recorder)
+    return EnhancedSmlFrame(data).get_list_entries(log), recorder.messages
+
+
+class FrameParser:
+    """Parses the frames of a device in an executor so the event loop is not blocked while a frame is parsed.
+    There is only one frame of the device in the executor at a time, so the frames are processed strictly in order.
+    """
+
+    def __init__(self, device: SmlDevice, executor: Executor) -> None:
+        self.device: Final = device
+        self.executor: Final = executor
+        self.in_process: Final = isinstance(executor, ProcessPoolExecutor)
+
+        self.frames: Final[deque[EnhancedSmlFrame]] = deque(maxlen=MAX_PENDING_FRAMES)
+        self.dropped: int = 0
+
+        self._event: Final = Event()
+        self._task: Final = DeviceTask(device, self._parse_task, name=f'Parse Task {device.name:s}')
+
+    def __repr__(self) -> str:
+        return (f'<{self.__class__.__name__:s} {self.device.name:s} pending={len(self.frames):d} '
+                f'dropped={self.dropped:d}>')
+
+    def put(self, frame: EnhancedSmlFrame) -> None:
+        if len(self.frames) >= MAX_PENDING_FRAMES:
+            self.dropped += 1
+            self.device.log.debug('Frame parser is too slow - dropped the oldest frame')
+
+        self.frames.append(frame)
+        self._event.set()
+
+    async def get_list_entries(self, frame: EnhancedSmlFrame) -> list[SmlListEntry]:
+        log = self.device.log
+        loop = get_running_loop()
+        if self.in_process:
+            entries, messages = await loop.run_in_executor(self.executor, parse_list_entries, frame.bytes, log.name)
+            for level, msg in messages:
+                log.log(level, msg)
+            return entries
+        return await loop.run_in_executor(self.executor, frame.get_list_entries, log)
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def cancel_and_wait(self) -> bool:
+        return await self._task.cancel_and_wait()
+
+    async def _parse_task(self) -> None:
+        device = self.device
+        frames = self.frames
+
+        while True:
+            if not frames:
+                self._event.clear()
+                await self._event.wait()
+                continue
+
+            frame = frames.popleft()
+            try:
+                await device.process_frame_async(frame)
+            except Exception as e:
+                for line in frame.get_frame_str():
+                    device.log.info(line)
+                device.on_error(e)
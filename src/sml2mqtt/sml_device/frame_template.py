@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from binascii import a2b_hex
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Final
+
+from smllib.sml import SmlListEntry
+
+from sml2mqtt.const import SmlFrameValues
+from sml2mqtt.const.sml_helpers import get_list_entry_positions, skip_sml_value
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sml2mqtt.const import EnhancedSmlFrame
+
+
+# Prefix of the choice for the val_time: list with two entries, unsigned8 with the type
+VAL_TIME_SEC_INDEX: Final = b'\x72\x62\x01'
+VAL_TIME_TIMESTAMP: Final = b'\x72\x62\x02'
+
+
+def decode_sml_scalar(buf: bytes, pos: int) -> Any:
+    """Decode a sml value which is not a list. The value must have a short type-length field"""
+    tl = buf[pos]
+    if tl == 0x01:
+        return None
+    if tl == 0x42:  # noqa: PLR2004
+        return bool(buf[pos + 1])
+
+    _type = tl & 0x70
+    end = pos + (tl & 0x0F)
+    if _type == 0x60:  # noqa: PLR2004
+        return int.from_bytes(buf[pos + 1:end], 'big')
+    if _type == 0x50:  # noqa: PLR2004
+        return int.from_bytes(buf[pos + 1:end], 'big', signed=True)
+    if not _type:
+        return buf[pos + 1:end].hex()
+
+    msg = f'Unknown data type: {_type:02x}!'
+    raise ValueError(msg)
+
+
+def is_short_scalar(buf: bytes, pos: int) -> bool:
+    tl = buf[pos]
+    return not tl & 0x80 and tl & 0x70 in (0x00, 0x40, 0x50, 0x60) and tl != 0x00
+
+
+def _val_time_timestamp(value: int) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+def _decode_str_value(value: str) -> str:
+    # same as the SmlListEntryBuilder: Maybe it's ascii so we try to decode it
+    v = a2b_hex(value).decode(errors='ignore')
+    return v if v.isalnum() else value
+
+
+class FrameTemplateEntry:
+    """Positions of the fields of one list entry in the frame.
+    The bytes of obis, unit, scaler and signature must be identical, status, time and value are decoded.
+    """
+
+    def __init__(self, entry: SmlListEntry, buf: bytes, pos: int) -> None:
+        self.entry: Final = entry
+
+        status = skip_sml_value(buf, pos + 1)
+        val_time = skip_sml_value(buf, status)
+        unit = skip_sml_value(buf, val_time)
+        value = skip_sml_value(buf, skip_sml_value(buf, unit))
+        signature = skip_sml_value(buf, value)
+        end = skip_sml_value(buf, signature)
+
+        # list, obis
+        self.head_pos: Final = pos
+        self.head: Final = buf[pos:status]
+
+        self.status_pos: Final = status
+        self.status_tl: Final = buf[status]
+
+        # val_time is either not set, a number or a choice with the type and a number
+        self.val_time_pos: Final = val_time
+        self.val_time_func: Callable[[int], Any] | None = None
+        val_time_prefix = b''
+        if buf[val_time] & 0x70 == 0x70:  # noqa: PLR2004
+            val_time_prefix = buf[val_time:val_time + 3]
+            if val_time_prefix == VAL_TIME_TIMESTAMP:
+                self.val_time_func = _val_time_timestamp
+            elif val_time_prefix != VAL_TIME_SEC_INDEX:
+                msg = f'Unsupported val_time at {val_time:d}'
+                raise ValueError(msg)
+        self.val_time_prefix: Final = val_time_prefix
+        self.val_time_tl: Final = buf[val_time + len(val_time_prefix)]
+
+        # unit, scaler
+        self.unit_pos: Final = unit
+        self.unit: Final = buf[unit:value]
+
+        self.value_pos: Final = value
+        self.value_tl: Final = buf[value]
+
+        self.signature_pos: Final = signature
+        self.signature: Final = buf[signature:end]
+
+        for check in (status, val_time + len(val_time_prefix), value):
+            if not is_short_scalar(buf, check):
+                msg = f'Unsupported value at {check:d}'
+                raise ValueError(msg)
+
+        # The template must produce the same values as the parsed frame
+        if (decoded := self.decode(buf)) is None or decoded.__dict__ != entry.__dict__:
+            msg = f'Decoded entry does not match {entry.obis}'
+            raise ValueError(msg)
+
+    def decode(self, buf: bytes) -> SmlListEntry | None:
+        if buf[self.head_pos:self.status_pos] != self.head or buf[self.status_pos] != self.status_tl or \
+                buf[self.unit_pos:self.value_pos] != self.unit or buf[self.value_pos] != self.value_tl or \
+                buf[self.signature_pos:self.signature_pos + len(self.signature)] != self.signature:
+            return None
+
+        val_time_pos = self.val_time_pos
+        if prefix := self.val_time_prefix:
+            if buf[val_time_pos:val_time_pos + 3] != prefix:
+                return None
+            val_time_pos += 3
+        if buf[val_time_pos] != self.val_time_tl:
+            return None
+
+        val_time = decode_sml_scalar(buf, val_time_pos)
+        if val_time is not None and (func := self.val_time_func) is not None:
+            val_time = func(val_time)
+
+        value = decode_sml_scalar(buf, self.value_pos)
+        if isinstance(value, str):
+            value = _decode_str_value(value)
+
+        # Copy everything in the same order as the builder and replace the changing values
+        entry = SmlListEntry()
+        entry.__dict__.update(self.entry.__dict__)
+        entry.status = decode_sml_scalar(buf, self.status_pos)
+        entry.val_time = val_time
+        entry.value = value
+        return entry
+
+
+class FrameTemplate:
+    """Template of the layout of a frame which is learned from a parsed frame.
+    Subsequent frames with the same layout are decoded directly from the learned positions
+    without parsing the frame. If the layout changes the template does not match any more
+    and the frame has to be parsed again.
+    """
+
+    @classmethod
+    def create(cls, frame: EnhancedSmlFrame, values: SmlFrameValues) -> FrameTemplate | None:
+        buf = frame.bytes
+        entries: list[FrameTemplateEntry] = []
+
+        try:
+            for pos in get_list_entry_positions(buf):
+                if buf[pos + 1] != 0x07:  # noqa: PLR2004
+                    return None
+                # entries which were not reported by the parser are not part of the template
+                if (entry := values.get_value(buf[pos + 2:pos + 8].hex())) is None:
+                    continue
+                entries.append(FrameTemplateEntry(entry, buf, pos))
+        except (IndexError, ValueError):
+            return None
+
+        # all values have to be in the template
+        if not entries or len(entries) != len(values) or len({e.entry.obis for e in entries}) != len(entries):
+            return None
+
+        return cls(len(buf), entries)
+
+    def __init__(self, size: int, entries: list[FrameTemplateEntry]) -> None:
+        self.size: Final = size
+        self.entries: Final = tuple(entries)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} size={self.size:d} entries={len(self.entries):d}>'
+
+    def get_frame_values(self, frame: EnhancedSmlFrame) -> SmlFrameValues | None:
+        buf = frame.bytes
+        if len(buf) != self.size:
+            return None
+
+        values = SmlFrameValues(frame.timestamp)
+        obj = values.values
+        for template_entry in self.entries:
+            if (entry := template_entry.decode(buf)) is None:
+                return None
+            obj[entry.obis] = entry
+        return values
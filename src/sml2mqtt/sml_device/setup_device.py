@@ -122,3 +122,7 @@ def setup_device(device: SmlDevice, frame: SmlFrameValues, cfg: SmlDeviceConfig
 
     # Check for duplicate MQTT topics
     check_for_duplicate_topics(BASE_TOPIC)
+
+    # Operations are fixed from now on
+    device.sml_values.optimize_operations()
+    device.sml_values.compile_operations()
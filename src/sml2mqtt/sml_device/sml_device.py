@@ -5,20 +5,23 @@ from logging import DEBUG as LVL_DEBUG
 from logging import INFO as LVL_INFO
 from typing import TYPE_CHECKING, Any, Final
 
-import smllib
-from smllib import SmlStreamReader
 from smllib.errors import CrcError
 from typing_extensions import Self
 
 from sml2mqtt import CONFIG
 from sml2mqtt.__log__ import get_logger
-from sml2mqtt.const import EnhancedSmlFrame
+from sml2mqtt.const import EnhancedSmlFrame, SmlFrameValues
 from sml2mqtt.errors import ObisIdForConfigurationMappingNotFoundError, Sml2MqttExceptionWithLog
 from sml2mqtt.mqtt import BASE_TOPIC
+from sml2mqtt.runtime import LOOP_MONITOR
 from sml2mqtt.sml_device.sml_devices import ALL_DEVICES
 from sml2mqtt.sml_value import SmlValues
 
+from .device_stats import DeviceStats
 from .device_status import DeviceStatus
+from .frame_cache import FrameValuesCache
+from .frame_parser import FrameParser, get_parse_executor
+from .frame_template import FrameTemplate
 from .setup_device import setup_device
 from .stream_reader_group import StreamReaderGroup, create_stream_reader_group
 from .watchdog import Watchdog
@@ -29,12 +32,6 @@ if TYPE_CHECKING:
 
     from sml2mqtt.const import SourceProto
 
-# -------------------------------------------------------------------------------------------------
-# Dirty:
-# Replace the class SmlFrame which is returned by SmlStreamReader with EnhancedSmlFrame
-assert hasattr(smllib.reader, 'SmlFrame')
-setattr(smllib.reader, 'SmlFrame', EnhancedSmlFrame)
-
 
 class SmlDevice:
     def __init__(self, name: str) -> None:
@@ -43,7 +40,7 @@ class SmlDevice:
         self.status: DeviceStatus = DeviceStatus.STARTUP
 
         self.watchdog: Final = Watchdog(self)
-        self.stream_reader: StreamReaderGroup | SmlStreamReader = create_stream_reader_group()
+        self.stream_reader: StreamReaderGroup = create_stream_reader_group()
 
         self.log = get_logger(self.name)
         self.log_status = self.log.getChild('status')
@@ -54,7 +51,22 @@ class SmlDevice:
         self.device_id: str | None = None
         self.sml_values: Final = SmlValues()
 
+        self.frame_template: FrameTemplate | None = None
+        self.frame_cache: Final = FrameValuesCache(self.parse_frame_values) if CONFIG.general.frame_cache else None
+
         self.frame_handler: Callable[[EnhancedSmlFrame], Any] = self.process_first_frame
+        self.frame_parser: Final = FrameParser(self, executor) if (executor := get_parse_executor()) else None
+
+        # counters for the metrics
+        self.frames: int = 0
+        self.crc_errors: dict[str, int] = {}
+        self.status_changes: dict[str, int] = {}
+        self.timeouts: int = 0
+
+        # Timing of the processing stages
+        self.stats: Final = DeviceStats(self) if CONFIG.diagnostics.device_stats else None
+
+        LOOP_MONITOR.instrument(self)
 
     @property
     def name(self) -> str:
@@ -69,17 +81,27 @@ class SmlDevice:
         if self._source is not None:
             self._source.start()
         self.watchdog.start()
+        if self.frame_parser is not None:
+            self.frame_parser.start()
+        if self.stats is not None:
+            self.stats.start()
 
     async def cancel_and_wait(self) -> None:
         if self._source is not None:
             await self._source.cancel_and_wait()
         await self.watchdog.cancel_and_wait()
+        self.sml_values.stop_ticks()
+        if self.frame_parser is not None:
+            await self.frame_parser.cancel_and_wait()
+        if self.stats is not None:
+            await self.stats.cancel_and_wait()
 
     def set_status(self, new_status: DeviceStatus) -> bool:
         if (old_status := self.status) == new_status or old_status.is_shutdown_status():
             return False
 
         self.status = new_status
+        self.status_changes[new_status.value] = self.status_changes.get(new_status.value, 0) + 1
 
         # Don't log toggling between CRC_ERROR and OK. Only log if new status is not OK
         level = LVL_INFO
@@ -99,29 +121,61 @@ class SmlDevice:
         return True
 
     def on_source_data(self, data: bytes) -> None:
-        frame = None    # type: EnhancedSmlFrame | None
+        if (stats := self.stats) is not None:
+            return stats.time('total', self.process_source_data, data)
+        return self.process_source_data(data)
+
+    def process_source_data(self, data: bytes) -> None:
+        stats = self.stats
+        reader = self.stream_reader
 
         try:
             self.watchdog.feed()
-            self.stream_reader.add(data)
+            if stats is None:
+                reader.add(data)
+            else:
+                stats.time('ingest', reader.add, data)
+        except Exception as e:
+            self.on_error(e)
+            return None
 
+        # The data can contain multiple frames, all of them have to be processed
+        while not self.status.is_shutdown_status():
+            frame = None    # type: EnhancedSmlFrame | None
             try:
-                if (frame := self.stream_reader.get_frame()) is None:
+                try:
+                    frame = reader.get_frame() if stats is None else stats.time('frame', reader.get_frame)
+                    if frame is None:
+                        return None
+                except CrcError as e:
+                    self.log.debug(f'Crc error: {e.crc_calc} != {e.crc_msg}')
+                    # The error is counted for every algorithm which was checked.
+                    # These are all configured ones until the reader has locked onto one.
+                    crc_errors = self.crc_errors
+                    for crc in reader.crc_funcs:
+                        crc_errors[crc] = crc_errors.get(crc, 0) + 1
+                    self.set_status(DeviceStatus.CRC_ERROR)
+                    continue
+
+                # Process Frame
+                self.frames += 1
+                self.frame_handler(frame)
+            except Exception as e:
+                # dump frame if possible
+                if frame is not None:
+                    for line in frame.get_frame_str():
+                        self.log.info(line)
+
+                self.on_error(e)
+
+                # the data of the reader could not be processed, so there is no next frame
+                if frame is None:
                     return None
-            except CrcError as e:
-                self.log.debug(f'Crc error: {e.crc_calc} != {e.crc_msg}')
-                self.set_status(DeviceStatus.CRC_ERROR)
-                return None
-
-            # Process Frame
-            self.frame_handler(frame)
-        except Exception as e:
-            # dump frame if possible
-            if frame is not None:
-                for line in frame.get_frame_str():
-                    self.log.info(line)
+        return None
 
-            self.on_error(e)
+    def on_source_unchanged(self) -> None:
+        # The source is alive but has no new data
+        self.watchdog.feed()
 
     def on_error(self, e: Exception, *, show_traceback: bool = True) -> None:
         self.log.debug(f'Exception {type(e)}: "{e}"')
@@ -145,25 +199,81 @@ class SmlDevice:
         self.set_status(DeviceStatus.SOURCE_FAILED)
 
     def on_timeout(self) -> None:
+        self.timeouts += 1
         self.set_status(DeviceStatus.MSG_TIMEOUT)
 
+    def decode_frame_values(self, frame: EnhancedSmlFrame) -> SmlFrameValues | None:
+        if (template := self.frame_template) is not None:
+            if (values := template.get_frame_values(frame)) is not None:
+                return values
+            self.log.debug('Frame does not match the frame template')
+        return None
+
+    def learn_frame_values(self, frame: EnhancedSmlFrame, values: SmlFrameValues) -> SmlFrameValues:
+        if CONFIG.general.frame_template:
+            self.frame_template = FrameTemplate.create(frame, values)
+        return values
+
+    def parse_frame_values(self, frame: EnhancedSmlFrame) -> SmlFrameValues:
+        if (values := self.decode_frame_values(frame)) is not None:
+            return values
+        return self.learn_frame_values(frame, frame.get_frame_values(self.log))
+
+    async def parse_frame_values_async(self, frame: EnhancedSmlFrame) -> SmlFrameValues:
+        # Decoding with the template is cheap, only the parsing of the whole frame is done in the executor
+        if (values := self.decode_frame_values(frame)) is not None:
+            return values
+
+        assert self.frame_parser is not None
+        entries = await self.frame_parser.get_list_entries(frame)
+        return self.learn_frame_values(frame, SmlFrameValues.create(frame.timestamp, entries))
+
+    def get_frame_values(self, frame: EnhancedSmlFrame) -> SmlFrameValues:
+        if (cache := self.frame_cache) is not None:
+            return cache.get_frame_values(frame)
+        return self.parse_frame_values(frame)
+
+    async def get_frame_values_async(self, frame: EnhancedSmlFrame) -> SmlFrameValues:
+        if (cache := self.frame_cache) is None:
+            return await self.parse_frame_values_async(frame)
+
+        key, values = cache.get_cached_values(frame)
+        if values is None:
+            values = await self.parse_frame_values_async(frame)
+            cache.set_values(key, values)
+        return values
+
     def process_frame(self, frame: EnhancedSmlFrame) -> None:
 
-        frame_values = frame.get_frame_values(self.log)
+        if (stats := self.stats) is None:
+            frame_values = self.get_frame_values(frame)
+            self.sml_values.process_frame(frame_values)
+        else:
+            frame_values = stats.time('values', self.get_frame_values, frame)
+            stats.time('process', self.sml_values.process_frame, frame_values)
+
+        # There was no Error -> OK
+        self.set_status(DeviceStatus.OK)
 
-        self.sml_values.process_frame(frame_values)
+    async def process_frame_async(self, frame: EnhancedSmlFrame) -> None:
+
+        if (stats := self.stats) is None:
+            frame_values = await self.get_frame_values_async(frame)
+            self.sml_values.process_frame(frame_values)
+        else:
+            frame_values = await stats.time_async('values', self.get_frame_values_async(frame))
+            stats.time('process', self.sml_values.process_frame, frame_values)
 
         # There was no Error -> OK
         self.set_status(DeviceStatus.OK)
 
     def setup_values_from_frame(self, frame: EnhancedSmlFrame) -> None:
-        if not isinstance(self.stream_reader, SmlStreamReader):
-            self.stream_reader = self.stream_reader.get_reader()
-            _func_name = self.stream_reader.crc_func.__name__
-            crc_func_name = getattr(self.stream_reader.crc_func, '__module__', _func_name).rsplit('.', 1)[-1]
-            self.log.debug(f'Using crc {crc_func_name:s}')
+        self.log.debug(f'Using crc {self.stream_reader.crc}')
 
-        frame_values = frame.get_frame_values(self.log)
+        if (stats := self.stats) is None:
+            frame_values = self.get_frame_values(frame)
+        else:
+            frame_values = stats.time('values', self.get_frame_values, frame)
 
         # search frame and see if we get a match
         for search_obis in CONFIG.general.device_id_obis:
@@ -183,8 +293,11 @@ class SmlDevice:
         else:
             self.log.debug(f'Device found for {self.device_id:s}')
         setup_device(self, frame_values, device_cfg, CONFIG.general)
+        if stats is not None:
+            stats.instrument_publish()
 
-        self.frame_handler = self.process_frame
+        # The first frame is already parsed, all following frames are parsed in the executor
+        self.frame_handler = self.process_frame if self.frame_parser is None else self.frame_parser.put
 
     def process_first_frame(self, frame: EnhancedSmlFrame) -> None:
 
@@ -195,6 +308,8 @@ class SmlDevice:
             self.on_error(e)
             return None
 
+        # Time based operations are also processed if the meter stalls
+        self.sml_values.start_ticks()
         self.frame_handler(frame)
         return None
 
@@ -8,6 +8,8 @@ from .device_status import DeviceStatus
 
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from . import SmlDevice
 
 
@@ -43,5 +45,8 @@ class SmlDevices:
     def __len__(self) -> int:
         return len(self._devices)
 
+    def __iter__(self) -> Iterator[SmlDevice]:
+        return iter(self._devices)
+
 
 ALL_DEVICES: Final = SmlDevices()
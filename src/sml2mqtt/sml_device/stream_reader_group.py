@@ -1,57 +1,168 @@
 from __future__ import annotations
 
-from smllib import SmlFrame, SmlStreamReader
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Final
+
+import smllib.crc as crc_module
+from smllib.builder import create_context
 from smllib.errors import CrcError
 
 from sml2mqtt import CONFIG
+from sml2mqtt.const import SML_END, SML_ESCAPE, SML_START, EnhancedSmlFrame
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from smllib.builder import CTX_HINT
+
+
+def get_crc_func(crc: str) -> Callable[[memoryview | bytes], int]:
+    try:
+        return getattr(crc_module, crc).get_crc
+    except AttributeError:
+        available = [f'"{n:s}"' for n in dir(crc_module) if not n.startswith('_')]
+        msg = f'Unsupported CRC "{crc}"! Available: {", ".join(available):s}'
+        raise ValueError(msg) from None
 
 
 class StreamReaderGroup:
-    def __init__(self, *crcs: str) -> None:
-        self.readers = [SmlStreamReader(crc=crc) for crc in crcs]
-        self.last_reader: SmlStreamReader | None = None
+    """Reads the frames from one buffer and checks every frame against all configured crc algorithms.
+    The first algorithm which produces a valid frame will be used for all subsequent frames.
 
-    def add(self, _bytes: bytes) -> None:
-        for reader in self.readers:
-            reader.add(_bytes)
+    The received bytes are stored in a preallocated buffer with a fixed size. Frames are cut out of the buffer
+    without copying the buffer and the unprocessed rest is only moved to the front when the buffer is full.
+    """
 
-    def get_frame(self) -> SmlFrame | None:
-        crc_errors = []
-        last_frame: SmlFrame | None = None
-        for reader in self.readers:
-            try:
-                if (ret := reader.get_frame()) is None:
-                    continue
+    def __init__(self, *crcs: str, max_size: int = 50 * 1024) -> None:
+        if not crcs:
+            msg = 'At least one crc algorithm is required'
+            raise ValueError(msg)
+        if max_size < len(SML_START) * 2:
+            msg = f'Buffer size too small: {max_size:d}'
+            raise ValueError(msg)
+
+        self.crc_funcs: dict[str, Callable[[memoryview | bytes], int]] = {crc: get_crc_func(crc) for crc in crcs}
+        self.crc: str | None = None
+
+        self._buf: Final = bytearray(max_size)
+        self._view: Final = memoryview(self._buf)
+        self._start: int = 0
+        self._end: int = 0
 
-                if last_frame is not None:
-                    msg = 'Multiple frames'
-                    raise ValueError(msg)
+        self.build_ctx: Final[CTX_HINT] = create_context()
 
-                if self.last_reader is not None and self.last_reader is not reader:
-                    msg = 'Reader changed'
-                    raise ValueError(msg)
+        # Receives the duration of the crc check if the device stats are enabled
+        self.record_crc_time: Callable[[float], Any] | None = None
 
-                self.last_reader = reader
-                last_frame = ret
-            except CrcError as e:
-                crc_errors.append(e)
+    @property
+    def max_size(self) -> int:
+        return len(self._buf)
+
+    @property
+    def bytes(self) -> bytes:
+        return self._view[self._start:self._end].tobytes()
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def add(self, _bytes: bytes) -> None:
+        size = len(_bytes)
+        max_size = len(self._buf)
 
-        if last_frame is not None:
-            return last_frame
+        # Data does not fit at all -> keep only the newest part
+        if size >= max_size:
+            self._view[:] = memoryview(_bytes)[size - max_size:]
+            self._start = 0
+            self._end = max_size
+            return None
 
-        # all readers issued a crc error -> propagate
-        if len(crc_errors) == len(self.readers):
-            raise crc_errors[0] from None
+        end = self._end
+        if end + size > max_size:
+            # Move the unprocessed data to the front and drop the oldest bytes if necessary
+            start = max(self._start, end + size - max_size)
+            end -= start
+            self._view[:end] = self._view[start:self._end]
+            self._start = 0
 
+        self._view[end:end + size] = _bytes
+        self._end = end + size
         return None
 
-    def get_reader(self) -> SmlStreamReader:
-        if self.last_reader is None:
-            msg = 'Last reader not set'
+    def clear(self) -> None:
+        self._start = 0
+        self._end = 0
+
+    def lock_crc(self, crc: str) -> None:
+        if crc not in self.crc_funcs:
+            msg = f'Unknown crc "{crc:s}"'
             raise ValueError(msg)
-        return self.last_reader
+        self.crc = crc
+        self.crc_funcs = {crc: self.crc_funcs[crc]}
+
+    def get_frame(self) -> EnhancedSmlFrame | None:
+        buf = self._buf
+        stop = self._end
+
+        if (start := buf.find(SML_START, self._start, stop)) == -1:
+            # Keep only the bytes which might be the beginning of the start sequence
+            self._start = max(self._start, stop - len(SML_START) + 1)
+            return None
+
+        # if we start reading in the mid of a message
+        self._start = start
+
+        end = start
+        while (end := buf.find(SML_END, end + 1, stop)) != -1:
+            # escaped escape sequence in the payload
+            if buf[end - 4: end] != SML_ESCAPE:
+                break
+
+        if end == -1:
+            return None
+
+        end += 8
+        if stop < end:
+            return None
+
+        # remove msg from buffer
+        msg = self._view[start:end]
+        if end == stop:
+            self._start = self._end = 0
+        else:
+            self._start = end
+
+        # Last three bytes are PADDING, CRC PART 1, CRC PART 2
+        if (record := self.record_crc_time) is None:
+            self.check_crc(msg)
+        else:
+            start = perf_counter()
+            try:
+                self.check_crc(msg)
+            finally:
+                record(perf_counter() - start)
+
+        padding = msg[-3]
+        frame = msg[8: -1 * (8 + padding)].tobytes().replace(SML_ESCAPE * 2, SML_ESCAPE)
+        return EnhancedSmlFrame(frame, build_ctx=self.build_ctx)
+
+    def check_crc(self, msg: memoryview) -> None:
+        crc_msg = msg[-2] << 8 | msg[-1]
+        crc_data = memoryview(msg)[:-2]
+
+        crc_calc: int | None = None
+        for crc, func in self.crc_funcs.items():
+            if (calc := func(crc_data)) == crc_msg:
+                if self.crc is None:
+                    self.lock_crc(crc)
+                return None
+
+            if crc_calc is None:
+                crc_calc = calc
+
+        raise CrcError(msg.tobytes(), crc_msg, crc_calc)
 
 
 def create_stream_reader_group() -> StreamReaderGroup:
-    crc_algorithms = CONFIG.general.crc
-    return StreamReaderGroup(*crc_algorithms)
+    general = CONFIG.general
+    return StreamReaderGroup(*general.crc, max_size=general.buffer_size)
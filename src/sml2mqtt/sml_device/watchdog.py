@@ -1,31 +1,50 @@
 from __future__ import annotations
 
-from asyncio import Event, TimeoutError, wait_for
+from time import monotonic
 from typing import TYPE_CHECKING, Final
 
-from ..const import DeviceTask
+from sml2mqtt.runtime import LOOP_MONITOR, DeadlineScheduler
 
 
 if TYPE_CHECKING:
     from .sml_device import SmlDevice
 
 
+WATCHDOG_SCHEDULER: Final = DeadlineScheduler('watchdog')
+
+
 class Watchdog:
     def __init__(self, device: SmlDevice) -> None:
         self._timeout: float = -1
         self.device: Final = device
 
-        self._event: Final = Event()
-        self._task: Final  = DeviceTask(device, self._wd_task, name=f'Watchdog Task {self.device.name:s}')
+        self._fed: float = 0
+        # time of the feed which was followed by the last timeout
+        self._fired: float | None = None
+        self._lag_start: float = 0
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} {self.device.name:s} timeout={self._timeout}s>'
+
+    @property
+    def is_running(self) -> bool:
+        return self in WATCHDOG_SCHEDULER
 
     def start(self) -> None:
-        self._task.start()
+        if self._timeout < 0:
+            msg = 'Timeout of the watchdog is not set'
+            raise ValueError(msg)
+
+        self._fed = monotonic()
+        self._fired = None
+        self._lag_start = LOOP_MONITOR.get_lag_total()
+        WATCHDOG_SCHEDULER.add(self, self._fed + self._timeout)
 
-    def cancel(self) -> None:
-        self._task.cancel()
+    def cancel(self) -> bool:
+        return WATCHDOG_SCHEDULER.remove(self)
 
-    async def cancel_and_wait(self):
-        return await self._task.cancel_and_wait()
+    async def cancel_and_wait(self) -> bool:
+        return self.cancel()
 
     def set_timeout(self, timeout: float):
         if timeout < 0.1:
@@ -34,26 +53,28 @@ class Watchdog:
         return self
 
     def feed(self) -> None:
-        self._event.set()
-
-    async def _wd_task(self) -> None:
-        make_call = True
-        while True:
-            self._event.clear()
-
-            try:
-                await wait_for(self._event.wait(), self._timeout)
-                make_call = True
-                continue
-            except TimeoutError:
-                pass
-
-            # callback only once!
-            if not make_call:
-                continue
-            make_call = False
-
+        self._fed = monotonic()
+
+    def check(self, now: float) -> float | None:
+        """Called by the scheduler when the deadline is due. Returns the next deadline."""
+        if (deadline := self._fed + self._timeout) > now:
+            self._lag_start = LOOP_MONITOR.get_lag_total()
+            return deadline
+
+        # If the event loop was blocked the data could not be processed in time,
+        # so the time the loop was blocked is granted as additional time.
+        # A lag below the resolution of the scheduler is only the jitter of the event loop.
+        grace = LOOP_MONITOR.get_grace(self._lag_start)
+        self._lag_start = LOOP_MONITOR.get_lag_total()
+        if grace > WATCHDOG_SCHEDULER.RESOLUTION:
+            return now + grace
+
+        # callback only once!
+        if self._fired != self._fed:
+            self._fired = self._fed
             try:
                 self.device.on_timeout()
             except Exception as e:
                 self.device.on_error(e)
+
+        return now + self._timeout
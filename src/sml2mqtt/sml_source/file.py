@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from asyncio import sleep
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, Final
+
+import sml2mqtt
+from sml2mqtt.__log__ import get_logger
+from sml2mqtt.const import DeviceTask
+
+
+if TYPE_CHECKING:
+    from sml2mqtt.config.inputs import FileSourceSettings
+    from sml2mqtt.const import DeviceProto
+
+
+log = get_logger('file')
+
+FRAME_START: Final = b'\x1b\x1b\x1b\x1b\x01\x01\x01\x01'
+
+
+def read_sml_file(path: Path, fmt: str) -> bytes:
+    if fmt == 'hex':
+        return bytes.fromhex(''.join(path.read_text().split()))
+    return path.read_bytes()
+
+
+class FileSource:
+    """Replays recorded sml data from a file. The data is passed in chunks like it would be read from
+    a serial port, so the whole processing of the device can be measured without a meter.
+    """
+
+    @classmethod
+    async def create(cls, device: DeviceProto, settings: FileSourceSettings) -> FileSource:
+        path = Path(settings.path)
+        if not path.is_absolute() and (config := sml2mqtt.CMD_ARGS.config) is not None:
+            path = config.parent / path
+
+        return cls(device, read_sml_file(path.resolve(), settings.format), name=path.name,
+                   speed=settings.speed, interval=settings.interval, chunk_size=settings.chunk_size,
+                   repeat=settings.repeat)
+
+    def __init__(self, device: DeviceProto, data: bytes, *, name: str,
+                 speed: float = 1, interval: float = 0.2, chunk_size: int = 192, repeat: int = 1) -> None:
+        super().__init__()
+        self.device: Final = device
+
+        self.data: Final = data
+        self.name: Final = name
+
+        # 0 means as fast as possible
+        self.speed: Final = speed
+        self.interval: Final = interval
+        self.chunk_size: Final = chunk_size
+        self.repeat: Final = repeat
+
+        self._task: Final = DeviceTask(device, self._replay_task, name=f'File Task {self.device.name:s}')
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def cancel_and_wait(self) -> bool:
+        return await self._task.cancel_and_wait()
+
+    async def _replay_task(self) -> None:
+        data = self.data
+        size = self.chunk_size
+        delay = self.interval / self.speed if self.speed else 0
+
+        log.debug(f'Replaying {len(data):d} bytes from {self.name:s}')
+
+        start = monotonic()
+        chunks = 0
+        runs = 0
+        while not self.repeat or runs < self.repeat:
+            runs += 1
+            for pos in range(0, len(data), size):
+                # Schedule from the start so we don't drift. Always sleep, so the other tasks (e.g. mqtt) can run
+                chunks += 1
+                await sleep(max(start + chunks * delay - monotonic(), 0))
+
+                self.device.on_source_data(data[pos:pos + size])
+
+        duration = monotonic() - start
+        frames = data.count(FRAME_START) * runs
+        log.info(f'Replayed {frames:d} frames in {duration:.3f}s '
+                 f'({frames / duration if duration else 0:.1f} frames/s)')
+        self.device.on_source_failed(f'Replay of {self.name:s} finished')
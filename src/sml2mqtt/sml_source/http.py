@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 from asyncio import TimeoutError, sleep
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from itertools import count
+from math import floor, inf
+from time import monotonic
 from typing import TYPE_CHECKING, Final
 
-from aiohttp import BasicAuth, ClientError, ClientSession, ClientTimeout
+from aiohttp import BasicAuth, ClientError, ClientResponse, ClientSession, ClientTimeout, TCPConnector, hdrs
 
+from sml2mqtt import CONFIG
 from sml2mqtt.__log__ import get_logger
+from sml2mqtt.config.inputs import HttpSourceSettings
 from sml2mqtt.const import DeviceTask
 from sml2mqtt.errors import HttpStatusError
 from sml2mqtt.runtime import on_shutdown
 
 
 if TYPE_CHECKING:
-    from sml2mqtt.config.inputs import HttpSourceSettings
     from sml2mqtt.const import DeviceProto
 
 
@@ -20,6 +26,17 @@ log = get_logger('http')
 
 SESSION: ClientSession | None = None
 
+# Every source makes only one request at a time, the second connection is for the request
+# which is started while the previous connection is still being closed
+LIMIT_PER_HOST: Final = 2
+KEEPALIVE_TIMEOUT: Final = 15
+
+
+def get_keepalive_timeout() -> float:
+    # Idle connections must be kept open longer than the longest interval, otherwise they can't be reused
+    intervals = [s.interval for s in CONFIG.inputs if isinstance(s, HttpSourceSettings)]
+    return max([KEEPALIVE_TIMEOUT, *(i * 2 for i in intervals)])
+
 
 async def get_session() -> ClientSession:
     global SESSION
@@ -27,7 +44,9 @@ async def get_session() -> ClientSession:
     if SESSION is not None:
         return SESSION
 
-    SESSION = ClientSession()
+    # The total number of connections is not limited because every gateway is a different host
+    connector = TCPConnector(limit=0, limit_per_host=LIMIT_PER_HOST, keepalive_timeout=get_keepalive_timeout())
+    SESSION = ClientSession(connector=connector)
     on_shutdown(close_session, 'Close http session')
     return SESSION
 
@@ -45,6 +64,180 @@ async def close_session():
     await sleep(0.250)
 
 
+def get_conditional_headers(resp: ClientResponse) -> dict[str, str]:
+    """Create the headers for the next request so the server can answer with 304 if the data is unchanged"""
+    if (etag := resp.headers.get(hdrs.ETAG)) is not None:
+        return {hdrs.IF_NONE_MATCH: etag}
+
+    # Last-Modified has only a resolution of one second, so it can only be used if it is at least
+    # one second older than the response. Otherwise, data which changes in the same second would be missed.
+    # https://www.rfc-editor.org/rfc/rfc9110#section-8.8.2.2
+    if (modified := resp.headers.get(hdrs.LAST_MODIFIED)) is not None and \
+            (date := resp.headers.get(hdrs.DATE)) is not None:
+        try:
+            if (parsedate_to_datetime(date) - parsedate_to_datetime(modified)).total_seconds() >= 1:
+                return {hdrs.IF_MODIFIED_SINCE: modified}
+        except (TypeError, ValueError):
+            pass
+
+    return {}
+
+
+class PollRequest(Enum):
+    FIXED = 'fixed'
+    SEARCH = 'search'
+    TARGET = 'target'
+    PROBE = 'probe'
+    LATE = 'late'
+    KEEP_ALIVE = 'keep alive'
+
+
+class PollTiming:
+    """Learns when the gateway has new data and decides when the next request is made.
+
+    Every response narrows the window in which the last update of the gateway happened: new data means the update
+    was between the previous request and this request, unchanged data means the next update is after this request.
+    The window of the previous update is moved by the period and combined with the new window.
+    As long as the window is wide, the requests are made in the middle of the window of the next update (search).
+    Once it's narrow the requests are made shortly after the next update is expected. If the gateway updates
+    faster than the interval, updates are skipped so the interval is kept on average.
+    Every few requests an additional request is made shortly before the expected update, so updates which
+    happen earlier than expected are detected. If the data is unexpectedly unchanged the request is repeated with
+    an increasing delay. As long as the period is unknown the configured interval is used. It is halved while every
+    response has new data, because then the gateway might update faster than the interval. If the data still changes
+    with every response (e.g. it contains a timestamp) the period can't be learned and the interval is kept.
+    """
+
+    MIN_DELAY: Final = 0.1
+    MARGIN_FACTOR: Final = 0.05
+    PROBE_EVERY: Final = 8
+    MAX_HALVINGS: Final = 2
+    MAX_CHANGES: Final = 8
+
+    def __init__(self, interval: float, max_delay: float) -> None:
+        self.interval: Final = interval
+        self.max_delay: Final = max(interval, max_delay)
+
+        self.period: float | None = None
+
+        # Window of the time of the last update
+        self.lo: float | None = None
+        self.hi: float | None = None
+
+        self._request: PollRequest = PollRequest.FIXED
+        self._last_request: float | None = None
+        self._last_changed: float | None = None
+        self._last_unchanged: bool = False
+        # changed responses without an unchanged response in between while the period is unknown
+        self._changes: int = 0
+        self._late: int = 0
+        self._targets: int = 0
+        # Middle of the first narrow window
+        self._reference: float | None = None
+
+    def __repr__(self) -> str:
+        period = f'{self.period:.3f}s' if self.period is not None else '-'
+        return f'<{self.__class__.__name__:s} interval={self.interval}s period={period:s}>'
+
+    def get_margin(self) -> float:
+        return max(self.MIN_DELAY, self.period * self.MARGIN_FACTOR) / 2
+
+    def on_response(self, now: float, *, changed: bool) -> None:
+        """now is the time when the request was started"""
+        last = self._last_request
+        self._last_request = now
+
+        if (period := self.period) is None:
+            return self._learn_period(last, now, changed=changed)
+
+        if not changed:
+            # The next update is after now
+            self.lo = max(self.lo, now - period)
+            if self.lo > self.hi or self._late:
+                # The update is later than expected, the requests are repeated with an increasing delay
+                self._late += 1
+                self.hi = inf
+            return None
+
+        self._late = 0
+        self._last_changed = now
+
+        # The update was between the last request and now, and it is the newest one so not older than one period
+        lo, hi = max(last, now - period), now
+        if (old_hi := self.hi) != inf and (updates := floor((now - (old_lo := self.lo)) / period)) >= 1:
+            # Move the window of the previous update to the update which was just seen and combine both.
+            # The margin is only used if the windows don't overlap, otherwise the window would grow with every update.
+            move = updates * period
+            for margin in (0, self.get_margin()):
+                if (new_lo := max(lo, old_lo + move - margin)) < (new_hi := min(hi, old_hi + move + margin)):
+                    lo, hi = new_lo, new_hi
+                    break
+        self.lo, self.hi = lo, hi
+
+        # The period is learned from the first narrow window and the current one,
+        # so the error of the windows gets smaller with every update
+        if hi - lo > 4 * self.get_margin():
+            return None
+        if (reference := self._reference) is None:
+            self._reference = (lo + hi) / 2
+        elif (updates := round(((lo + hi) / 2 - reference) / period)) >= 1:
+            self.period = ((lo + hi) / 2 - reference) / updates
+        return None
+
+    def _learn_period(self, last: float | None, now: float, *, changed: bool) -> None:
+        # Only a change after an unchanged response shows that there was exactly one update since the
+        # last change. If the data changes every time the gateway might update faster and the delay is halved.
+        if changed:
+            if self._last_unchanged and self._last_changed is not None:
+                self.period = now - self._last_changed
+            elif self._last_changed is not None:
+                self._changes += 1
+            self.lo, self.hi = last if last is not None else now, now
+            self._last_changed = now
+        self._last_unchanged = not changed
+        return None
+
+    def _get_request(self, now: float) -> tuple[PollRequest, float]:
+        if (period := self.period) is None or self.lo is None:
+            if self._changes >= self.MAX_CHANGES:
+                return PollRequest.FIXED, self.interval
+            return PollRequest.FIXED, self.interval / 2 ** min(self._changes, self.MAX_HALVINGS)
+
+        margin = self.get_margin()
+        if self._late:
+            return PollRequest.LATE, min(margin * 2 ** self._late, self.interval)
+
+        lo, hi = self.lo, self.hi
+        if hi - lo > 4 * margin:
+            # search: request in the middle of the window of the next update
+            return PollRequest.SEARCH, (lo + hi) / 2 + period - now
+
+        if self._request is PollRequest.PROBE:
+            return PollRequest.TARGET, self.hi + period + margin - now
+
+        self._targets += 1
+        if self._targets >= self.PROBE_EVERY:
+            self._targets = 0
+            return PollRequest.PROBE, lo + period - 2 * margin - now
+
+        updates = max(1, round(self.interval / period))
+        return PollRequest.TARGET, hi + updates * period + margin - now
+
+    def get_delay(self, now: float) -> float:
+        request, delay = self._get_request(now)
+        if delay > self.max_delay:
+            # Request the data anyway, so the watchdog does not time out
+            request, delay = PollRequest.KEEP_ALIVE, self.max_delay
+
+        self._request = request
+        return max(delay, self.MIN_DELAY)
+
+
+# The requests of the sources are spread evenly over the interval
+_SOURCE_NR: Final = count()
+_GOLDEN_RATIO: Final = (5 ** 0.5 - 1) / 2
+
+
 class HttpSource:
 
     @classmethod
@@ -53,19 +246,25 @@ class HttpSource:
         if settings.user or settings.password:
             auth = BasicAuth(settings.user, settings.password)
 
-        return cls(device, str(settings.url), settings.interval, auth, timeout=settings.get_request_timeout())
+        timing = PollTiming(settings.interval, settings.timeout / 2) if settings.adaptive_interval else None
+        return cls(device, str(settings.url), settings.interval, auth, timeout=settings.get_request_timeout(),
+                   skip_unchanged=settings.skip_unchanged, timing=timing)
 
     def __init__(self, device: DeviceProto,
                  url: str, interval: float,
-                 auth: BasicAuth | None, timeout: ClientTimeout) -> None:
+                 auth: BasicAuth | None, timeout: ClientTimeout, *, skip_unchanged: bool = True,
+                 timing: PollTiming | None = None) -> None:
         super().__init__()
         self.device: Final = device
 
         self.url: Final = url
         self.auth: Final = auth
         self.timeout: Final = timeout
+        self.skip_unchanged: Final = skip_unchanged
+        self.timing: Final = timing
 
         self.interval = interval
+        self.offset: Final = (next(_SOURCE_NR) * _GOLDEN_RATIO) % 1
         self._task: Final = DeviceTask(device, self._http_task, name=f'Http Task {self.device.name:s}')
 
     def start(self) -> None:
@@ -83,19 +282,28 @@ class HttpSource:
             self.device.on_source_failed(f'Could not create client session: {e}')
             return None
 
-        interval: float = self.interval
+        interval: float = self.interval * self.offset
         com_errors: int = 0
 
+        headers: dict[str, str] = {}
+        last_payload: bytes | None = None
+
         while True:
             await sleep(interval)
             interval = self.interval
 
+            start = monotonic()
             try:
-                resp = await session.get(self.url, auth=self.auth, timeout=self.timeout)
-                if resp.status != 200:
-                    raise HttpStatusError(resp.status)  # noqa: TRY301
-
-                payload = await resp.read()
+                # The context manager always releases the connection, so it can be reused for the next request
+                async with session.get(self.url, auth=self.auth, timeout=self.timeout, headers=headers) as resp:
+                    if resp.status == 304:
+                        payload = None
+                    elif resp.status != 200:
+                        raise HttpStatusError(resp.status)  # noqa: TRY301
+                    else:
+                        payload = await resp.read()
+                        if self.skip_unchanged:
+                            headers = get_conditional_headers(resp)
                 com_errors = 0
             except Exception as e:
                 if isinstance(e, (ClientError, HttpStatusError, TimeoutError)):
@@ -111,4 +319,16 @@ class HttpSource:
                 self.device.on_error(e, show_traceback=False)
                 continue
 
+            # Comparing with the previous payload is cheaper than processing it again
+            changed = payload is not None and payload != last_payload
+            if (timing := self.timing) is not None:
+                timing.on_response(start, changed=changed)
+                interval = timing.get_delay(monotonic())
+
+            if changed:
+                last_payload = payload
+            elif self.skip_unchanged:
+                self.device.on_source_unchanged()
+                continue
+
             self.device.on_source_data(payload)
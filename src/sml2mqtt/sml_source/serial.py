@@ -3,13 +3,17 @@ from __future__ import annotations
 import asyncio
 import logging
 from asyncio import Protocol
+from math import ceil
 from time import monotonic
 from typing import TYPE_CHECKING, Final
 
+from serial import PARITY_NONE
 from serial_asyncio import SerialTransport, create_serial_connection
 
+from sml2mqtt import CONFIG
+from sml2mqtt.__args__ import CMD_ARGS
 from sml2mqtt.__log__ import get_logger
-from sml2mqtt.const import DeviceTask
+from sml2mqtt.const import SML_END, SML_ESCAPE, SML_START, DeviceTask
 
 
 if TYPE_CHECKING:
@@ -20,12 +24,100 @@ if TYPE_CHECKING:
 log = get_logger('serial')
 
 
+def get_byte_time(baudrate: int, bytesize: int, parity: str, stopbits: float) -> float:
+    """Time in seconds which is required to transfer one byte (start bit, data bits, parity bit and stop bits)"""
+    return (1 + bytesize + (parity != PARITY_NONE) + stopbits) / baudrate
+
+
+def find_frame_end(buf: bytes | bytearray, start: int) -> int:
+    """Return the position after the end of the last complete frame in buf or -1 if there is none.
+    Only the part from start is searched for the end sequence."""
+    end = len(buf)
+    while (pos := buf.rfind(SML_END, start, end)) != -1:
+        # An escaped escape sequence followed by 0x1A is no end.
+        # The end sequence is followed by the number of padding bytes and the crc.
+        if buf[max(0, pos - 4): pos] == SML_ESCAPE or pos + len(SML_END) + 3 > len(buf):
+            end = pos + 4
+            continue
+        return pos + len(SML_END) + 3
+    return -1
+
+
+def find_frame_start(buf: bytes | bytearray, end: int) -> int:
+    """Return the position of the start sequence of the frame which ends at end or -1 if there is none"""
+    while (pos := buf.rfind(SML_START, 0, end)) != -1:
+        # An escaped escape sequence followed by 0x01010101 is no start
+        if buf[max(0, pos - 4): pos] != SML_ESCAPE:
+            return pos
+        end = pos + len(SML_START) - 1
+    return -1
+
+
+class ReadTiming:
+    """Decides how long the reading of the serial port is paused after data was received,
+    so the data is processed in as few chunks as possible without delaying the frames.
+
+    While a frame is received the reading is paused for the time which is required to transfer the rest of the frame.
+    When the end of a frame was received the reading is paused until shortly before the next frame is expected.
+    As long as the size and the period of the frames are unknown a fixed interval is used.
+    """
+
+    DEFAULT_PAUSE: Final = 0.2
+    MIN_PAUSE: Final = 0.01
+    MAX_PAUSE: Final = 2.0
+
+    def __init__(self, byte_time: float) -> None:
+        self.byte_time: Final = byte_time
+
+        self.frame_size: int | None = None
+        self.frame_period: float | None = None
+
+        self._frame_end: float | None = None
+
+    def __repr__(self) -> str:
+        period = f'{self.frame_period:.3f}s' if self.frame_period is not None else '-'
+        return (f'<{self.__class__.__name__:s} byte_time={self.byte_time * 1000:.3f}ms '
+                f'frame_size={self.frame_size} frame_period={period:s}>')
+
+    def get_read_size(self) -> int:
+        # one read should get everything that was received during the longest pause
+        return max(10_240, ceil(self.MAX_PAUSE / self.byte_time))
+
+    def on_frame(self, size: int, now: float) -> None:
+        self.frame_size = size
+        if self._frame_end is not None:
+            period = now - self._frame_end
+            self.frame_period = period if self.frame_period is None else self.frame_period * 0.75 + period * 0.25
+        self._frame_end = now
+
+    def get_pause(self, now: float, buffered: int) -> float:
+        """Return the pause for the reading. buffered is the number of bytes of the frame which is received."""
+        if self.frame_size is None:
+            return self.DEFAULT_PAUSE
+
+        if buffered:
+            # time until the rest of the frame is transferred
+            pause = (self.frame_size - buffered) * self.byte_time
+            return min(max(pause, self.MIN_PAUSE), self.MAX_PAUSE)
+
+        if self.frame_period is None or self._frame_end is None:
+            return self.DEFAULT_PAUSE
+
+        # resume shortly before the next frame starts
+        frame_duration = self.frame_size * self.byte_time
+        guard = max(0.05, self.frame_period * 0.1)
+        pause = self._frame_end + self.frame_period - frame_duration - guard - now
+        return min(max(pause, self.MIN_PAUSE), self.MAX_PAUSE)
+
+
 class SerialSource(Protocol):
     @classmethod
     async def create(cls, device: DeviceProto, settings: SerialSourceSettings) -> SerialSource:
+        byte_time = get_byte_time(settings.baudrate, settings.bytesize, settings.parity, settings.stopbits)
+
         transport, protocol = await create_serial_connection(
             asyncio.get_event_loop(),
-            lambda: cls(device, settings.url),
+            lambda: cls(device, settings.url, byte_time),
             url=settings.url,
             baudrate=settings.baudrate, parity=settings.parity,
             stopbits=settings.stopbits, bytesize=settings.bytesize
@@ -33,17 +125,21 @@ class SerialSource(Protocol):
 
         return protocol
 
-    def __init__(self, device: DeviceProto, url: str) -> None:
+    def __init__(self, device: DeviceProto, url: str, byte_time: float) -> None:
         super().__init__()
 
         self.url: Final = url
         self.device: Final = device
 
         self.transport: SerialTransport | None = None
+        self.timing: Final = ReadTiming(byte_time)
 
-        self._task: Final = DeviceTask(device, self._chunk_task, name=f'Serial Task {self.device.name:s}')
+        # the received data is only passed to the device when a frame is complete
+        self._buf: Final = bytearray()
+        self.max_buffer: Final = CONFIG.general.buffer_size
 
-        self.last_read: float | None = 0.0
+        self._received: Final = asyncio.Event()
+        self._task: Final = DeviceTask(device, self._chunk_task, name=f'Serial Task {self.device.name:s}')
 
     def start(self) -> None:
         self._task.start()
@@ -55,8 +151,12 @@ class SerialSource(Protocol):
         self.transport = transport
         log.debug(f'Port {self.url:s} successfully opened')
 
-        # so we can read bigger chunks at once in case someone uses a higher baudrate
-        self.transport._max_read_size = 10_240
+        # so we can read everything that was received while the reading was paused
+        self.transport._max_read_size = read_size = self.timing.get_read_size()
+
+        # In analyze mode the chosen parameters are shown
+        log.log(logging.INFO if CMD_ARGS.analyze else logging.DEBUG,
+                f'Port {self.url:s}: {self.timing.byte_time * 1000:.3f}ms per byte, read size {read_size:d} bytes')
 
     def connection_lost(self, exc: Exception | None) -> None:
 
@@ -72,20 +172,37 @@ class SerialSource(Protocol):
     def data_received(self, data: bytes) -> None:
         self.transport.pause_reading()
 
-        self.last_read = monotonic()
-        self.device.on_source_data(data)
+        self._received.set()
 
-    async def _chunk_task(self) -> None:
-        interval = 0.2
+        # The end sequence can be split across multiple reads, so the last bytes of the buffer are searched, too
+        buf = self._buf
+        start = max(0, len(buf) - len(SML_END) - 2)
+        buf.extend(data)
 
+        if (end := find_frame_end(buf, start)) != -1:
+            # Learn only the size of the last frame. The buffer can contain multiple frames or leading garbage.
+            frame_start = find_frame_start(buf, end)
+            self.timing.on_frame(end - max(frame_start, 0), monotonic())
+        elif len(buf) >= self.max_buffer:
+            # no end of a frame found, the device decides what to do with the data
+            end = len(buf)
+        else:
+            return None
+
+        frame = bytes(buf[:end])
+        del buf[:end]
+        self.device.on_source_data(frame)
+        return None
+
+    async def _chunk_task(self) -> None:
         while True:
-            await asyncio.sleep(interval)
+            await self._received.wait()
+            self._received.clear()
 
-            if self.last_read is not None:
-                diff_to_interval = interval - (monotonic() - self.last_read)
-                self.last_read = None
-                if diff_to_interval >= 0.001:
-                    await asyncio.sleep(diff_to_interval)
+            pause = self.timing.get_pause(monotonic(), len(self._buf))
+            if CMD_ARGS.analyze:
+                log.info(f'{self.timing} pause {pause * 1000:.0f}ms')
+            await asyncio.sleep(pause)
 
             # safe to be called multiple times in a row
             self.transport.resume_reading()
@@ -1,9 +1,17 @@
 
-from sml2mqtt.config.inputs import HttpSourceSettings, SerialSourceSettings
+from sml2mqtt.config.inputs import (
+    FileSourceSettings,
+    HttpSourceSettings,
+    SerialSourceSettings,
+    TcpSourceSettings,
+    UdpSourceSettings,
+)
 from sml2mqtt.const import DeviceProto, SourceProto
 
 
-async def create_source(device: DeviceProto, settings: SerialSourceSettings | HttpSourceSettings) -> SourceProto:
+async def create_source(device: DeviceProto,
+                        settings: SerialSourceSettings | HttpSourceSettings | TcpSourceSettings | UdpSourceSettings |
+                        FileSourceSettings) -> SourceProto:
 
     if isinstance(settings, SerialSourceSettings):
         from .serial import SerialSource
@@ -11,6 +19,15 @@ async def create_source(device: DeviceProto, settings: SerialSourceSettings | Ht
     if isinstance(settings, HttpSourceSettings):
         from .http import HttpSource
         return await HttpSource.create(device, settings)
+    if isinstance(settings, TcpSourceSettings):
+        from .tcp import TcpSource
+        return await TcpSource.create(device, settings)
+    if isinstance(settings, UdpSourceSettings):
+        from .udp import UdpSource
+        return await UdpSource.create(device, settings)
+    if isinstance(settings, FileSourceSettings):
+        from .file import FileSource
+        return await FileSource.create(device, settings)
 
     msg = 'Unknown source input type'
     raise TypeError(msg)
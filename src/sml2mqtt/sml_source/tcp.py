@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+from asyncio import Event, Protocol, Transport, get_running_loop, wait_for
+from typing import TYPE_CHECKING, Final
+
+from sml2mqtt.__log__ import get_logger
+from sml2mqtt.const import DeviceTask
+from sml2mqtt.mqtt import DynDelay
+
+
+if TYPE_CHECKING:
+    from sml2mqtt.config.inputs import TcpSourceSettings
+    from sml2mqtt.const import DeviceProto
+
+
+log = get_logger('tcp')
+
+
+class TcpSource(Protocol):
+    @classmethod
+    async def create(cls, device: DeviceProto, settings: TcpSourceSettings) -> TcpSource:
+        return cls(device, settings.host, settings.port,
+                   connect_timeout=settings.timeout, max_delay=settings.reconnect_delay)
+
+    def __init__(self, device: DeviceProto, host: str, port: int, *,
+                 connect_timeout: float = 6, max_delay: float = 60) -> None:
+        super().__init__()
+        self.device: Final = device
+
+        self.host: Final = host
+        self.port: Final = port
+        self.connect_timeout: Final = connect_timeout
+
+        # The first connection is made immediately, the delay is only reset when data was received.
+        # A bridge which accepts the connection and closes it immediately causes no busy loop.
+        self.delay: Final = DynDelay(0, max_delay)
+
+        self.transport: Transport | None = None
+        self._lost: Final = Event()
+        self._task: Final = DeviceTask(device, self._connect_task, name=f'Tcp Task {self.device.name:s}')
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} {self.host:s}:{self.port:d}>'
+
+    def start(self) -> None:
+        self._task.start()
+
+    async def cancel_and_wait(self) -> bool:
+        return await self._task.cancel_and_wait()
+
+    def connection_made(self, transport: Transport) -> None:
+        self.transport = transport
+        self._lost.clear()
+        log.debug(f'Connected to {self.host:s}:{self.port:d}')
+
+        # Detect a connection where the other side is gone without closing it
+        if (sock := transport.get_extra_info('socket')) is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        # The data of the first read resets the delay, then everything is passed straight to the device
+        self.data_received = self._first_data_received
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.transport = None
+        self._lost.set()
+
+        if exc is None:
+            log.info(f'Connection to {self.host:s}:{self.port:d} was closed')
+        else:
+            log.warning(f'Connection to {self.host:s}:{self.port:d} was lost: {exc}')
+
+    def _first_data_received(self, data: bytes) -> None:
+        self.delay.reset()
+        self.data_received = self.device.on_source_data
+        self.device.on_source_data(data)
+
+    async def _connect_task(self) -> None:
+        loop = get_running_loop()
+
+        while True:
+            await self.delay.wait()
+            self.delay.increase()
+
+            log.debug(f'Connecting to {self.host:s}:{self.port:d}')
+            try:
+                await wait_for(loop.create_connection(lambda: self, self.host, self.port), self.connect_timeout)
+            except (OSError, asyncio.TimeoutError) as e:
+                log.warning(f'Could not connect to {self.host:s}:{self.port:d}: {type(e).__name__:s} {e} '
+                            f'(next try in {self.delay.curr:.0f}s)')
+                continue
+
+            try:
+                await self._lost.wait()
+            finally:
+                if (transport := self.transport) is not None:
+                    transport.close()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import socket
+from asyncio import DatagramProtocol, DatagramTransport, get_running_loop
+from typing import TYPE_CHECKING, Final
+
+from sml2mqtt.__log__ import get_logger
+
+
+if TYPE_CHECKING:
+    from sml2mqtt.config.inputs import UdpSourceSettings
+    from sml2mqtt.const import DeviceProto
+
+
+log = get_logger('udp')
+
+# Number of unknown senders which are logged
+MAX_LOGGED_SENDERS: Final = 100
+
+
+class UdpEndpoint(DatagramProtocol):
+    """One socket which receives the packets of many gateways and passes them to the devices.
+    The device is found by the address of the sender or by the prefix of the packet."""
+
+    def __init__(self, bind: str, port: int) -> None:
+        super().__init__()
+        self.bind: Final = bind
+        self.port: Final = port
+
+        self.transport: DatagramTransport | None = None
+        self.groups: Final[set[str]] = set()
+
+        self._senders: Final[dict[str, DeviceProto]] = {}
+        # prefix length -> prefix -> device
+        self._prefixes: Final[dict[int, dict[bytes, DeviceProto]]] = {}
+
+        self.unknown: int = 0
+        self._unknown_senders: Final[set[str]] = set()
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} {self.bind:s}:{self.port:d} devices={len(self):d}>'
+
+    def __len__(self) -> int:
+        return len(self._senders) + sum(len(devices) for devices in self._prefixes.values())
+
+    def connection_made(self, transport: DatagramTransport) -> None:
+        self.transport = transport
+        log.debug(f'Listening on {self.bind:s}:{self.port:d}')
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.transport = None
+        if exc is not None:
+            log.error(f'Socket {self.bind:s}:{self.port:d} was closed: {exc}')
+
+    def error_received(self, exc: Exception) -> None:
+        log.warning(f'Error on socket {self.bind:s}:{self.port:d}: {exc}')
+
+    def join_group(self, group: str) -> None:
+        if group in self.groups:
+            return None
+
+        sock: socket.socket = self.transport.get_extra_info('socket')
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                        socket.inet_aton(group) + socket.inet_aton(self.bind))
+        self.groups.add(group)
+        log.debug(f'Joined multicast group {group:s} on {self.bind:s}:{self.port:d}')
+        return None
+
+    def add_device(self, device: DeviceProto, sender: str | None, prefix: bytes | None) -> None:
+        if sender is not None:
+            if sender in self._senders:
+                msg = f'Sender {sender:s} is already used on {self.bind:s}:{self.port:d}'
+                raise ValueError(msg)
+            self._senders[sender] = device
+            return None
+
+        devices = self._prefixes.setdefault(len(prefix), {})
+        if prefix in devices:
+            msg = f'Prefix {prefix.hex():s} is already used on {self.bind:s}:{self.port:d}'
+            raise ValueError(msg)
+        devices[prefix] = device
+        return None
+
+    def remove_device(self, sender: str | None, prefix: bytes | None) -> None:
+        if sender is not None:
+            self._senders.pop(sender, None)
+            return None
+
+        if (devices := self._prefixes.get(len(prefix))) is not None:
+            devices.pop(prefix, None)
+            if not devices:
+                self._prefixes.pop(len(prefix))
+        return None
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        if (device := self._senders.get(addr[0])) is not None:
+            device.on_source_data(data)
+            return None
+
+        for length, devices in self._prefixes.items():
+            if (device := devices.get(data[:length])) is not None:
+                device.on_source_data(data[length:])
+                return None
+
+        self.unknown += 1
+        # Log every sender only once, so a flood of packets can't flood the log
+        if addr[0] not in self._unknown_senders and len(self._unknown_senders) < MAX_LOGGED_SENDERS:
+            self._unknown_senders.add(addr[0])
+            log.debug(f'Ignored packet from unknown sender {addr[0]:s}:{addr[1]:d}')
+        return None
+
+
+ENDPOINTS: Final[dict[tuple[str, int], UdpEndpoint]] = {}
+
+
+async def get_endpoint(bind: str, port: int) -> UdpEndpoint:
+    if (endpoint := ENDPOINTS.get((bind, port))) is not None:
+        return endpoint
+
+    loop = get_running_loop()
+    _, endpoint = await loop.create_datagram_endpoint(lambda: UdpEndpoint(bind, port), local_addr=(bind, port))
+    ENDPOINTS[(bind, port)] = endpoint
+    return endpoint
+
+
+class UdpSource:
+    @classmethod
+    async def create(cls, device: DeviceProto, settings: UdpSourceSettings) -> UdpSource:
+        endpoint = await get_endpoint(*settings.get_endpoint())
+        if settings.multicast_group is not None:
+            endpoint.join_group(str(settings.multicast_group))
+
+        return cls(
+            device, endpoint,
+            sender=str(settings.sender) if settings.sender is not None else None,
+            prefix=bytes.fromhex(settings.prefix) if settings.prefix is not None else None
+        )
+
+    def __init__(self, device: DeviceProto, endpoint: UdpEndpoint, *,
+                 sender: str | None = None, prefix: bytes | None = None) -> None:
+        if (sender is None) == (prefix is None):
+            msg = 'Either sender or prefix must be set'
+            raise ValueError(msg)
+
+        self.device: Final = device
+        self.endpoint: Final = endpoint
+        self.sender: Final = sender
+        self.prefix: Final = prefix
+
+        # The packets are passed to the device as soon as it's added to the endpoint
+        self.endpoint.add_device(device, sender, prefix)
+
+    def __repr__(self) -> str:
+        name = self.sender if self.sender is not None else f'prefix {self.prefix.hex():s}'
+        return f'<{self.__class__.__name__:s} {name:s} on {self.endpoint.bind:s}:{self.endpoint.port:d}>'
+
+    def start(self) -> None:
+        pass
+
+    async def cancel_and_wait(self) -> None:
+        endpoint = self.endpoint
+        endpoint.remove_device(self.sender, self.prefix)
+
+        # The last device closes the socket
+        if len(endpoint) == 0 and ENDPOINTS.get((endpoint.bind, endpoint.port)) is endpoint:
+            ENDPOINTS.pop((endpoint.bind, endpoint.port))
+            if (transport := endpoint.transport) is not None:
+                transport.close()
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Final
 
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterable
 
     from smllib.sml import SmlListEntry
 
@@ -45,6 +45,25 @@ class OperationContainerBase:
         return self
 
 
+class ValueOperationWithTickBase(ValueOperationBase):
+    """Operation which also produces values when no new value was received, e.g. because the meter stalled.
+    The value is then processed without a value and a frame without entries."""
+
+    def get_next_tick(self, now: float) -> float:
+        """Return the (monotonic) time when the operation has to be processed without a new value"""
+        raise NotImplementedError()
+
+
+def get_tick_operations(operations: Iterable[ValueOperationBase]) -> tuple[ValueOperationWithTickBase, ...]:
+    ret: list[ValueOperationWithTickBase] = []
+    for op in operations:
+        if isinstance(op, ValueOperationWithTickBase):
+            ret.append(op)
+        if isinstance(op, OperationContainerBase):
+            ret.extend(get_tick_operations(op.operations))
+    return tuple(ret)
+
+
 class ValueOperationWithStartupBase(ValueOperationBase):
     _PROCESS_VALUE_BACKUP_ATTR: Final = '_process_value_original'
 
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from math import isfinite
+from typing import TYPE_CHECKING, Any, Final
+
+from sml2mqtt.sml_value.operations import (
+    AffineOperation,
+    FactorOperation,
+    OffsetOperation,
+    OnChangeFilterOperation,
+    OrOperation,
+    RangeFilterOperation,
+    RoundOperation,
+    SequenceOperation,
+    SkipZeroMeterOperation,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from sml2mqtt.sml_value.base import OperationContainerBase, SmlValueInfo, ValueOperationBase
+
+
+class OperationCode:
+    def __init__(self, lines: Iterable[str], *, skip_none: bool = False, keeps_value: bool = False) -> None:
+        self.lines: Final = tuple(lines)
+        # code is only executed if the value is not None and None is passed through
+        self.skip_none: Final = skip_none
+        # code will never change a value to None
+        self.keeps_value: Final = keeps_value
+
+
+class OperationCompiler:
+    """Generates the source of one function which processes all operations of a container.
+    Operations without inline code are called through the attribute of the object,
+    so operations which swap their process_value method still work as expected.
+    """
+
+    def __init__(self) -> None:
+        self.namespace: Final[dict[str, Any]] = {}
+        self._names: int = 0
+
+    def add_object(self, obj: Any, prefix: str = 'op') -> str:
+        name = f'{prefix:s}{self._names:d}'
+        self._names += 1
+        self.namespace[name] = obj
+        return name
+
+    def create_var(self) -> str:
+        name = f'v{self._names:d}'
+        self._names += 1
+        return name
+
+    def get_const(self, value: Any) -> str:
+        # Numbers can be inlined, everything else is looked up from the namespace
+        if type(value) is int or (type(value) is float and isfinite(value)):
+            return repr(value)
+        return self.add_object(value, prefix='c')
+
+    def get_code(self, operations: Iterable[ValueOperationBase], var: str) -> list[str]:
+        lines: list[str] = []
+        none_check = False
+
+        for op in operations:
+            func = MAPPING.get(type(op), get_code_call)
+            if not (code := func(self, op, var)).lines:
+                continue
+
+            if not code.skip_none:
+                lines.extend(code.lines)
+                none_check = False
+                continue
+
+            # consecutive operations which keep the value share the same check
+            if not none_check:
+                lines.append(f'if {var:s} is not None:')
+            lines.extend(f'    {line:s}' for line in code.lines)
+            none_check = code.keeps_value
+
+        return lines
+
+    def get_source(self, operations: Iterable[ValueOperationBase]) -> str:
+        lines = ['def process_operations(value, info):']
+        lines.extend(f'    {line:s}' for line in self.get_code(operations, 'value'))
+        lines.append('    return value')
+        return '\n'.join(lines) + '\n'
+
+    def compile(self, obj: OperationContainerBase) -> Callable[[float | None, SmlValueInfo], float | None]:
+        source = self.get_source(obj.operations)
+        exec(compile(source, f'<operations of {obj}>', 'exec'), self.namespace)   # noqa: S102
+        return self.namespace['process_operations']
+
+
+def compile_operations(obj: OperationContainerBase) -> Callable[[float | None, SmlValueInfo], float | None]:
+    return OperationCompiler().compile(obj)
+
+
+def get_code_call(c: OperationCompiler, op: ValueOperationBase, var: str) -> OperationCode:
+    name = c.add_object(op)
+    return OperationCode([f'{var:s} = {name:s}.process_value({var:s}, info)'])
+
+
+def get_code_factor(c: OperationCompiler, op: FactorOperation, var: str) -> OperationCode:
+    return OperationCode([f'{var:s} = {var:s} * {c.get_const(op.factor):s}'], skip_none=True, keeps_value=True)
+
+
+def get_code_offset(c: OperationCompiler, op: OffsetOperation, var: str) -> OperationCode:
+    return OperationCode([f'{var:s} = {var:s} + {c.get_const(op.offset):s}'], skip_none=True, keeps_value=True)
+
+
+def get_code_affine(c: OperationCompiler, op: AffineOperation, var: str) -> OperationCode:
+    return OperationCode(
+        [f'{var:s} = {var:s} * {c.get_const(op.factor):s} + {c.get_const(op.offset):s}'],
+        skip_none=True, keeps_value=True
+    )
+
+
+def get_code_round(c: OperationCompiler, op: RoundOperation, var: str) -> OperationCode:
+    if op.digits is None:
+        return OperationCode([f'{var:s} = round({var:s})'], skip_none=True, keeps_value=True)
+    return OperationCode([f'{var:s} = round({var:s}, {c.get_const(op.digits):s})'], skip_none=True, keeps_value=True)
+
+
+def get_code_skip_zero_meter(c: OperationCompiler, op: SkipZeroMeterOperation, var: str) -> OperationCode:
+    return OperationCode([f'if {var:s} < 0.1:', f'    {var:s} = None'], skip_none=True)
+
+
+def get_code_on_change(c: OperationCompiler, op: OnChangeFilterOperation, var: str) -> OperationCode:
+    name = c.add_object(op)
+    return OperationCode([
+        f'if {name:s}.last_value == {var:s}:',
+        f'    {var:s} = None',
+        'else:',
+        f'    {name:s}.last_value = {var:s}',
+    ], skip_none=True)
+
+
+def get_code_range(c: OperationCompiler, op: RangeFilterOperation, var: str) -> OperationCode:
+    lines = []
+    for value, cmp in ((op.min_value, '<'), (op.max_value, '>')):
+        if value is None:
+            continue
+        const = c.get_const(value)
+        lines.append(f'{"elif" if lines else "if":s} {var:s} {cmp:s} {const:s}:')
+        lines.append(f'    {var:s} = {const if op.limit_values else "None":s}')
+    return OperationCode(lines, skip_none=True, keeps_value=op.limit_values)
+
+
+def get_code_sequence(c: OperationCompiler, op: SequenceOperation, var: str) -> OperationCode:
+    return OperationCode(c.get_code(op.operations, var))
+
+
+def get_code_or(c: OperationCompiler, op: OrOperation, var: str) -> OperationCode:
+    # every operation gets the input and the first value that is not None is returned
+    var_in = c.create_var()
+    lines = [f'{var_in:s} = {var:s}', f'{var:s} = None']
+    for child in op.operations:
+        var_child = c.create_var()
+        lines.append(f'{var_child:s} = {var_in:s}')
+        lines.extend(c.get_code((child, ), var_child))
+        lines.append(f'if {var:s} is None:')
+        lines.append(f'    {var:s} = {var_child:s}')
+    return OperationCode(lines)
+
+
+MAPPING: Final[dict[type[ValueOperationBase], Callable[[OperationCompiler, Any, str], OperationCode]]] = {
+    FactorOperation: get_code_factor,
+    OffsetOperation: get_code_offset,
+    AffineOperation: get_code_affine,
+    RoundOperation: get_code_round,
+    SkipZeroMeterOperation: get_code_skip_zero_meter,
+    OnChangeFilterOperation: get_code_on_change,
+    RangeFilterOperation: get_code_range,
+    SequenceOperation: get_code_sequence,
+    OrOperation: get_code_or,
+}
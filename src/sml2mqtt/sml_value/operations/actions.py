@@ -5,11 +5,11 @@ from typing import Final
 from typing_extensions import override
 
 from sml2mqtt.const import DurationType, get_duration
-from sml2mqtt.sml_value.base import SmlValueInfo, ValueOperationBase
+from sml2mqtt.sml_value.base import SmlValueInfo, ValueOperationWithTickBase
 from sml2mqtt.sml_value.operations._helper import format_period
 
 
-class RefreshActionOperation(ValueOperationBase):
+class RefreshActionOperation(ValueOperationWithTickBase):
     def __init__(self, every: DurationType) -> None:
         self.every: Final = get_duration(every)
         self.last_time: float = -1
@@ -28,6 +28,12 @@ class RefreshActionOperation(ValueOperationBase):
         self.last_time = monotonic()
         return self.last_value
 
+    @override
+    def get_next_tick(self, now: float) -> float:
+        if self.last_value is None:
+            return now + self.every
+        return self.last_time + self.every
+
     def __repr__(self) -> str:
         return f'<RefreshAction: {self.every}s at 0x{id(self):x}>'
 
@@ -36,7 +42,7 @@ class RefreshActionOperation(ValueOperationBase):
         yield f'{indent:s}- Refresh Action: {format_period(self.every)}'
 
 
-class HeartbeatActionOperation(ValueOperationBase):
+class HeartbeatActionOperation(ValueOperationWithTickBase):
     def __init__(self, every: DurationType) -> None:
         self.every: Final = get_duration(every)
         self.last_time: float = -1_000_000_000
@@ -47,12 +53,19 @@ class HeartbeatActionOperation(ValueOperationBase):
         if value is not None:
             self.last_value = value
 
-        if monotonic() - self.last_time < self.every:
+        # Without a value the time is not used up, so the first value is sent immediately
+        if self.last_value is None or monotonic() - self.last_time < self.every:
             return None
 
         self.last_time = monotonic()
         return self.last_value
 
+    @override
+    def get_next_tick(self, now: float) -> float:
+        if self.last_value is None:
+            return now + self.every
+        return self.last_time + self.every
+
     def __repr__(self) -> str:
         return f'<HeartbeatAction: {self.every}s at 0x{id(self):x}>'
 
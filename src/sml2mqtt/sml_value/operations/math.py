@@ -43,6 +43,29 @@ class OffsetOperation(ValueOperationBase):
         yield f'{indent:s}- Offset: {self.offset}'
 
 
+class AffineOperation(ValueOperationBase):
+    """Fused factor and offset which is created when the operations are optimized"""
+
+    def __init__(self, factor: int | float, offset: int | float) -> None:
+        self.factor: Final = factor
+        self.offset: Final = offset
+
+    @override
+    def process_value(self, value: float | None, info: SmlValueInfo) -> float | None:
+        if value is None:
+            return None
+        return value * self.factor + self.offset
+
+    def __repr__(self) -> str:
+        return f'<Affine: factor={self.factor} offset={self.offset} at 0x{id(self):x}>'
+
+    @override
+    def describe(self, indent: str = '') -> Generator[str, None, None]:
+        yield f'{indent:s}- Affine:'
+        yield f'{indent:s}    factor: {self.factor}'
+        yield f'{indent:s}    offset: {self.offset}'
+
+
 class RoundOperation(ValueOperationBase):
     def __init__(self, digits: int) -> None:
         self.digits: Final = digits if digits else None
@@ -4,19 +4,27 @@ from typing import Final
 from typing_extensions import override
 
 from sml2mqtt.const import TimeSeries
-from sml2mqtt.sml_value.base import SmlValueInfo, ValueOperationBase
+from sml2mqtt.sml_value.base import SmlValueInfo, ValueOperationWithTickBase
 from sml2mqtt.sml_value.operations._helper import format_period
 
 
-class TimeSeriesOperationBaseBase(ValueOperationBase):
+class TimeSeriesOperationBaseBase(ValueOperationWithTickBase):
     def __init__(self, time_series: TimeSeries, reset_after_value: bool) -> None:
         self.time_series: Final = time_series
         self.reset_after_value: Final = reset_after_value
+        self.last_time: float | None = None
 
         # Makes only sense in combination
         if reset_after_value and not time_series.wait_for_data:
             raise ValueError()
 
+    @override
+    def get_next_tick(self, now: float) -> float:
+        # The interval is also calculated if the meter stalls
+        if (last_time := self.last_time) is None:
+            return now + self.time_series.period
+        return last_time + self.time_series.period
+
     @override
     def describe(self, indent: str = '') -> Generator[str, None, None]:
         yield f'{indent:s}    Interval: {format_period(self.time_series.period)}'
@@ -32,6 +40,7 @@ class TimeSeriesOperationBase(TimeSeriesOperationBaseBase):
     def process_value(self, value: float | None, info: SmlValueInfo) -> float | None:
 
         ts = info.frame.timestamp
+        self.last_time = ts
         self.time_series.add_value(value, ts)
 
         if (values := self.time_series.get_values()) is None:
@@ -50,6 +59,7 @@ class TimeDurationSeriesOperationBase(TimeSeriesOperationBaseBase):
     def process_value(self, value: float | None, info: SmlValueInfo) -> float | None:
 
         ts = info.frame.timestamp
+        self.last_time = ts
         self.time_series.add_value(value, ts)
 
         if (values := self.time_series.get_value_duration(ts)) is None:
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sml2mqtt.sml_value.operations import (
+    AffineOperation,
+    FactorOperation,
+    OffsetOperation,
+    OrOperation,
+    RoundOperation,
+    SequenceOperation,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sml2mqtt.sml_value.base import ValueOperationBase
+
+
+AFFINE_TYPES = (FactorOperation, OffsetOperation, AffineOperation)
+
+
+def fuse_affine_operations(operations: list[ValueOperationBase]) -> list[ValueOperationBase]:
+    if len(operations) <= 1:
+        return operations
+
+    # value * factor + offset
+    factor: int | float = 1
+    offset: int | float = 0
+    for op in operations:
+        if isinstance(op, FactorOperation):
+            factor *= op.factor
+            if offset:
+                offset *= op.factor
+        elif isinstance(op, OffsetOperation):
+            offset += op.offset
+        elif isinstance(op, AffineOperation):
+            factor *= op.factor
+            offset = offset * op.factor + op.offset if offset else op.offset
+        else:
+            msg = f'Unexpected operation {op}'
+            raise TypeError(msg)
+
+    if not offset:
+        return [FactorOperation(factor)]
+    if factor == 1:
+        return [OffsetOperation(offset)]
+    return [AffineOperation(factor, offset)]
+
+
+def optimize_operations(operations: Iterable[ValueOperationBase]) -> tuple[ValueOperationBase, ...]:
+    """Return an optimized chain of the operations. Changed containers are recreated so the passed operations
+    stay untouched, operations with state are reused.
+
+    - Adjacent factor and offset operations are fused into one operation.
+      The result can differ in the last digits of a float compared to the separate operations.
+    - Adjacent round operations with the same digits are merged.
+      Rounds are not moved over other operations since the result would change (e.g. round and then factor).
+    """
+    ret: list[ValueOperationBase] = []
+    affine: list[ValueOperationBase] = []
+
+    for op in operations:
+        if type(op) in AFFINE_TYPES:
+            affine.append(op)
+            continue
+
+        ret.extend(fuse_affine_operations(affine))
+        affine = []
+
+        if type(op) in (OrOperation, SequenceOperation):
+            if type(op) is OrOperation:
+                # every operation gets the same input, so only the operations themselves can be optimized
+                children = tuple(child for o in op.operations for child in optimize_operations((o, )))
+            else:
+                children = optimize_operations(op.operations)
+
+            if children != op.operations:
+                op = type(op)()  # noqa: PLW2901
+                op.operations = children
+
+        if type(op) is RoundOperation and ret and type(prev := ret[-1]) is RoundOperation and \
+                prev.digits == op.digits:
+            continue
+
+        ret.append(op)
+
+    ret.extend(fuse_affine_operations(affine))
+    return tuple(ret)
@@ -4,10 +4,25 @@ from typing import Final
 
 from sml2mqtt.const import SmlFrameValues
 from sml2mqtt.mqtt import MqttObj
-from sml2mqtt.sml_value.base import OperationContainerBase, SmlValueInfo
+from sml2mqtt.runtime import DeadlineScheduler
+from sml2mqtt.sml_value.base import (
+    OperationContainerBase,
+    SmlValueInfo,
+    ValueOperationBase,
+    ValueOperationWithTickBase,
+    get_tick_operations,
+)
+from sml2mqtt.sml_value.compile_operations import compile_operations
+from sml2mqtt.sml_value.optimize_operations import optimize_operations
+
+
+TICK_SCHEDULER: Final = DeadlineScheduler('tick')
 
 
 class SmlValue(OperationContainerBase):
+    # A tick is never processed more often, even if an operation is due again immediately
+    MIN_TICK: Final = 0.1
+
     def __init__(self, obis: str, mqtt: MqttObj) -> None:
         super().__init__()
 
@@ -16,6 +31,16 @@ class SmlValue(OperationContainerBase):
 
         self.last_publish: float = 0
 
+        # counters for the metrics
+        self.processed: int = 0
+        self.published: int = 0
+
+        # operations before they were optimized
+        self.operations_original: tuple[ValueOperationBase, ...] | None = None
+
+        # operations which are processed without a new value when they are due
+        self.tick_operations: tuple[ValueOperationWithTickBase, ...] = ()
+
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} obis={self.obis} at 0x{id(self):x}>'
 
@@ -23,24 +48,86 @@ class SmlValue(OperationContainerBase):
         if (sml_value := frame.get_value(self.obis)) is None:
             return None
 
+        self.processed += 1
         info = SmlValueInfo(sml_value, frame, self.last_publish)
-        value = sml_value.get_value()
+        value = self.process_operations(sml_value.get_value(), info)
 
-        for op in self.operations:
-            value = op.process_value(value, info)
+        if value is None:
+            return None
+
+        self.mqtt.publish(value)
+        self.published += 1
+        self.last_publish = monotonic()
+        return value
+
+    def process_tick(self, timestamp: float) -> float | None:
+        info = SmlValueInfo(None, SmlFrameValues(timestamp), self.last_publish)
+        value = self.process_operations(None, info)
 
         if value is None:
             return None
 
         self.mqtt.publish(value)
+        self.published += 1
         self.last_publish = monotonic()
         return value
 
+    def get_next_tick(self, now: float) -> float:
+        return min(op.get_next_tick(now) for op in self.tick_operations)
+
+    def check(self, now: float) -> float:
+        # The frames move the deadlines of the operations without touching the scheduler,
+        # so the deadline is checked again when it's due
+        if (deadline := self.get_next_tick(now)) > now:
+            return deadline
+
+        self.process_tick(now)
+        return max(self.get_next_tick(now), now + self.MIN_TICK)
+
+    def start_ticks(self) -> None:
+        self.tick_operations = get_tick_operations(self.operations)
+        if self.tick_operations:
+            TICK_SCHEDULER.add(self, self.get_next_tick(monotonic()))
+
+    def stop_ticks(self) -> None:
+        TICK_SCHEDULER.remove(self)
+
+    def process_operations(self, value: float | None, info: SmlValueInfo) -> float | None:
+        for op in self.operations:
+            value = op.process_value(value, info)
+        return value
+
+    def optimize_operations(self) -> None:
+        if (operations := optimize_operations(self.operations)) == self.operations:
+            return None
+
+        if self.operations_original is None:
+            self.operations_original = self.operations
+        self.operations = operations
+        self.__dict__.pop('process_operations', None)
+        return None
+
+    def compile_operations(self) -> None:
+        # replaces process_operations with a function that is generated from the operations
+        self.process_operations = compile_operations(self)
+
+    def add_operation(self, operation: ValueOperationBase):
+        self.__dict__.pop('process_operations', None)
+        return super().add_operation(operation)
+
+    def insert_operation(self, operation: ValueOperationBase):
+        self.__dict__.pop('process_operations', None)
+        return super().insert_operation(operation)
+
     def describe(self) -> Generator[str, None, None]:
         yield f'<SmlValue>'
         yield f'  obis : {self.obis:s}'
         yield f'  topic: {self.mqtt.topic:s}'
         yield f'  operations:'
-        for op in self.operations:
+        for op in (self.operations if self.operations_original is None else self.operations_original):
             yield from op.describe(f'    ')
+        if self.operations_original is not None:
+            yield f'  optimized operations:'
+            for op in self.operations:
+                yield from op.describe(f'    ')
         yield ''
@@ -6,7 +6,7 @@ from sml2mqtt.errors import RequiredObisValueNotInFrameError, UnprocessedObisVal
 
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterator
 
     from sml2mqtt.const import SmlFrameValues
     from sml2mqtt.sml_value.sml_value import SmlValue
@@ -26,6 +26,9 @@ class SmlValues:
             f'skipped={",".join(self._skipped_ids):s}>'
         )
 
+    def __iter__(self) -> Iterator[SmlValue]:
+        return iter(self._values)
+
     def set_skipped(self, *obis_ids: str):
         self._skipped_ids = frozenset(obis_ids)
         self._all_ids = self._processed_ids | self._skipped_ids
@@ -37,6 +40,22 @@ class SmlValues:
         self._values = (*self._values, value)
         return self
 
+    def optimize_operations(self) -> None:
+        for value in self._values:
+            value.optimize_operations()
+
+    def compile_operations(self) -> None:
+        for value in self._values:
+            value.compile_operations()
+
+    def start_ticks(self) -> None:
+        for value in self._values:
+            value.start_ticks()
+
+    def stop_ticks(self) -> None:
+        for value in self._values:
+            value.stop_ticks()
+
     def process_frame(self, frame: SmlFrameValues):
         for value in self._values:
             value.process_frame(frame)
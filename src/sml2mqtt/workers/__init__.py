@@ -0,0 +1 @@
+from .worker_group import WorkerGroup, get_input_groups, get_shards
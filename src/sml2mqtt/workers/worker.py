@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+import traceback
+from asyncio import get_running_loop, sleep
+from logging.handlers import QueueHandler
+from typing import TYPE_CHECKING, Final
+
+from sml2mqtt import mqtt
+from sml2mqtt.__args__ import CMD_ARGS
+from sml2mqtt.__log__ import log
+from sml2mqtt.config import CONFIG
+from sml2mqtt.const import Task
+from sml2mqtt.const.task import wait_for_tasks
+from sml2mqtt.mqtt import mqtt_obj
+from sml2mqtt.runtime import (
+    LOOP_MONITOR,
+    do_shutdown,
+    do_shutdown_async,
+    on_shutdown,
+    run_event_loop,
+    signal_handler_setup,
+)
+from sml2mqtt.sml_device import ALL_DEVICES, create_devices
+
+
+if TYPE_CHECKING:
+    from multiprocessing import Queue
+    from multiprocessing.synchronize import Event
+    from pathlib import Path
+
+
+class PublishForwarder:
+    """Collects the messages which are published in one iteration of the event loop and passes them
+    as one item to the main process, so there is only one inter process transfer per frame.
+    """
+
+    def __init__(self, queue: Queue) -> None:
+        self.queue: Final = queue
+        self.pending: list[tuple[str, bytes, int, bool]] = []
+
+    def publish(self, topic: str, value: bytes, qos: int, retain: bool) -> None:
+        if not self.pending:
+            get_running_loop().call_soon(self.flush)
+        self.pending.append((topic, value, qos, retain))
+
+    def flush(self) -> None:
+        if pending := self.pending:
+            self.pending = []
+            self.queue.put(pending)
+
+
+def setup_worker_mqtt(index: int) -> None:
+    """Every worker connects with its own client identifier and has its own status topic. A shared status topic
+    would be set to OFFLINE by the last will of one worker while the other workers are still publishing."""
+    connection = CONFIG.mqtt.connection
+    connection.identifier = f'{connection.identifier:s}-{index:d}'
+
+    last_will = CONFIG.mqtt.last_will
+    if last_will.full_topic is not None:
+        last_will.full_topic = f'{last_will.full_topic:s}/worker_{index:d}'
+    else:
+        last_will.topic = f'{last_will.topic or "status":s}/worker_{index:d}'
+
+
+async def _watch_stop_event(stop: Event) -> None:
+    # the event of the multiprocessing module can not be awaited
+    while not stop.is_set():  # noqa: ASYNC110
+        await sleep(0.2)
+    do_shutdown()
+
+
+async def worker_a_main(index: int, inputs: list[int], stop: Event, *, own_mqtt: bool) -> None:
+    # Ctrl+C is sent to all processes, but the main process stops the workers
+    signal_handler_setup()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    on_shutdown(ALL_DEVICES.cancel_and_wait, 'Stop devices')
+
+    try:
+        if own_mqtt:
+            await mqtt.start()
+            await mqtt.wait_for_connect(5)
+
+        LOOP_MONITOR.start()
+        await create_devices(CONFIG.inputs[i] for i in inputs)
+        log.debug(f'Worker {index:d}: Starting {len(ALL_DEVICES):d} device{"" if len(ALL_DEVICES) == 1 else "s":s}')
+        await ALL_DEVICES.start()
+
+        task = Task(lambda: _watch_stop_event(stop), name=f'Stop Worker {index:d}')
+        on_shutdown(task.cancel_and_wait, 'Stop watching the stop event')
+        task.start()
+
+    except Exception as e:
+        log.error(f'{e.__class__.__name__} during startup of worker {index:d}: {e}')
+        for line in traceback.format_exc().splitlines():
+            log.error(line)
+
+        await do_shutdown_async()
+
+    await wait_for_tasks()
+
+
+def run_worker(index: int, config_file: Path, event_loop: str | None, inputs: list[int],
+               log_queue: Queue, publish_queue: Queue | None, stop: Event) -> None:
+    """Entry point of the worker process. Processes the given inputs of the configuration."""
+    if sys.platform.lower() == 'win32' or os.name.lower() == 'nt':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    CMD_ARGS.config = config_file
+    CMD_ARGS.event_loop = event_loop
+    CONFIG.load_config_file(config_file)
+
+    # all log entries are written by the main process
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    CONFIG.logging.set_log_level()
+
+    mqtt.setup_base_topic(CONFIG.mqtt.topic, CONFIG.mqtt.defaults.qos, CONFIG.mqtt.defaults.retain)
+    if publish_queue is not None:
+        mqtt_obj.pub_func = PublishForwarder(publish_queue).publish
+    else:
+        setup_worker_mqtt(index)
+
+    run_event_loop(worker_a_main(index, inputs, stop, own_mqtt=publish_queue is None))
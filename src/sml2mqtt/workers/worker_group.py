@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from asyncio import AbstractEventLoop, get_running_loop, sleep
+from logging.handlers import QueueListener
+from threading import Thread
+from typing import TYPE_CHECKING, Final
+
+from sml2mqtt import mqtt
+from sml2mqtt.__args__ import CMD_ARGS
+from sml2mqtt.__log__ import get_logger
+from sml2mqtt.config.inputs import UdpSourceSettings
+from sml2mqtt.const import Task
+from sml2mqtt.runtime import do_shutdown
+
+from .worker import run_worker
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from multiprocessing import Queue
+    from multiprocessing.process import BaseProcess
+
+    from sml2mqtt.config.inputs import SmlSourceSettingType
+
+
+log = get_logger('workers')
+
+
+def get_input_groups(inputs: Iterable[SmlSourceSettingType]) -> list[list[int]]:
+    """Return the indexes of the inputs which share a socket and thus have to be processed by the same worker"""
+    groups: dict[tuple[str, int], list[int]] = {}
+    for i, cfg in enumerate(inputs):
+        if isinstance(cfg, UdpSourceSettings):
+            groups.setdefault(cfg.get_endpoint(), []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def get_shards(count: int, workers: int, groups: Iterable[list[int]] = ()) -> list[list[int]]:
+    """Distribute the indexes of the inputs evenly on the workers. The inputs of a group are on the same worker."""
+    units: dict[int, list[int]] = {}
+    grouped: set[int] = set()
+    for group in groups:
+        units[min(group)] = group
+        grouped.update(group)
+    for i in range(count):
+        if i not in grouped:
+            units[i] = [i]
+
+    ordered = [units[i] for i in sorted(units)]
+    return [sorted(i for unit in ordered[w::workers] for i in unit) for w in range(min(len(ordered), workers))]
+
+
+def _forward_messages(queue: Queue, loop: AbstractEventLoop) -> None:
+    # runs in a thread, None stops the thread
+    while (messages := queue.get()) is not None:
+        loop.call_soon_threadsafe(publish_messages, messages)
+
+
+def publish_messages(messages: list[tuple[str, bytes, int, bool]]) -> None:
+    for topic, value, qos, retain in messages:
+        mqtt.publish(topic, value, qos, retain)
+
+
+class WorkerGroup:
+    """Distributes the inputs on multiple processes. The log entries of the workers are written by the main
+    process and if the mqtt connection is shared, the messages are published by the main process, too.
+    If one worker stops all other workers and the main process are stopped.
+    """
+
+    def __init__(self, processes: int, *, shared_mqtt: bool) -> None:
+        self.count: Final = processes
+        self.shared_mqtt: Final = shared_mqtt
+
+        self._ctx: Final = multiprocessing.get_context('spawn')
+        self._stop: Final = self._ctx.Event()
+        self._processes: list[BaseProcess] = []
+
+        self._log_queue: Queue | None = None
+        self._log_listener: QueueListener | None = None
+        self._publish_queue: Queue | None = None
+        self._publish_thread: Thread | None = None
+
+        self._task: Final = Task(self._watch_workers, name='Worker Task')
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__:s} processes={self.count:d} shared_mqtt={self.shared_mqtt}>'
+
+    def start(self, input_count: int, groups: Iterable[list[int]] = ()) -> None:
+        self._log_queue = self._ctx.Queue()
+        self._log_listener = QueueListener(self._log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+        self._log_listener.start()
+
+        if self.shared_mqtt:
+            self._publish_queue = self._ctx.Queue()
+            self._publish_thread = Thread(
+                target=_forward_messages, args=(self._publish_queue, get_running_loop()), daemon=True,
+                name='Forward mqtt messages'
+            )
+            self._publish_thread.start()
+
+        for index, inputs in enumerate(get_shards(input_count, self.count, groups)):
+            process = self._ctx.Process(
+                target=run_worker, name=f'sml2mqtt worker {index:d}',
+                args=(index, CMD_ARGS.config, CMD_ARGS.event_loop, inputs, self._log_queue, self._publish_queue, self._stop),
+            )
+            process.start()
+            self._processes.append(process)
+            log.debug(f'Started worker {index:d} (pid {process.pid}) with {len(inputs):d} inputs')
+
+        self._task.start()
+
+    async def _watch_workers(self) -> None:
+        while all(process.is_alive() for process in self._processes):  # noqa: ASYNC110
+            await sleep(0.5)
+
+        for index, process in enumerate(self._processes):
+            if not process.is_alive():
+                log.debug(f'Worker {index:d} stopped with exit code {process.exitcode}')
+        do_shutdown()
+
+    async def cancel_and_wait(self) -> None:
+        await self._task.cancel_and_wait()
+
+        self._stop.set()
+        loop = get_running_loop()
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join, 10)
+            if process.is_alive():
+                log.warning(f'Worker {process.name:s} did not stop and will be terminated')
+                process.terminate()
+
+        # forward everything that was published during the shutdown of the workers
+        if (thread := self._publish_thread) is not None and self._publish_queue is not None:
+            self._publish_queue.put(None)
+            await loop.run_in_executor(None, thread.join)
+            await sleep(0)
+
+        if (listener := self._log_listener) is not None:
+            listener.stop()
@@ -16,7 +16,7 @@ from tests.sml_data import (
 
 import sml2mqtt.const.task as task_module
 import sml2mqtt.mqtt.mqtt_obj
-from helper import PatchedSmlStreamReader
+from helper import PatchedStreamReaderGroup
 from sml2mqtt import CMD_ARGS
 from sml2mqtt.runtime import shutdown as shutdown_module
 from sml2mqtt.sml_device import stream_reader_group as reader_group_module
@@ -86,12 +86,12 @@ def no_mqtt(monkeypatch):
 
 @pytest.fixture
 def stream_reader(monkeypatch):
-    r = PatchedSmlStreamReader()
+    r = PatchedStreamReaderGroup('x25', 'kermit')
 
-    def factory(crc: str):
+    def factory(*crcs: str, max_size: int):
         return r
 
-    monkeypatch.setattr(reader_group_module, 'SmlStreamReader', factory)
+    monkeypatch.setattr(reader_group_module, 'StreamReaderGroup', factory)
     return r
 
 
@@ -1,14 +1,13 @@
 from asyncio import sleep
+from binascii import a2b_hex, b2a_hex
 from collections.abc import Callable
-from typing import Literal
 from unittest.mock import Mock
 
-from smllib import SmlStreamReader
-from smllib.builder import CTX_HINT
 from smllib.errors import CrcError
 from typing_extensions import override
 
 from sml2mqtt.const import EnhancedSmlFrame
+from sml2mqtt.sml_device.stream_reader_group import StreamReaderGroup
 
 
 async def wait_for_call(mock: Mock | Callable, timeout: float) -> Mock:
@@ -27,12 +26,18 @@ async def wait_for_call(mock: Mock | Callable, timeout: float) -> Mock:
     return mock
 
 
-class PatchedSmlStreamReader(SmlStreamReader):
+def replace_hex(frame: EnhancedSmlFrame, old: str, new: str) -> EnhancedSmlFrame:
+    data = b2a_hex(frame.bytes).decode()
+    assert old in data
+    return EnhancedSmlFrame(a2b_hex(data.replace(old, new)))
+
+
+class PatchedStreamReaderGroup(StreamReaderGroup):
     _CRC_ERROR = 'CRC_ERROR'
 
     @override
-    def __init__(self, build_ctx: CTX_HINT | None = None, crc: Literal['kermit', 'x25'] = 'x25') -> None:
-        super().__init__(build_ctx, crc=crc)
+    def __init__(self, *crcs: str) -> None:
+        super().__init__(*crcs)
         self.returns = []
 
     def add(self, _bytes: bytes | EnhancedSmlFrame | str):
@@ -61,6 +66,9 @@ class PatchedSmlStreamReader(SmlStreamReader):
             return super().get_frame()
 
         if isinstance(cmd, EnhancedSmlFrame):
+            # the frame is injected, so we act as if the first crc matched
+            if self.crc is None:
+                self.lock_crc(next(iter(self.crc_funcs)))
             return cmd
 
         if cmd == 'CRC_ERROR':
@@ -1,56 +1,63 @@
 from binascii import a2b_hex
 
 import pytest
-from smllib.reader import SmlStreamReader
 
 from sml2mqtt.const import EnhancedSmlFrame, SmlFrameValues
+from sml2mqtt.sml_device.stream_reader_group import StreamReaderGroup
+
+
+# Raw data from a serial port
+SML_DATA_1 = a2b_hex(
+    b'1B1B1B1B01010101760501188E6162006200726500000101760101070000000000000B000000000000000000000101636877007'
+    b'60501188E626200620072650000070177010B000000000000000000000172620165002EC3F47A77078181C78203FF0101010104'
+    b'45425A0177070100000009FF010101010B000000000000000000000177070100010800FF6401018001621E52FB690000000A7AC'
+    b'1BC170177070100010801FF0101621E52FB690000000A74B1EA770177070100010802FF0101621E52FB6900000000060FD1A001'
+    b'77070100020800FF6401018001621E52FB69000000000D19E1C00177070100100700FF0101621B52FE55000089D901770701002'
+    b'40700FF0101621B52FE55000020220177070100380700FF0101621B52FE5500000A9201770701004C0700FF0101621B52FE5500'
+    b'005F2501010163810200760501188E636200620072650000020171016325FC000000001B1B1B1B1A0356F5'
+)
+
+# Frames without the transport layer
+SML_FRAME_1 = a2b_hex(
+    b'760500531efa620062007263010176010105001bb4fe0b0a0149534b0005020de272620165001bb32e620163a71400760500531e'
+    b'fb620062007263070177010b0a0149534b0005020de2070100620affff72620165001bb32e757707010060320101010101010449'
+    b'534b0177070100600100ff010101010b0a0149534b0005020de20177070100010800ff65001c010401621e52ff650026bea90177'
+    b'070100020800ff0101621e52ff62000177070100100700ff0101621b52005301100101016350ba00760500531efc620062007263'
+    b'0201710163ba1900'
+)
+
+SML_FRAME_2 = a2b_hex(
+    b'7605065850a66200620072630101760107ffffffffffff05021d70370b0a014c475a0003403b4972620165021d7707016326de'
+    b'007605065850a762006200726307017707ffffffffffff0b0a014c475a0003403b49070100620affff72620165021d77077577'
+    b'0701006032010101010101044c475a0177070100600100ff010101010b0a014c475a0003403b490177070100010800ff65001c'
+    b'010472620165021d7707621e52ff690000000003152c450177070100020800ff0172620165021d7707621e52ff690000000000'
+    b'0000000177070100100700ff0101621b52005900000000000000fb010101637264007605065850a86200620072630201710163'
+    b'1c8c00'
+)
 
 
 @pytest.fixture
 def sml_data_1():
-    return a2b_hex(
-        b'1B1B1B1B01010101760501188E6162006200726500000101760101070000000000000B000000000000000000000101636877007'
-        b'60501188E626200620072650000070177010B000000000000000000000172620165002EC3F47A77078181C78203FF0101010104'
-        b'45425A0177070100000009FF010101010B000000000000000000000177070100010800FF6401018001621E52FB690000000A7AC'
-        b'1BC170177070100010801FF0101621E52FB690000000A74B1EA770177070100010802FF0101621E52FB6900000000060FD1A001'
-        b'77070100020800FF6401018001621E52FB69000000000D19E1C00177070100100700FF0101621B52FE55000089D901770701002'
-        b'40700FF0101621B52FE55000020220177070100380700FF0101621B52FE5500000A9201770701004C0700FF0101621B52FE5500'
-        b'005F2501010163810200760501188E636200620072650000020171016325FC000000001B1B1B1B1A0356F5'
-    )
+    return SML_DATA_1
 
 
 @pytest.fixture
 def sml_frame_1(stream_reader):
-    frame = EnhancedSmlFrame(a2b_hex(
-        b'760500531efa620062007263010176010105001bb4fe0b0a0149534b0005020de272620165001bb32e620163a71400760500531e'
-        b'fb620062007263070177010b0a0149534b0005020de2070100620affff72620165001bb32e757707010060320101010101010449'
-        b'534b0177070100600100ff010101010b0a0149534b0005020de20177070100010800ff65001c010401621e52ff650026bea90177'
-        b'070100020800ff0101621e52ff62000177070100100700ff0101621b52005301100101016350ba00760500531efc620062007263'
-        b'0201710163ba1900'
-    ))
-
+    frame = EnhancedSmlFrame(SML_FRAME_1)
     stream_reader.add(frame)
     return frame
 
 
 @pytest.fixture
 def sml_frame_2(stream_reader):
-    frame = EnhancedSmlFrame(a2b_hex(
-        b'7605065850a66200620072630101760107ffffffffffff05021d70370b0a014c475a0003403b4972620165021d7707016326de'
-        b'007605065850a762006200726307017707ffffffffffff0b0a014c475a0003403b49070100620affff72620165021d77077577'
-        b'0701006032010101010101044c475a0177070100600100ff010101010b0a014c475a0003403b490177070100010800ff65001c'
-        b'010472620165021d7707621e52ff690000000003152c450177070100020800ff0172620165021d7707621e52ff690000000000'
-        b'0000000177070100100700ff0101621b52005900000000000000fb010101637264007605065850a86200620072630201710163'
-        b'1c8c00'
-    ))
-
+    frame = EnhancedSmlFrame(SML_FRAME_2)
     stream_reader.add(frame)
     return frame
 
 
 @pytest.fixture
 def sml_data_1_analyze(sml_data_1):
-    r = SmlStreamReader()
+    r = StreamReaderGroup('x25')
     r.add(sml_data_1)
     frame = r.get_frame()   # type: EnhancedSmlFrame | None
     return '\n'.join(frame.get_analyze_str())
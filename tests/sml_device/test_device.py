@@ -1,7 +1,8 @@
-
 import pytest
 
-from sml2mqtt.sml_device import SmlDevice
+from sml2mqtt import CONFIG
+from sml2mqtt.sml_device import ALL_DEVICES, DeviceStatus, SmlDevice
+from sml2mqtt.sml_value.sml_value import TICK_SCHEDULER
 
 
 @pytest.mark.ignore_log_warnings
@@ -119,3 +120,46 @@ Skipped: 0100000009ff, 0100600100ff
     - Refresh Action: 2 minutes
 
 '''
+
+
+@pytest.mark.ignore_log_warnings
+def test_device_first_frame_without_loop(no_mqtt, monkeypatch, sml_data_1) -> None:
+    device = SmlDevice('device_name')
+    monkeypatch.setattr(ALL_DEVICES, '_devices', (device, ))
+
+    # The default operations contain a refresh action which can only be scheduled with a running event loop
+    device.on_source_data(sml_data_1)
+
+    assert device.status == DeviceStatus.OK
+    assert ('00000000000000000000/0100100700ff', b'352.89', 0, False) in no_mqtt
+    assert all(value.tick_operations for value in device.sml_values)
+    assert not any(value in TICK_SCHEDULER for value in device.sml_values)
+
+
+@pytest.mark.ignore_log_warnings
+@pytest.mark.parametrize('enabled', [False, True])
+def test_device_frame_template(no_mqtt, monkeypatch, sml_data_1, enabled) -> None:
+    monkeypatch.setattr(CONFIG.general, 'frame_template', enabled)
+    device = SmlDevice('device_name')
+    monkeypatch.setattr(ALL_DEVICES, '_devices', (device, ))
+
+    device.on_source_data(sml_data_1)
+    device.on_source_data(sml_data_1)
+
+    assert device.status == DeviceStatus.OK
+    assert (device.frame_template is not None) is enabled
+
+
+@pytest.mark.ignore_log_warnings
+def test_device_multiple_frames(no_mqtt, monkeypatch, sml_data_1) -> None:
+    device = SmlDevice('device_name')
+    monkeypatch.setattr(ALL_DEVICES, '_devices', (device, ))
+
+    # all frames of the data are processed and nothing is left in the reader
+    device.on_source_data(sml_data_1 * 2)
+    assert device.frames == 2
+    assert not len(device.stream_reader)
+
+    device.on_source_data(sml_data_1 * 2 + sml_data_1[:100])
+    assert device.frames == 4
+    assert len(device.stream_reader) == 100
@@ -0,0 +1,87 @@
+import pytest
+
+from sml2mqtt import CONFIG
+from sml2mqtt.sml_device import ALL_DEVICES, SmlDevice, frame_parser
+from sml2mqtt.sml_device.device_stats import StageTimes
+
+
+def test_stage_times() -> None:
+    t = StageTimes(size=10)
+    assert t.get_values() == {'count': 0}
+
+    for i in range(1, 21):
+        t.add(i / 1e6)
+
+    assert t.get_values() == {'count': 20, 'mean': 10.5, 'p50': 16, 'p99': 20, 'max': 20}
+    assert t.get_values() == {'count': 0}
+
+
+@pytest.fixture
+def device_stats(monkeypatch) -> None:
+    monkeypatch.setattr(CONFIG.diagnostics, 'device_stats', True)
+
+
+@pytest.mark.ignore_log_warnings
+async def test_device_stats(no_mqtt, device_stats, sml_data_1) -> None:
+    device = SmlDevice('device_name')
+    assert device.stats is not None
+
+    for _ in range(3):
+        device.on_source_data(sml_data_1)
+
+    # the values of the first frame are created twice (setup and processing)
+    # and only the first frame is published because of the default filters.
+    # After every frame the reader is checked for another frame.
+    values = device.stats.get_values()
+    assert {name: v['count'] for name, v in values.items()} == {
+        'total': 3, 'ingest': 3, 'frame': 6, 'crc': 3, 'values': 4, 'process': 3, 'publish': 10
+    }
+    assert set(values['total']) == {'count', 'mean', 'p50', 'p99', 'max', 'load'}
+
+    # the stages are timed explicitly, no method of the device is replaced
+    assert not {'on_source_data', 'get_frame_values'} & set(device.__dict__)
+
+    no_mqtt.clear()
+    device.stats.publish()
+    topics = [t for t, *_ in no_mqtt]
+    assert len(topics) == len(set(topics)) == 8
+    assert all(t.startswith('00000000000000000000/stats/') for t in topics)
+    assert '00000000000000000000/stats/total/count' in topics
+
+
+@pytest.mark.ignore_log_warnings
+async def test_device_stats_parse_executor(no_mqtt, device_stats, monkeypatch, sml_frame_1) -> None:
+    monkeypatch.setattr(CONFIG.general, 'parse_executor', 'thread')
+    device = SmlDevice('device_name')
+    monkeypatch.setattr(ALL_DEVICES, '_devices', (device, ))
+
+    try:
+        device.process_first_frame(sml_frame_1)
+        for _ in range(2):
+            await device.process_frame_async(sml_frame_1)
+    finally:
+        await frame_parser.shutdown_parse_executor()
+
+    # the first frame is parsed in the event loop, the following frames in the executor
+    values = device.stats.get_values()
+    assert values['values']['count'] == 3
+    assert values['process']['count'] == 2
+
+
+@pytest.mark.ignore_log_warnings
+async def test_device_stats_cache(no_mqtt, device_stats, monkeypatch, sml_data_1) -> None:
+    monkeypatch.setattr(CONFIG.general, 'frame_cache', True)
+    device = SmlDevice('device_name')
+
+    for _ in range(3):
+        device.on_source_data(sml_data_1)
+
+    # the values of the first frame are created twice (setup and processing)
+    assert device.stats.get_values()['cache'] == {'hits': 3, 'misses': 1}
+    assert device.stats.get_values()['cache'] == {'hits': 0, 'misses': 0}
+
+
+def test_device_no_stats(sml_data_1) -> None:
+    device = SmlDevice('device_name')
+    assert device.stats is None
+    assert 'on_source_data' not in device.__dict__
@@ -0,0 +1,77 @@
+import logging
+from binascii import a2b_hex
+
+from helper import replace_hex
+from sml2mqtt.const import EnhancedSmlFrame
+from sml2mqtt.sml_device.frame_cache import FrameValuesCache
+
+
+def test_key(sml_frame_1) -> None:
+    key = sml_frame_1.get_values_key()
+    assert key is not None
+
+    # transaction id and seconds index are not part of the key
+    assert replace_hex(sml_frame_1, '0500531efb', '0500531eff').get_values_key() == key
+    assert replace_hex(sml_frame_1, '65001bb32e', '65001bb32f').get_values_key() == key
+
+    # value changed
+    assert replace_hex(sml_frame_1, '650026bea9', '650026beaa').get_values_key() != key
+    # status changed
+    assert replace_hex(sml_frame_1, '65001c0104', '65001c0124').get_values_key() != key
+
+
+def test_key_val_time(sml_frame_2) -> None:
+    key = sml_frame_2.get_values_key()
+    assert key is not None
+
+    # seconds index of the entries is not part of the key
+    assert replace_hex(sml_frame_2, '65021d7707', '65021d7717').get_values_key() == key
+    assert replace_hex(sml_frame_2, '690000000003152c45', '690000000003152c46').get_values_key() != key
+
+
+def test_cache_val_time(sml_frame_2) -> None:
+    log = logging.getLogger('test')
+    cache = FrameValuesCache(lambda frame: frame.get_frame_values(log))
+
+    values = cache.get_frame_values(sml_frame_2)
+    val_time = values.get_value('0100010800ff').val_time
+    assert val_time is not None
+
+    # the time of the values is not part of the key, so it is the one of the parsed frame
+    frame = replace_hex(sml_frame_2, '65021d7707', '65021d7717')
+    cached = cache.get_frame_values(frame)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cached.get_value('0100010800ff').val_time == val_time
+    assert frame.get_frame_values(log).get_value('0100010800ff').val_time != val_time
+
+
+def test_key_no_values() -> None:
+    assert EnhancedSmlFrame(a2b_hex('7605065850a66200620072630101')).get_values_key() is None
+    # truncated frame
+    assert EnhancedSmlFrame(a2b_hex('770701006032010101')).get_values_key() is None
+
+
+def test_cache(sml_frame_1) -> None:
+    log = logging.getLogger('test')
+    cache = FrameValuesCache(lambda frame: frame.get_frame_values(log))
+
+    values = cache.get_frame_values(sml_frame_1)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    frame = replace_hex(sml_frame_1, '0500531efb', '0500531eff')
+    cached = cache.get_frame_values(frame)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # values are reused but the timestamp is the one of the new frame
+    assert cached is not values
+    assert cached.values == values.values
+    assert cached.timestamp == frame.timestamp
+
+    changed = cache.get_frame_values(replace_hex(sml_frame_1, '650026bea9', '650026beaa'))
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert changed.get_value('0100010800ff').value != values.get_value('0100010800ff').value
+
+    cache.clear()
+    cache.get_frame_values(sml_frame_1)
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert repr(cache) == '<FrameValuesCache hits=1 misses=3>'
@@ -0,0 +1,97 @@
+import logging
+from asyncio import sleep
+
+import pytest
+
+from helper import replace_hex
+from sml2mqtt import CONFIG
+from sml2mqtt.const import EnhancedSmlFrame
+from sml2mqtt.sml_device import ALL_DEVICES, SmlDevice, frame_parser
+from sml2mqtt.sml_device.frame_parser import parse_list_entries
+
+
+@pytest.fixture
+async def parse_executor(monkeypatch, request):
+    monkeypatch.setattr(CONFIG.general, 'parse_executor', request.param)
+    yield request.param
+    await frame_parser.shutdown_parse_executor()
+
+
+def test_parse_list_entries(sml_frame_1) -> None:
+    entries, messages = parse_list_entries(sml_frame_1.bytes, 'test')
+    values = sml_frame_1.get_frame_values(logging.getLogger('test'))
+    assert [e.obis for e in entries] == list(values.values)
+    assert messages == []
+
+
+def test_parse_list_entries_log(monkeypatch, sml_frame_1) -> None:
+    def get_obis(self):
+        raise ValueError()
+
+    # the shortcut fails, so the whole frame is parsed
+    monkeypatch.setattr(EnhancedSmlFrame, 'get_obis', get_obis)
+    entries, messages = parse_list_entries(sml_frame_1.bytes, 'test')
+    assert len(entries) == 5
+    assert messages == [(logging.INFO, 'get_obis failed - try parsing frame')]
+
+
+def test_no_executor() -> None:
+    device = SmlDevice('device_name')
+    assert device.frame_parser is None
+    assert frame_parser.get_parse_executor() is None
+
+
+async def wait_until_parsed(device: SmlDevice) -> None:
+    parser = device.frame_parser
+    for _ in range(500):
+        if not parser.frames and parser._event.is_set() is False:
+            return None
+        await sleep(0.01)
+    raise TimeoutError()
+
+
+@pytest.mark.ignore_log_warnings
+@pytest.mark.parametrize('parse_executor', ['thread', 'process'], indirect=True)
+async def test_frame_parser(no_mqtt, monkeypatch, parse_executor, sml_data_1) -> None:
+    device = SmlDevice('device_name')
+    monkeypatch.setattr(ALL_DEVICES, '_devices', (device, ))
+    assert device.frame_parser is not None
+    assert device.frame_parser.in_process is (parse_executor == 'process')
+    device.frame_parser.start()
+
+    device.on_source_data(sml_data_1)
+    await wait_until_parsed(device)
+
+    assert [t for t, *_ in no_mqtt] == [
+        '00000000000000000000/0100000009ff', '00000000000000000000/0100010800ff',
+        '00000000000000000000/0100010801ff', '00000000000000000000/0100010802ff',
+        '00000000000000000000/0100020800ff', '00000000000000000000/0100100700ff',
+        '00000000000000000000/0100240700ff', '00000000000000000000/0100380700ff',
+        '00000000000000000000/01004c0700ff', '00000000000000000000/status',
+    ]
+    assert device.frame_handler == device.frame_parser.put
+
+    await device.frame_parser.cancel_and_wait()
+
+
+@pytest.mark.ignore_log_warnings
+@pytest.mark.parametrize('parse_executor', ['thread'], indirect=True)
+async def test_frame_parser_order(no_mqtt, monkeypatch, parse_executor, sml_frame_1) -> None:
+    # every frame is parsed in the executor
+    monkeypatch.setattr(CONFIG.general, 'frame_template', False)
+
+    device = SmlDevice('device_name')
+    monkeypatch.setattr(ALL_DEVICES, '_devices', (device, ))
+    device.setup_values_from_frame(sml_frame_1)
+    parser = device.frame_parser
+    parser.start()
+
+    for i in range(5):
+        parser.put(replace_hex(sml_frame_1, '650026bea9', f'650026beb{i:d}'))
+    await wait_until_parsed(device)
+
+    values = [round(float(v), 4) for t, v, *_ in no_mqtt if t == '0a0149534b0005020de2/0100010800ff']
+    assert values == [253.9184, 253.9185, 253.9186, 253.9187, 253.9188]
+    assert parser.dropped == 0
+
+    await parser.cancel_and_wait()
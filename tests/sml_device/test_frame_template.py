@@ -0,0 +1,74 @@
+import logging
+
+from helper import replace_hex
+from sml2mqtt.const import EnhancedSmlFrame, SmlFrameValues
+from sml2mqtt.sml_device.frame_template import FrameTemplate
+
+
+def get_values(frame: EnhancedSmlFrame) -> SmlFrameValues:
+    return frame.get_frame_values(logging.getLogger('test'))
+
+
+def assert_values_equal(a: SmlFrameValues, b: SmlFrameValues) -> None:
+    assert list(a.values) == list(b.values)
+    for obis, entry in a.values.items():
+        assert entry.__dict__ == b.values[obis].__dict__
+
+
+def test_template(sml_frame_1, sml_frame_2) -> None:
+    for frame in (sml_frame_1, sml_frame_2):
+        values = get_values(frame)
+        template = FrameTemplate.create(frame, values)
+        assert template is not None
+        assert repr(template) == f'<FrameTemplate size={len(frame.bytes):d} entries=5>'
+
+        decoded = template.get_frame_values(frame)
+        assert decoded.timestamp == frame.timestamp
+        assert_values_equal(decoded, values)
+
+
+def test_template_values_changed(sml_frame_2) -> None:
+    template = FrameTemplate.create(sml_frame_2, get_values(sml_frame_2))
+
+    # value, status and time of the entries
+    frame = replace_hex(sml_frame_2, '690000000003152c45', '690000000103152c46')
+    frame = replace_hex(frame, '65001c0104', '65001c0124')
+    frame = replace_hex(frame, '65021d7707621e', '65021d7717621e')
+
+    decoded = template.get_frame_values(frame)
+    assert decoded is not None
+    assert_values_equal(decoded, get_values(frame))
+
+    entry = decoded.get_value('0100010800ff')
+    assert entry.value == 0x0103152c46
+    assert entry.status == 0x1c0124
+    assert entry.val_time == 0x021d7717
+
+
+def test_template_layout_changed(sml_frame_1) -> None:
+    template = FrameTemplate.create(sml_frame_1, get_values(sml_frame_1))
+
+    # scaler changed
+    assert template.get_frame_values(replace_hex(sml_frame_1, '621e52ff650026bea9', '621e52fe650026bea9')) is None
+    # size of the value changed
+    frame = replace_hex(sml_frame_1, '621e52ff650026bea9', '621e52ff6326bea9')
+    assert template.get_frame_values(frame) is None
+    # obis changed
+    assert template.get_frame_values(replace_hex(sml_frame_1, '0100010800ff', '0100010801ff')) is None
+
+
+def test_template_parsed_values(sml_data_1, stream_reader) -> None:
+    stream_reader.add(sml_data_1)
+    frame = stream_reader.get_frame()
+
+    # entries which are not reported by the parser are ignored
+    values = get_values(frame)
+    assert '8181c78203ff' not in values.obis_ids()
+
+    template = FrameTemplate.create(frame, values)
+    assert len(template.entries) == len(values)
+    assert_values_equal(template.get_frame_values(frame), values)
+
+    # value which is not in the frame
+    values.values['0100990000ff'] = values.get_value('0100010800ff')
+    assert FrameTemplate.create(frame, values) is None
@@ -0,0 +1,104 @@
+import pytest
+from smllib.crc import kermit
+from smllib.errors import CrcError
+
+from sml2mqtt.sml_device.stream_reader_group import StreamReaderGroup
+
+
+def set_crc(data: bytes, crc: int) -> bytes:
+    return data[:-2] + bytes([crc >> 8, crc & 0xFF])
+
+
+def test_crc_locked(sml_data_1) -> None:
+    r = StreamReaderGroup('kermit', 'x25')
+    assert r.crc is None
+
+    r.add(sml_data_1)
+    assert r.get_frame() is not None
+    assert r.crc == 'x25'
+    assert list(r.crc_funcs) == ['x25']
+
+    # kermit is no longer accepted
+    r.add(set_crc(sml_data_1, kermit.get_crc(sml_data_1[:-2])))
+    with pytest.raises(CrcError):
+        r.get_frame()
+
+    r.add(sml_data_1)
+    assert r.get_frame() is not None
+
+
+def test_kermit(sml_data_1) -> None:
+    data = set_crc(sml_data_1, kermit.get_crc(sml_data_1[:-2]))
+
+    r = StreamReaderGroup('x25', 'kermit')
+    r.add(data)
+    assert r.get_frame() is not None
+    assert r.crc == 'kermit'
+
+
+def test_crc_error(sml_data_1) -> None:
+    r = StreamReaderGroup('x25', 'kermit')
+    r.add(set_crc(sml_data_1, 0))
+
+    with pytest.raises(CrcError):
+        r.get_frame()
+    assert r.crc is None
+
+    # frame got removed from the buffer
+    assert r.get_frame() is None
+
+
+def test_chunks(sml_data_1) -> None:
+    r = StreamReaderGroup('x25', 'kermit')
+
+    data = b'\x00\x1B\x1B' + sml_data_1 + sml_data_1[:50]
+    frames = []
+    for i in range(0, len(data), 7):
+        r.add(data[i: i + 7])
+        if (frame := r.get_frame()) is not None:
+            frames.append(frame)
+
+    assert len(frames) == 1
+    assert r.bytes == sml_data_1[:50]
+
+
+def test_invalid_crc() -> None:
+    with pytest.raises(ValueError, match='Unsupported CRC "asdf"! Available: "kermit", "x25"'):
+        StreamReaderGroup('asdf')
+
+
+def test_buffer_garbage(sml_data_1) -> None:
+    r = StreamReaderGroup('x25', max_size=1024)
+
+    # garbage gets dropped as soon as we know it's not part of a frame
+    for _ in range(100):
+        r.add(b'\x00' * 100 + b'\x1B\x1B')
+        assert r.get_frame() is None
+        assert len(r) <= 7
+
+    r.add(sml_data_1)
+    assert r.get_frame() is not None
+    assert len(r) == 0
+
+
+def test_buffer_max_size(sml_data_1) -> None:
+    r = StreamReaderGroup('x25', max_size=1024)
+    assert r.max_size == 1024
+
+    # incomplete frames get truncated
+    for _ in range(5):
+        r.add(sml_data_1[:-10])
+        assert len(r) <= 1024
+        assert r.get_frame() is None
+
+    # data that is bigger than the buffer
+    r.add(b'\x00' * 2000 + sml_data_1)
+    assert r.get_frame() is not None
+    assert len(r) == 0
+
+    # buffer gets compacted and can still be used
+    for _ in range(20):
+        r.add(sml_data_1[:100])
+        r.add(sml_data_1[100:])
+        assert r.get_frame() is not None
+        assert len(r) == 0
@@ -3,8 +3,10 @@ from __future__ import annotations
 import asyncio
 from unittest.mock import Mock
 
+import pytest
+
 from sml2mqtt.sml_device import DeviceStatus, SmlDevice
-from sml2mqtt.sml_device.watchdog import Watchdog
+from sml2mqtt.sml_device.watchdog import WATCHDOG_SCHEDULER, Watchdog
 
 
 def get_watchdog() -> tuple[Mock, Watchdog]:
@@ -76,3 +78,52 @@ async def test_watchdog_setup_and_feed(sml_data_1) -> None:
     assert obj.status == DeviceStatus.MSG_TIMEOUT
 
     await obj.cancel_and_wait()
+
+
+async def test_watchdog_scheduler() -> None:
+    watchdogs = [get_watchdog() for _ in range(20)]
+    for i, (_, w) in enumerate(watchdogs):
+        w.set_timeout(0.1 + i * 0.005)
+        w.start()
+    assert len(WATCHDOG_SCHEDULER) == 20
+
+    # cancelled watchdogs don't fire and restarted watchdogs have only one active entry
+    for _, w in watchdogs[:5]:
+        await w.cancel_and_wait()
+    _, w = watchdogs[5]
+    w.start()
+
+    for _ in range(4):
+        for _, w in watchdogs[10:]:
+            w.feed()
+        await asyncio.sleep(0.04)
+
+    for m, _ in watchdogs[:5]:
+        m.assert_not_called()
+    for m, _ in watchdogs[5:10]:
+        m.assert_called_once()
+    for m, _ in watchdogs[10:]:
+        m.assert_not_called()
+
+    for _, w in watchdogs:
+        await w.cancel_and_wait()
+    await asyncio.sleep(0.3)
+    assert len(WATCHDOG_SCHEDULER) == 0
+
+
+async def test_watchdog_error() -> None:
+    p = Mock()
+    p.name = 'test'
+    p.on_timeout.side_effect = e = ValueError()
+
+    w = Watchdog(p).set_timeout(0.1)
+    w.start()
+    await asyncio.sleep(0.15)
+    await w.cancel_and_wait()
+
+    p.on_error.assert_called_once_with(e)
+
+
+def test_watchdog_no_timeout() -> None:
+    with pytest.raises(ValueError, match='Timeout of the watchdog is not set'):
+        Watchdog(Mock()).start()
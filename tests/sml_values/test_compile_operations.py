@@ -0,0 +1,121 @@
+from collections.abc import Callable
+
+import pytest
+
+from sml2mqtt.mqtt import MqttObj
+from sml2mqtt.sml_value import SmlValue
+from sml2mqtt.sml_value.base import ValueOperationBase
+from sml2mqtt.sml_value.compile_operations import OperationCompiler, compile_operations
+from sml2mqtt.sml_value.operations import (
+    DateTimeFinder,
+    DeltaFilterOperation,
+    FactorOperation,
+    OffsetOperation,
+    OnChangeFilterOperation,
+    OrOperation,
+    RangeFilterOperation,
+    RoundOperation,
+    SequenceOperation,
+    SkipZeroMeterOperation,
+    VirtualMeterOperation,
+)
+
+
+def get_source(*ops: ValueOperationBase) -> list[str]:
+    return OperationCompiler().get_source(ops).splitlines()
+
+
+def test_source() -> None:
+    assert get_source(FactorOperation(3), OffsetOperation(-0.5), RoundOperation(0), OnChangeFilterOperation()) == [
+        'def process_operations(value, info):',
+        '    if value is not None:',
+        '        value = value * 3',
+        '        value = value + -0.5',
+        '        value = round(value)',
+        '        if op0.last_value == value:',
+        '            value = None',
+        '        else:',
+        '            op0.last_value = value',
+        '    return value',
+    ]
+
+    # a filter can return None so the next operation needs a new check
+    assert get_source(SkipZeroMeterOperation(), RangeFilterOperation(None, 5, False), FactorOperation(2)) == [
+        'def process_operations(value, info):',
+        '    if value is not None:',
+        '        if value < 0.1:',
+        '            value = None',
+        '    if value is not None:',
+        '        if value > 5:',
+        '            value = None',
+        '    if value is not None:',
+        '        value = value * 2',
+        '    return value',
+    ]
+
+
+def test_source_call() -> None:
+    assert get_source(DeltaFilterOperation(1), FactorOperation(float('inf'))) == [
+        'def process_operations(value, info):',
+        '    value = op0.process_value(value, info)',
+        '    if value is not None:',
+        '        value = value * c1',
+        '    return value',
+    ]
+
+
+def create_ops() -> list[Callable[[], list[ValueOperationBase]]]:
+    def or_ops():
+        o = OrOperation()
+        o.add_operation(RangeFilterOperation(None, 10, False))
+        o.add_operation(SequenceOperation().add_operation(FactorOperation(-1)).add_operation(OffsetOperation(100)))
+        return [o, OnChangeFilterOperation()]
+
+    return [
+        lambda: [FactorOperation(0.1), OffsetOperation(3), RoundOperation(2)],
+        lambda: [RangeFilterOperation(2, 8), DeltaFilterOperation(min_percent=20), OnChangeFilterOperation()],
+        lambda: [SkipZeroMeterOperation(), RangeFilterOperation(1, 6, False), RoundOperation(0)],
+        lambda: [SequenceOperation(), OrOperation(), RangeFilterOperation(None, None)],
+        or_ops,
+    ]
+
+
+@pytest.mark.parametrize('factory', create_ops())
+def test_compiled_same_result(factory: Callable[[], list[ValueOperationBase]]) -> None:
+    value = SmlValue('obis', MqttObj())
+    for op in factory():
+        value.add_operation(op)
+
+    compiled = SmlValue('obis', MqttObj())
+    for op in factory():
+        compiled.add_operation(op)
+    compiled.compile_operations()
+
+    assert compiled.process_operations is not SmlValue.process_operations
+    for i in (None, 0, 0.05, 1, 1, 3.33, 5, 5, 7, None, 12, 9, -3, 9.999):
+        assert value.process_operations(i, None) == compiled.process_operations(i, None), i
+
+
+def test_sml_value_recompile() -> None:
+    value = SmlValue('obis', MqttObj()).add_operation(FactorOperation(2))
+    value.compile_operations()
+    assert value.process_operations(3, None) == 6
+
+    # Changing the operations removes the compiled function
+    value.add_operation(OffsetOperation(1))
+    assert value.process_operations(3, None) == 7
+    value.insert_operation(OffsetOperation(1))
+    assert value.process_operations(3, None) == 9
+
+    value.compile_operations()
+    assert value.process_operations(3, None) == 9
+
+
+def test_startup_operation() -> None:
+    op = VirtualMeterOperation(DateTimeFinder(), start_now=True)
+    func = compile_operations(SequenceOperation().add_operation(op))
+
+    # The operation swaps the method so it has to be looked up every call
+    assert func(None, None) is None
+    assert func(5, None) == 0
+    assert func(7, None) == 2
@@ -57,3 +57,34 @@ def test_heartbeat_action(monotonic) -> None:
         HeartbeatActionOperation(30),
         '- Heartbeat Action: 30 seconds'
     )
+
+
+def test_refresh_next_tick(monotonic) -> None:
+    f = RefreshActionOperation(30)
+
+    # without a value the tick is only checked again
+    assert f.get_next_tick(10) == 40
+    assert f.process_value(None, None) is None
+
+    monotonic.set(5)
+    assert f.process_value(1, None) == 1
+    assert f.get_next_tick(10) == 35
+
+    monotonic.set(35)
+    assert f.process_value(None, None) == 1
+    assert f.get_next_tick(35) == 65
+
+
+def test_heartbeat_next_tick(monotonic) -> None:
+    f = HeartbeatActionOperation(30)
+    monotonic.set(100)
+
+    # a tick before the first value does not delay the first value
+    assert f.get_next_tick(100) == 130
+    assert f.process_value(None, None) is None
+    assert f.process_value(1, None) == 1
+    assert f.get_next_tick(100) == 130
+
+    monotonic.set(130)
+    assert f.process_value(None, None) == 1
+    assert f.get_next_tick(130) == 160
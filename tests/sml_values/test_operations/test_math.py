@@ -2,6 +2,7 @@ from tests.sml_values.test_operations.helper import check_description, check_ope
 
 from sml2mqtt.sml_value.base import ValueOperationBase
 from sml2mqtt.sml_value.operations import (
+    AffineOperation,
     FactorOperation,
     OffsetOperation,
     RoundOperation,
@@ -101,3 +102,12 @@ def test_description() -> None:
             RoundToMultipleOperation(50, mode),
             ['- Round To Multiple:', '      value: 50', f'      round: {mode:s}']
         )
+
+
+def test_affine() -> None:
+    o = AffineOperation(2, -1)
+    check_operation_repr(o, 'factor=2 offset=-1')
+
+    check_values(o, (5, 9), (1.25, 1.5), (-3, -7))
+
+    check_description(o, ['- Affine:', '    factor: 2', '    offset: -1'])
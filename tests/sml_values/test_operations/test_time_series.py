@@ -107,3 +107,15 @@ def test_mean() -> None:
             '    Reset after value: False',
         ]
     )
+
+
+def test_next_tick() -> None:
+    o = MeanOfIntervalOperation(TimeSeries(10), False)
+    assert o.get_next_tick(3) == 13
+
+    assert o.process_value(1, info(0)) is None
+    assert o.get_next_tick(3) == 10
+
+    # the interval is calculated without a new value if the meter stalls
+    assert o.process_value(None, info(10)) == 1
+    assert o.get_next_tick(10) == 20
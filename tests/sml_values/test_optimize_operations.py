@@ -0,0 +1,91 @@
+from tests.sml_values.test_operations.helper import check_description
+
+from sml2mqtt.mqtt import MqttObj
+from sml2mqtt.sml_value import SmlValue
+from sml2mqtt.sml_value.base import ValueOperationBase
+from sml2mqtt.sml_value.operations import (
+    AffineOperation,
+    FactorOperation,
+    OffsetOperation,
+    OnChangeFilterOperation,
+    OrOperation,
+    RoundOperation,
+    SequenceOperation,
+)
+from sml2mqtt.sml_value.optimize_operations import optimize_operations
+
+
+def get_desc(ops: tuple[ValueOperationBase, ...]) -> list[str]:
+    return [line for op in ops for line in op.describe()]
+
+
+def test_fuse() -> None:
+    ops = optimize_operations([FactorOperation(2), OffsetOperation(3), FactorOperation(5), RoundOperation(1)])
+    assert get_desc(ops) == ['- Affine:', '    factor: 10', '    offset: 15', '- Round: 1']
+    assert ops[0].process_value(1.5, None) == (1.5 * 2 + 3) * 5
+
+    ops = optimize_operations([FactorOperation(2), FactorOperation(3), OnChangeFilterOperation(), OffsetOperation(1),
+                               OffsetOperation(-3), AffineOperation(2, 1)])
+    assert get_desc(ops) == ['- Factor: 6', '- On Change Filter', '- Affine:', '    factor: 2', '    offset: -3']
+
+    # factor and offset cancel each other out
+    ops = optimize_operations([OffsetOperation(1), OffsetOperation(-1)])
+    assert get_desc(ops) == ['- Factor: 1']
+
+
+def test_unchanged() -> None:
+    ops = (FactorOperation(2), RoundOperation(1), OffsetOperation(3), OnChangeFilterOperation())
+    assert optimize_operations(ops) == ops
+
+    # rounds with different digits
+    ops = (RoundOperation(1), RoundOperation(0))
+    assert optimize_operations(ops) == ops
+
+
+def test_round() -> None:
+    ops = optimize_operations([RoundOperation(2), RoundOperation(2), OnChangeFilterOperation(), RoundOperation(2)])
+    assert get_desc(ops) == ['- Round: 2', '- On Change Filter', '- Round: 2']
+
+
+def test_container() -> None:
+    seq = SequenceOperation().add_operation(FactorOperation(2)).add_operation(OffsetOperation(3))
+    o = OrOperation().add_operation(seq).add_operation(FactorOperation(2)).add_operation(FactorOperation(3))
+
+    ops = optimize_operations([o])
+    assert get_desc(ops) == [
+        '- Or:', '  - Sequence:', '    - Affine:', '        factor: 2', '        offset: 3',
+        '  - Factor: 2', '  - Factor: 3'
+    ]
+
+    # original operations are not changed
+    assert get_desc((o, )) == [
+        '- Or:', '  - Sequence:', '    - Factor: 2', '    - Offset: 3', '  - Factor: 2', '  - Factor: 3'
+    ]
+    assert ops[0].process_value(5, None) == 13
+
+
+def test_sml_value(no_mqtt) -> None:
+    value = SmlValue('0100010800ff', MqttObj(topic_fragment='test', qos=0, retain=False).update())
+    value.add_operation(FactorOperation(1 / 1000)).add_operation(OffsetOperation(5))
+    value.add_operation(OnChangeFilterOperation())
+
+    value.optimize_operations()
+    check_description(value, [
+        '<SmlValue>',
+        '  obis : 0100010800ff',
+        '  topic: test',
+        '  operations:',
+        '    - Factor: 0.001',
+        '    - Offset: 5',
+        '    - On Change Filter',
+        '  optimized operations:',
+        '    - Affine:',
+        '        factor: 0.001',
+        '        offset: 5',
+        '    - On Change Filter',
+        '',
+    ])
+
+    assert value.process_operations(5000, None) == 10
+    value.compile_operations()
+    assert value.process_operations(6000, None) == 11
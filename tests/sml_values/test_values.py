@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import pytest
@@ -10,7 +11,18 @@ from sml2mqtt.errors import (
 )
 from sml2mqtt.mqtt import MqttObj
 from sml2mqtt.sml_value import SmlValue, SmlValues
-from sml2mqtt.sml_value.operations import OnChangeFilterOperation
+from sml2mqtt.sml_value.base import get_tick_operations
+from sml2mqtt.sml_value.operations import (
+    FactorOperation,
+    HeartbeatActionOperation,
+    OffsetOperation,
+    OnChangeFilterOperation,
+    OrOperation,
+    RefreshActionOperation,
+    RoundOperation,
+    SequenceOperation,
+)
+from sml2mqtt.sml_value.sml_value import TICK_SCHEDULER
 from sml_values.test_operations.helper import check_description
 
 
@@ -30,7 +42,7 @@ def test_values(sml_frame_1_values: SmlFrameValues, no_mqtt) -> None:
     # The change filter prevents a republish
     for _ in range(10):
         v.process_frame(sml_frame_1_values)
-        assert no_mqtt == [('test/energy', 253917.7, 0, False), ('test/power', 272, 0, False)]
+        assert no_mqtt == [('test/energy', b'253917.7', 0, False), ('test/power', b'272', 0, False)]
 
     # test description
     check_description(v, [
@@ -119,3 +131,69 @@ def test_missing(sml_frame_1_values: SmlFrameValues, no_mqtt, caplog) -> None:
         'Expected obis id missing in frame: 1100010800ff!',
         'Expected obis ids missing in frame: 1100010800ff, 1200010800ff!'
     ]
+
+
+def test_tick_operations() -> None:
+    refresh = RefreshActionOperation(30)
+    heartbeat = HeartbeatActionOperation(30)
+    seq = SequenceOperation().add_operation(OnChangeFilterOperation()).add_operation(refresh)
+    op_or = OrOperation().add_operation(seq).add_operation(heartbeat)
+
+    assert get_tick_operations([OnChangeFilterOperation()]) == ()
+    assert get_tick_operations([op_or, OnChangeFilterOperation()]) == (refresh, heartbeat)
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_tick_passes_none(no_mqtt, compiled: bool) -> None:
+    # A tick processes all operations without a value, operations which are not time based must pass it through
+    factor, offset, rnd, on_change = FactorOperation(2), OffsetOperation(1), RoundOperation(0), OnChangeFilterOperation()
+    value = SmlValue('0100010800ff', MqttObj(topic_fragment='test', qos=0, retain=False).update())
+    for op in (factor, offset, rnd, on_change):
+        value.add_operation(op)
+    if compiled:
+        value.compile_operations()
+
+    for op in (factor, offset, rnd, on_change):
+        assert op.process_value(None, None) is None
+
+    assert value.process_tick(10) is None
+    assert on_change.last_value is None
+
+    # the tick doesn't change the state of the operations
+    assert value.process_operations(3.4, None) == 8
+    assert value.process_tick(20) is None
+    assert on_change.last_value == 8
+    assert value.process_operations(3.4, None) is None
+    assert no_mqtt == []
+
+
+async def test_ticks(sml_frame_1_values: SmlFrameValues, no_mqtt) -> None:
+    mqtt = MqttObj(topic_fragment='test', qos=0, retain=False).update()
+
+    v = SmlValues()
+    v.set_skipped('010060320101', '0100600100ff', '0100020800ff')
+    v.add_value(
+        SmlValue('0100010800ff', mqtt.create_child('energy'))
+        .add_operation(OnChangeFilterOperation()).add_operation(RefreshActionOperation(0.1))
+    )
+    # values without time based operations are not scheduled
+    v.add_value(
+        SmlValue('0100100700ff', mqtt.create_child('power')).add_operation(OnChangeFilterOperation())
+    )
+
+    v.start_ticks()
+    assert len(TICK_SCHEDULER) == 1
+
+    v.process_frame(sml_frame_1_values)
+    assert no_mqtt == [('test/energy', b'253917.7', 0, False), ('test/power', b'272', 0, False)]
+    no_mqtt.clear()
+
+    # the meter stalls but the value is refreshed
+    await asyncio.sleep(0.25)
+    assert no_mqtt == [('test/energy', b'253917.7', 0, False)] * 2
+    no_mqtt.clear()
+
+    v.stop_ticks()
+    await asyncio.sleep(0.15)
+    assert no_mqtt == []
+    assert len(TICK_SCHEDULER) == 0
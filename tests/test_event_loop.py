@@ -0,0 +1,63 @@
+import sys
+from types import ModuleType
+
+import pytest
+
+from sml2mqtt import CONFIG
+from sml2mqtt.__args__ import CMD_ARGS, get_command_line_args
+from sml2mqtt.runtime import get_event_loop_name, run_event_loop
+
+
+async def coro() -> str:
+    return 'done'
+
+
+@pytest.fixture
+def event_loop_args(monkeypatch):
+    monkeypatch.setattr(CMD_ARGS, 'config', None)
+    monkeypatch.setattr(CMD_ARGS, 'analyze', False)
+    monkeypatch.setattr(CMD_ARGS, 'event_loop', None)
+
+
+def test_event_loop_name(monkeypatch, event_loop_args) -> None:
+    assert get_event_loop_name() == 'asyncio'
+
+    monkeypatch.setattr(CONFIG.general, 'event_loop', 'uvloop')
+    assert get_event_loop_name() == 'uvloop'
+
+    # command line overrides the config
+    CMD_ARGS.event_loop = 'asyncio'
+    assert get_event_loop_name() == 'asyncio'
+
+
+def test_command_line(tmp_path, event_loop_args) -> None:
+    file = tmp_path / 'config.yml'
+    assert get_command_line_args(['-c', str(file)]).event_loop is None
+    assert get_command_line_args(['-c', str(file), '--event-loop', 'uvloop']).event_loop == 'uvloop'
+
+
+def test_run_default(event_loop_args) -> None:
+    assert run_event_loop(coro()) == 'done'
+
+
+def test_run_uvloop(monkeypatch, event_loop_args) -> None:
+    CMD_ARGS.event_loop = 'uvloop'
+
+    calls = []
+    uvloop = ModuleType('uvloop')
+    uvloop.__version__ = '0.0'
+    uvloop.run = lambda c: calls.append(c) or c.close()
+    monkeypatch.setitem(sys.modules, 'uvloop', uvloop)
+
+    c = coro()
+    run_event_loop(c)
+    assert calls == [c]
+
+
+@pytest.mark.ignore_log_warnings
+def test_run_uvloop_missing(monkeypatch, caplog, event_loop_args) -> None:
+    CMD_ARGS.event_loop = 'uvloop'
+    monkeypatch.setitem(sys.modules, 'uvloop', None)
+
+    assert run_event_loop(coro()) == 'done'
+    assert 'uvloop is not installed - using the default event loop' in caplog.messages
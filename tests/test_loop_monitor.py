@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import pytest
+
+from sml2mqtt import CONFIG
+from sml2mqtt.mqtt import diagnostics as diagnostics_module
+from sml2mqtt.runtime.loop_monitor import LoopMonitor
+from sml2mqtt.sml_device import watchdog as watchdog_module
+from sml2mqtt.sml_device.watchdog import Watchdog
+
+
+@pytest.fixture
+async def loop_monitor(monkeypatch):
+    cfg = CONFIG.diagnostics.loop_monitor
+    monkeypatch.setattr(cfg, 'enabled', True)
+    monkeypatch.setattr(cfg, 'interval', 0.01)
+    monkeypatch.setattr(cfg, 'watchdog_grace', True)
+    monkeypatch.setattr(diagnostics_module, 'DIAGNOSTICS', {})
+
+    monitor = LoopMonitor()
+    monitor.start()
+    assert monitor.is_running
+    assert diagnostics_module.DIAGNOSTICS == {'loop': monitor.get_diagnostics}
+
+    yield monitor
+    await monitor._task.cancel_and_wait()
+
+
+def test_slow_callbacks() -> None:
+    m = LoopMonitor(slowest=2)
+    assert not m.is_running
+    assert m.get_grace(0) == 0
+
+    m.add_callback('a', 0.01)
+    m.add_callback('a', 0.06)
+    m.add_callback('b', 0.1)
+    m.add_callback('c', 0.07)
+
+    assert m.get_diagnostics() == {
+        'lag_max': 0, 'lag_mean': 0, 'slow_callbacks': 3, 'slowest': 'b: 100.0ms, c: 70.0ms'
+    }
+    assert m.get_diagnostics() == {'lag_max': 0, 'lag_mean': 0, 'slow_callbacks': 0, 'slowest': ''}
+
+
+async def test_lag(loop_monitor) -> None:
+    await asyncio.sleep(0.05)
+    lag_start = loop_monitor.get_lag_total()
+
+    # block the loop
+    time.sleep(0.1)  # noqa: ASYNC251
+    assert loop_monitor.get_grace(lag_start) >= 0.08
+
+    await asyncio.sleep(0.02)
+    values = loop_monitor.get_diagnostics()
+    assert values['lag_max'] >= 80
+    assert values['lag_mean'] > 0
+
+
+async def test_instrument(loop_monitor) -> None:
+    class Device:
+        name = 'device'
+
+        def on_source_data(self, data: bytes) -> None:
+            time.sleep(0.06)
+
+    device = Device()
+    loop_monitor.instrument(device)
+    device.on_source_data(b'')
+
+    values = loop_monitor.get_diagnostics()
+    assert values['slow_callbacks'] == 1
+    assert values['slowest'].startswith('device: ')
+
+    # not instrumented if the monitor is not running
+    device = Device()
+    LoopMonitor().instrument(device)
+    assert 'on_source_data' not in device.__dict__
+
+
+async def test_watchdog_grace(monkeypatch, loop_monitor) -> None:
+    monkeypatch.setattr(watchdog_module, 'LOOP_MONITOR', loop_monitor)
+
+    device = type('Device', (), {'name': 'test', 'timeouts': 0})()
+    device.on_timeout = lambda: setattr(device, 'timeouts', device.timeouts + 1)
+
+    w = Watchdog(device).set_timeout(0.1)
+    w.start()
+    await asyncio.sleep(0.01)
+
+    # The loop is blocked longer than the timeout, but the data arrives shortly after
+    time.sleep(0.15)  # noqa: ASYNC251
+    await asyncio.sleep(0.05)
+    assert device.timeouts == 0
+    w.feed()
+
+    await asyncio.sleep(0.05)
+    assert device.timeouts == 0
+
+    # no data -> timeout
+    await asyncio.sleep(0.1)
+    assert device.timeouts == 1
+
+    await w.cancel_and_wait()
@@ -0,0 +1,26 @@
+import asyncio
+
+import sml2mqtt.__main__ as main_module
+from sml2mqtt.runtime import do_shutdown_async
+from sml2mqtt.runtime import shutdown as shutdown_module
+
+
+async def test_main_waits_for_shutdown(monkeypatch, arg_analyze) -> None:
+    monkeypatch.setattr(shutdown_module, '_SHUTDOWN_STARTED', False)
+    monkeypatch.setattr(main_module, 'signal_handler_setup', lambda: None)
+
+    # a device without a task of its own (e.g. udp source)
+    async def create_devices(inputs, *, analyze: bool) -> None:
+        pass
+
+    monkeypatch.setattr(main_module, 'create_devices', create_devices)
+
+    task = asyncio.create_task(main_module.a_main())
+    await asyncio.sleep(0.1)
+    assert not task.done()
+
+    await do_shutdown_async()
+    await asyncio.wait_for(task, 1)
+
+    # the shutdown was already started
+    await asyncio.wait_for(shutdown_module.wait_for_shutdown(), 0.1)
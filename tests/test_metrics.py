@@ -0,0 +1,76 @@
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from sml2mqtt.metrics import get_metrics
+from sml2mqtt.metrics.metrics import CONTENT_TYPE, MetricFamily, render_metrics
+from sml2mqtt.metrics.server import create_app
+from sml2mqtt.sml_device import ALL_DEVICES, SmlDevice
+
+
+def test_render() -> None:
+    families = [
+        MetricFamily('frames', 'counter', 'Frames').add(3, device='a"b').add(1, device='c'),
+        MetricFamily('queue', 'gauge', 'Queue size').add(1.5),
+        MetricFamily('latency', 'summary', 'Latency').add(0.25, '_sum').add(2, '_count'),
+    ]
+
+    assert render_metrics(families) == '''# TYPE sml2mqtt_frames counter
+# HELP sml2mqtt_frames Frames
+sml2mqtt_frames_total{device="a\\"b"} 3
+sml2mqtt_frames_total{device="c"} 1
+# TYPE sml2mqtt_queue gauge
+# HELP sml2mqtt_queue Queue size
+sml2mqtt_queue 1.5
+# TYPE sml2mqtt_latency summary
+# HELP sml2mqtt_latency Latency
+sml2mqtt_latency_sum 0.25
+sml2mqtt_latency_count 2
+# EOF
+'''
+
+
+@pytest.fixture
+def device(monkeypatch):
+    device = SmlDevice('device_name')
+    monkeypatch.setattr(ALL_DEVICES, '_devices', (device, ))
+    return device
+
+
+@pytest.mark.ignore_log_warnings
+async def test_device_metrics(no_mqtt, device, sml_data_1) -> None:
+    device.on_source_data(sml_data_1)
+    device.on_source_data(sml_data_1)
+    device.on_source_data(sml_data_1[:-1] + b'\x00')
+    device.on_timeout()
+
+    lines = get_metrics().splitlines()
+
+    assert 'sml2mqtt_frames_total{device="device_name"} 2' in lines
+    assert 'sml2mqtt_crc_errors_total{device="device_name",crc="x25"} 1' in lines
+    assert 'sml2mqtt_device_status_changes_total{device="device_name",status="OK"} 1' in lines
+    assert 'sml2mqtt_device_status_changes_total{device="device_name",status="CRC_ERROR"} 1' in lines
+    assert 'sml2mqtt_watchdog_timeouts_total{device="device_name"} 1' in lines
+    assert 'sml2mqtt_value_processed_total{device="device_name",obis="0100010800ff"} 2' in lines
+    assert 'sml2mqtt_value_published_total{device="device_name",obis="0100010800ff"} 1' in lines
+
+
+@pytest.mark.ignore_log_warnings
+async def test_device_metrics_crc_not_locked(no_mqtt, device, sml_data_1) -> None:
+    # Before the reader has locked onto a crc algorithm the error is counted for every algorithm
+    device.on_source_data(sml_data_1[:-1] + b'\x00')
+    device.on_source_data(sml_data_1)
+
+    lines = get_metrics().splitlines()
+    assert 'sml2mqtt_crc_errors_total{device="device_name",crc="x25"} 1' in lines
+    assert 'sml2mqtt_crc_errors_total{device="device_name",crc="kermit"} 1' in lines
+
+
+async def test_server(device) -> None:
+    async with TestClient(TestServer(create_app())) as client:
+        resp = await client.get('/metrics')
+        assert resp.status == 200
+        assert resp.headers['Content-Type'] == CONTENT_TYPE
+
+        text = await resp.text()
+        assert 'sml2mqtt_frames_total{device="device_name"} 0' in text
+        assert text.endswith('# EOF\n')
@@ -0,0 +1,253 @@
+from pathlib import Path
+
+import pytest
+from aiomqtt import MqttError
+
+from sml2mqtt.mqtt import MqttObj, register_diagnostics
+from sml2mqtt.mqtt import diagnostics as diagnostics_module
+from sml2mqtt.mqtt.diagnostics import publish_diagnostics
+from sml2mqtt.mqtt.mqtt import publish_batch
+from sml2mqtt.mqtt.publish_queue import PublishQueue, SpillFile
+
+
+def fill(q: PublishQueue, *items: tuple[str, int, int, bool]) -> None:
+    for item in items:
+        q.put(*item)
+
+
+def get_batch(q: PublishQueue) -> list[tuple[str, int, int, bool]]:
+    return [item[:4] for item in q.get_batch()]
+
+
+def test_publish_batch() -> None:
+    q = PublishQueue(100)
+    fill(
+        q,
+        ('a', 1, 0, False),
+        ('b', 1, 1, False),
+        ('a', 2, 0, False),
+        ('c', 1, 1, True),
+        ('b', 2, 1, False),
+        ('c', 2, 1, True),
+    )
+
+    assert get_batch(q) == [
+        ('b', 1, 1, False),
+        ('a', 2, 0, False),
+        ('b', 2, 1, False),
+        ('c', 2, 1, True),
+    ]
+    assert not len(q)
+    assert get_batch(q) == []
+
+
+def test_drop_oldest() -> None:
+    q = PublishQueue(2, 'drop oldest')
+    fill(q, ('a', 1, 0, False), ('b', 1, 0, False), ('c', 1, 0, False))
+
+    assert len(q) == 2
+    assert q.dropped == 1
+    assert get_batch(q) == [('b', 1, 0, False), ('c', 1, 0, False)]
+
+
+def test_drop_newest() -> None:
+    q = PublishQueue(2, 'drop newest')
+    fill(q, ('a', 1, 0, False), ('b', 1, 0, False), ('c', 1, 0, False))
+
+    assert q.dropped == 1
+    assert get_batch(q) == [('a', 1, 0, False), ('b', 1, 0, False)]
+
+
+def test_keep_latest_per_topic() -> None:
+    q = PublishQueue(2, 'keep latest per topic')
+    fill(q, ('a', 1, 1, False), ('b', 1, 0, False), ('a', 2, 1, False))
+    assert q.dropped == 0
+    assert len(q) == 2
+
+    # new topic drops the oldest topic
+    fill(q, ('c', 1, 0, False))
+    assert q.dropped == 1
+    assert get_batch(q) == [('b', 1, 0, False), ('c', 1, 0, False)]
+
+
+def test_put_back() -> None:
+    q = PublishQueue(2)
+    fill(q, ('a', 1, 0, False), ('b', 1, 1, False))
+    batch = q.get_batch()
+
+    # only QoS >= 1 gets queued again
+    q.put_back(batch)
+    assert get_batch(q) == [('b', 1, 1, False)]
+
+
+class FailingClient:
+    def __init__(self, *fail: str) -> None:
+        self.fail = fail
+        self.published = []
+
+    async def publish(self, topic: str, *args) -> None:
+        if topic in self.fail:
+            msg = 'failed'
+            raise MqttError(msg)
+        self.published.append(topic)
+
+
+async def test_publish_batch_failed() -> None:
+    q = PublishQueue(10)
+    fill(q, ('a', 1, 1, False), ('b', 1, 1, False), ('c', 1, 1, False))
+    batch = q.get_batch()
+
+    client = FailingClient('b')
+    failed = await publish_batch(client, batch)
+    assert client.published == ['a', 'c']
+    assert [(item[0], str(e)) for item, e in failed] == [('b', 'failed')]
+
+    # only the failed message is queued again
+    q.put_back(item for item, _ in failed)
+    assert get_batch(q) == [('b', 1, 1, False)]
+
+    assert await publish_batch(client, batch[:1]) == []
+    assert [item[0] for item, _ in await publish_batch(client, batch[1:2])] == ['b']
+
+
+def test_latency(monkeypatch) -> None:
+    q = PublishQueue(2)
+    monkeypatch.setattr('sml2mqtt.mqtt.publish_queue.monotonic', lambda: 1)
+    fill(q, ('a', 1, 0, False))
+    batch = q.get_batch()
+
+    monkeypatch.setattr('sml2mqtt.mqtt.publish_queue.monotonic', lambda: 1.5)
+    q.on_published(batch)
+
+    assert q.get_diagnostics() == {'queue': 0, 'published': 1, 'dropped': 0, 'spilled': 0, 'latency': 500}
+    assert q.get_diagnostics()['latency'] == 0
+
+
+def test_spill(tmp_path: Path) -> None:
+    spill = SpillFile(tmp_path / 'spill.json', 1024)
+    q = PublishQueue(2, spill=spill)
+
+    fill(q, ('a', 1, 1, False), ('b', b'\x01\x02', 1, True), ('c', 1, 0, False), ('d', 'asdf', 2, False))
+    assert (q.dropped, q.spilled) == (0, 2)
+    assert get_batch(q) == [('c', 1, 0, False), ('d', 'asdf', 2, False)]
+
+    # dropped messages are only written with flush
+    assert not spill.path.is_file()
+    assert q.flush_spill() == 2
+    assert spill.path.stat().st_size == spill.get_size()
+
+    # spilled items are loaded when the queue is empty
+    assert q.load_spilled() == 2
+    assert q.load_spilled() == 0
+    assert get_batch(q) == [('a', 1, 1, False), ('b', b'\x01\x02', 1, True)]
+    assert not spill.path.is_file()
+
+    # pending messages with QoS >= 1
+    fill(q, ('a', 1, 1, False), ('c', 1, 0, False))
+    assert q.spill_pending() == 1
+    assert not len(q)
+
+    q = PublishQueue(2, spill=spill)
+    assert q.load_spilled() == 1
+    assert get_batch(q) == [('a', 1, 1, False)]
+
+
+def test_spill_size(tmp_path: Path) -> None:
+    spill = SpillFile(tmp_path / 'spill.json', 1024)
+    q = PublishQueue(1, spill=spill)
+
+    for i in range(100):
+        q.put('topic', i, 1, False)
+
+    assert q.dropped + q.spilled == 99
+    assert q.dropped
+    assert spill.get_size() <= 1024
+
+    q.flush_spill()
+    assert spill.path.stat().st_size == spill.get_size()
+
+
+def test_spill_order(tmp_path: Path) -> None:
+    spill = SpillFile(tmp_path / 'spill.json', 1024)
+    q = PublishQueue(2, spill=spill)
+
+    fill(q, ('a', 1, 1, False), ('b', 1, 1, False), ('c', 1, 1, False), ('d', 1, 1, False))
+    assert q.spilled == 2
+    assert get_batch(q) == [('c', 1, 1, False), ('d', 1, 1, False)]
+    fill(q, ('e', 1, 1, False))
+
+    # only as many messages as fit are loaded and they are published before the newer messages
+    assert q.load_spilled() == 1
+    assert get_batch(q) == [('a', 1, 1, False), ('e', 1, 1, False)]
+    assert q.load_spilled() == 1
+    assert get_batch(q) == [('b', 1, 1, False)]
+    assert not spill.path.is_file()
+    assert not spill.get_size()
+
+
+def test_spill_read_chunks(tmp_path: Path) -> None:
+    spill = SpillFile(tmp_path / 'spill.json', 1024)
+    assert spill.write(('topic', i, 1, False, 0) for i in range(10)) == 10
+    size = spill.path.stat().st_size
+
+    # the file is not rewritten for every read
+    assert [item[1] for item in spill.read(2)] == [0, 1]
+    assert spill.path.stat().st_size == size
+    assert spill.get_size() == size * 8 // 10
+
+    # it is compacted when the read items take more space than the unread ones
+    assert [item[1] for item in spill.read(3)] == [2, 3, 4]
+    assert spill.path.stat().st_size == spill.get_size() == size // 2
+
+    # new items are appended
+    spill.write([('topic', 10, 1, False, 0)])
+    assert [item[1] for item in spill.read()] == [5, 6, 7, 8, 9, 10]
+    assert not spill.path.is_file()
+    assert not spill.get_size()
+
+
+def test_spill_pending_compact(tmp_path: Path) -> None:
+    spill = SpillFile(tmp_path / 'spill.json', 1024)
+    spill.write(('topic', i, 1, False, 0) for i in range(10))
+    spill.read(1)
+
+    # the items which were already read are not stored again
+    q = PublishQueue(2, spill=spill)
+    q.spill_pending()
+    assert [item[1] for item in SpillFile(spill.path, 1024).read()] == list(range(1, 10))
+
+
+def test_spill_keep_latest(tmp_path: Path) -> None:
+    spill = SpillFile(tmp_path / 'spill.json', 1024)
+    q = PublishQueue(3, 'keep latest per topic', spill=spill)
+
+    fill(q, ('a', 1, 1, False), ('b', 1, 1, False), ('c', 1, 1, False), ('d', 1, 1, False), ('e', 1, 1, False))
+    assert q.spilled == 2
+    get_batch(q)
+    fill(q, ('a', 2, 1, False))
+
+    # the queued value is newer than the spilled one
+    assert q.load_spilled() == 1
+    assert get_batch(q) == [('b', 1, 1, False), ('a', 2, 1, False)]
+
+
+@pytest.fixture
+def diagnostics(monkeypatch):
+    monkeypatch.setattr(diagnostics_module, 'DIAGNOSTICS', {})
+
+
+def test_diagnostics(no_mqtt, diagnostics) -> None:
+    register_diagnostics('test', lambda: {'a': 1, 'b': 2.5})
+    with pytest.raises(ValueError, match='Diagnostics for "test" already registered'):
+        register_diagnostics('test', dict)
+
+    parent = MqttObj('diagnostics', 0, False).update()
+    topics = {}
+    publish_diagnostics(parent, topics)
+    publish_diagnostics(parent, topics)
+
+    assert len(topics) == 2
+    assert no_mqtt == [
+        ('diagnostics/test/a', b'1', 0, False), ('diagnostics/test/b', b'2.5', 0, False),
+        ('diagnostics/test/a', b'1', 0, False), ('diagnostics/test/b', b'2.5', 0, False),
+    ]
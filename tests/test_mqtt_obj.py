@@ -1,6 +1,7 @@
 import pytest
 
 from sml2mqtt.mqtt import MqttObj, check_for_duplicate_topics
+from sml2mqtt.mqtt.mqtt_obj import encode_payload
 
 
 def test_topmost(monkeypatch) -> None:
@@ -63,3 +64,29 @@ def test_check_for_duplicate_messages(caplog) -> None:
     msg = '\n'.join(x.msg for x in caplog.records)
 
     assert msg == 'Topic "base/child" is already configured!'
+
+
+@pytest.mark.parametrize(('value', 'payload'), [
+    (1, b'1'), (-15, b'-15'), (1.5, b'1.5'), (253917.7, b'253917.7'), ('ON', b'ON'), (True, b'True'), (b'\x01', b'\x01')
+])
+def test_encode_payload(value, payload) -> None:
+    assert encode_payload(value) == payload
+
+
+def test_publish_payload_cache(no_mqtt) -> None:
+    obj = MqttObj('topic', 0, False).update()
+
+    obj.publish(1)
+    payload = obj._payload
+    obj.publish(1)
+    assert obj._payload is payload
+
+    # same value but different type must result in a different payload
+    obj.publish(1.0)
+    obj.publish(True)
+    obj.publish('1')
+
+    assert no_mqtt == [
+        ('topic', b'1', 0, False), ('topic', b'1', 0, False), ('topic', b'1.0', 0, False),
+        ('topic', b'True', 0, False), ('topic', b'1', 0, False),
+    ]
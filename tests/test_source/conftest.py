@@ -9,6 +9,7 @@ class DeviceMock(DeviceProto):
 
     def __init__(self) -> None:
         self.on_source_data = Mock()
+        self.on_source_unchanged = Mock()
         self.on_source_failed = Mock()
         self.on_error = Mock()
 
@@ -21,6 +22,7 @@ class DeviceMock(DeviceProto):
 def device_mock() -> DeviceMock:
     m = DeviceMock()
     m.on_source_data.assert_not_called()
+    m.on_source_unchanged.assert_not_called()
     m.on_source_failed.assert_not_called()
     m.on_error.assert_not_called()
 
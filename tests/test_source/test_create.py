@@ -1,8 +1,9 @@
 from aiohttp import BasicAuth
 
-from sml2mqtt.config.inputs import HttpSourceSettings
+from sml2mqtt.config.inputs import HttpSourceSettings, TcpSourceSettings
 from sml2mqtt.sml_source import create_source
 from sml2mqtt.sml_source.http import HttpSource
+from sml2mqtt.sml_source.tcp import TcpSource
 
 
 async def test_create_http_no_auth(device_mock) -> None:
@@ -31,3 +32,20 @@ async def test_create_http_auth(device_mock) -> None:
     device_mock.on_source_data.assert_not_called()
     device_mock.on_source_failed.assert_not_called()
     device_mock.on_error.assert_not_called()
+
+
+async def test_create_tcp(device_mock) -> None:
+    cfg = TcpSourceSettings(type='tcp', host='localhost', port=2001, timeout=9)
+    assert cfg.get_device_name() == 'localhost:2001'
+
+    obj = await create_source(device_mock, cfg)
+
+    assert isinstance(obj, TcpSource)
+    assert obj.host == 'localhost'
+    assert obj.port == 2001
+    assert obj.connect_timeout == 9
+    assert obj.delay.max == 60
+
+    device_mock.on_source_data.assert_not_called()
+    device_mock.on_source_failed.assert_not_called()
+    device_mock.on_error.assert_not_called()
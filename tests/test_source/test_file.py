@@ -0,0 +1,52 @@
+from time import monotonic
+
+from sml2mqtt.config.inputs import FileSourceSettings
+from sml2mqtt.sml_source import create_source
+from sml2mqtt.sml_source.file import FileSource, read_sml_file
+
+
+async def test_create_file(device_mock, sml_data_1, tmp_path) -> None:
+    file = tmp_path / 'meter.hex'
+    file.write_text(sml_data_1.hex(' ', 16).replace(' ', '\n', 3))
+
+    cfg = FileSourceSettings(type='file', path=str(file), format='hex', speed=0, **{'chunk size': 100})
+    assert cfg.get_device_name() == 'meter'
+
+    obj = await create_source(device_mock, cfg)
+    assert isinstance(obj, FileSource)
+    assert obj.data == sml_data_1
+    assert obj.name == 'meter.hex'
+    assert obj.chunk_size == 100
+
+    device_mock.on_source_data.assert_not_called()
+
+
+def test_read_binary(sml_data_1, tmp_path) -> None:
+    file = tmp_path / 'meter.bin'
+    file.write_bytes(sml_data_1)
+    assert read_sml_file(file, 'binary') == sml_data_1
+
+
+async def test_replay(device_mock, sml_data_1) -> None:
+    source = FileSource(device_mock, sml_data_1, name='test', speed=0, chunk_size=100, repeat=2)
+    source.start()
+    await source._task._task
+
+    chunks = [c.args[0] for c in device_mock.on_source_data.call_args_list]
+    assert all(len(c) <= 100 for c in chunks)
+    assert b''.join(chunks) == sml_data_1 * 2
+
+    device_mock.on_source_failed.assert_called_once_with('Replay of test finished')
+    device_mock.on_error.assert_not_called()
+
+
+async def test_replay_speed(device_mock, sml_data_1) -> None:
+    source = FileSource(device_mock, sml_data_1, name='test', speed=10, interval=0.2, chunk_size=50)
+
+    start = monotonic()
+    source.start()
+    await source._task._task
+
+    # 8 chunks with 0.2s / 10 each
+    assert device_mock.on_source_data.call_count == 8
+    assert monotonic() - start >= 0.16
@@ -1,13 +1,16 @@
 import sys
-from asyncio import TimeoutError
+from asyncio import TimeoutError, sleep
+from math import floor, inf
+from unittest.mock import Mock
 
 import pytest
-from aiohttp import ClientTimeout
+from aiohttp import ClientTimeout, hdrs, web
 from aioresponses import aioresponses
+from multidict import CIMultiDict
 from tests.helper import wait_for_call
 
 from sml2mqtt.errors import HttpStatusError
-from sml2mqtt.sml_source.http import HttpSource, close_session
+from sml2mqtt.sml_source.http import HttpSource, PollRequest, PollTiming, close_session, get_conditional_headers
 
 
 @pytest.fixture
@@ -99,3 +102,180 @@ async def test_timeout(device_mock, source) -> None:
     device_mock.on_error.assert_called_once_with(e, show_traceback=False)
 
     await close_session()
+
+
+@pytest.fixture
+async def server(sml_data_1):
+    requests = []
+
+    async def handle(request: web.Request) -> web.Response:
+        requests.append(request.headers.get(hdrs.IF_NONE_MATCH))
+        if request.headers.get(hdrs.IF_NONE_MATCH) == '"1"':
+            return web.Response(status=304)
+        return web.Response(body=sml_data_1, headers={hdrs.ETAG: '"1"'})
+
+    app = web.Application()
+    app.router.add_get('/', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+
+    yield f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]:d}/', requests
+
+    await runner.cleanup()
+    await close_session()
+
+
+@pytest.mark.parametrize('skip_unchanged', [True, False])
+async def test_conditional(sml_data_1, device_mock, server, skip_unchanged) -> None:
+    url, requests = server
+    source = HttpSource(device_mock, url, interval=0.020, auth=None, timeout=ClientTimeout(0.5),
+                        skip_unchanged=skip_unchanged)
+
+    source.start()
+    try:
+        while len(requests) < 3:
+            await sleep(0.01)
+    finally:
+        await source.cancel_and_wait()
+
+    if skip_unchanged:
+        assert requests[:3] == [None, '"1"', '"1"']
+        device_mock.on_source_data.assert_called_once_with(sml_data_1)
+        assert device_mock.on_source_unchanged.call_count >= 2
+    else:
+        assert requests[:3] == [None, None, None]
+        assert device_mock.on_source_data.call_count >= 3
+        device_mock.on_source_unchanged.assert_not_called()
+
+
+def test_conditional_headers() -> None:
+    def get_headers(**kwargs: str) -> dict[str, str]:
+        return get_conditional_headers(Mock(headers=CIMultiDict({k.replace('_', '-'): v for k, v in kwargs.items()})))
+
+    assert get_headers() == {}
+    assert get_headers(ETag='"abc"', Last_Modified='Mon, 19 Oct 2026 10:00:00 GMT') == {hdrs.IF_NONE_MATCH: '"abc"'}
+
+    # Last-Modified can only be used if it's at least one second older than the response
+    modified = 'Mon, 19 Oct 2026 10:00:00 GMT'
+    assert get_headers(Last_Modified=modified) == {}
+    assert get_headers(Last_Modified=modified, Date=modified) == {}
+    assert get_headers(Last_Modified=modified, Date='Mon, 19 Oct 2026 10:00:01 GMT') == {
+        hdrs.IF_MODIFIED_SINCE: modified}
+    assert get_headers(Last_Modified='invalid', Date='Mon, 19 Oct 2026 10:00:01 GMT') == {}
+
+
+def poll_gateway(timing: PollTiming, period: float, duration: float, *,
+                 stop: float = inf) -> tuple[int, int, list[float], list[float]]:
+    """Poll a simulated gateway which has new data every period until stop.
+    Returns the requests, the updates, the staleness of the new data and the delays."""
+    requests = 0
+    staleness = []
+    delays = []
+    seen = -1
+    now = 0.
+    while now < duration:
+        requests += 1
+        latest = floor((min(now, stop) - 0.3) / period)
+        if changed := latest > seen:
+            staleness.append(now - (0.3 + latest * period))
+            seen = latest
+
+        timing.on_response(now, changed=changed)
+        delays.append(delay := timing.get_delay(now))
+        now += delay
+    return requests, seen + 1, staleness, delays
+
+
+def test_timing_fixed() -> None:
+    timing = PollTiming(2, 5)
+    assert timing.get_delay(0) == 2
+
+    # the period is only known after a change which follows an unchanged response
+    timing.on_response(0, changed=True)
+    assert timing.get_delay(0) == 2
+    timing.on_response(2, changed=False)
+    assert timing.get_delay(2) == 2
+    assert timing.period is None
+
+    timing.on_response(4, changed=True)
+    assert timing.period == 4
+    # middle of the window (2, 4] of the last update moved by one period
+    assert timing.get_delay(4) == 3
+    assert timing._request is PollRequest.SEARCH
+
+
+def test_timing_fixed_halving() -> None:
+    # the data changes with every request, so the gateway might update faster than the interval
+    timing = PollTiming(2, 5)
+    for now in (0, 2, 4):
+        timing.on_response(now, changed=True)
+    assert timing.get_delay(4) == 0.5
+    assert timing._request is PollRequest.FIXED
+    assert timing.period is None
+
+
+def test_timing_always_changed() -> None:
+    # e.g. the response contains a timestamp, so the period can never be learned
+    timing = PollTiming(2, 3)
+    delays = []
+    now = 0.
+    for _ in range(20):
+        timing.on_response(now, changed=True)
+        delays.append(delay := timing.get_delay(now))
+        now += delay
+
+    assert timing.period is None
+    assert delays[:3] == [2, 1, 0.5]
+    assert min(delays) == 0.5
+    # the configured interval is used once it's clear that the period can't be learned
+    assert delays[-5:] == [2] * 5
+    assert sum(delays) / len(delays) > 1
+
+
+@pytest.mark.parametrize(('period', 'interval', 'max_requests'), [(1, 1, 1.3), (2, 1, 1.3), (5, 2, 2.3)])
+def test_timing_converges(period: float, interval: float, max_requests: float) -> None:
+    timing = PollTiming(interval, 3)
+    requests, updates, staleness, _ = poll_gateway(timing, period, 1_000)
+
+    assert timing.period == pytest.approx(period, rel=0.01)
+    assert requests / updates < max_requests
+    # after the learning phase the data is requested shortly after the update
+    assert max(staleness[-100:]) < 0.2 * period
+
+
+def test_timing_skip() -> None:
+    # the gateway updates faster than the interval: only every second update is requested
+    timing = PollTiming(2, 5)
+    requests, updates, staleness, _ = poll_gateway(timing, 1, 1_000)
+
+    assert timing.period == pytest.approx(1, rel=0.01)
+    assert requests / updates < 0.7
+    assert max(staleness[-100:]) < 0.2
+
+
+def test_timing_keep_alive() -> None:
+    # the gateway updates slower than the watchdog allows
+    timing = PollTiming(1, 3)
+    *_, delays = poll_gateway(timing, 10, 200)
+
+    assert timing.period == pytest.approx(10, rel=0.01)
+    assert max(delays) == 3
+
+
+def test_timing_late() -> None:
+    timing = PollTiming(1, 3)
+    *_, delays = poll_gateway(timing, 1, 60, stop=50)
+    assert timing.period == pytest.approx(1, rel=0.01)
+    assert timing._request is PollRequest.LATE
+
+    # the gateway stopped: the delay increases but never exceeds the interval
+    late = delays[-8:]
+    assert late == sorted(late)
+    assert late[-1] == 1
+
+    # the first new data stops the back off
+    timing.on_response(60, changed=True)
+    timing.get_delay(60)
+    assert timing._request is not PollRequest.LATE
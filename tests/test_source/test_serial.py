@@ -0,0 +1,131 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from sml2mqtt.const import SML_END, SML_ESCAPE, SML_START
+from sml2mqtt.sml_source.serial import ReadTiming, SerialSource, find_frame_end, find_frame_start, get_byte_time
+
+
+BYTE_TIME = 10 / 9600
+
+
+def test_byte_time() -> None:
+    assert get_byte_time(9600, 8, 'N', 1) == BYTE_TIME
+    assert get_byte_time(9600, 8, 'E', 2) == 12 / 9600
+    assert get_byte_time(115200, 7, 'N', 1.5) == 9.5 / 115200
+
+
+def test_read_size() -> None:
+    assert ReadTiming(BYTE_TIME).get_read_size() == 10_240
+    assert ReadTiming(get_byte_time(921600, 8, 'N', 1)).get_read_size() == 184_320
+
+
+def test_find_frame_end(sml_data_1) -> None:
+    assert find_frame_end(sml_data_1, 0) == 352
+    assert find_frame_end(sml_data_1 * 2 + sml_data_1[:100], 0) == 704
+    assert find_frame_end(sml_data_1 * 2 + sml_data_1[:100], 400) == 704
+
+    # padding and crc are missing
+    assert find_frame_end(sml_data_1[:-1], 0) == -1
+    assert find_frame_end(sml_data_1 + sml_data_1[:-1], 0) == 352
+    # end is before start
+    assert find_frame_end(sml_data_1, 345) == -1
+
+    # escaped escape sequence
+    assert find_frame_end(SML_ESCAPE * 2 + SML_END[4:] + b'\x00\x00\x00', 0) == -1
+    assert find_frame_end(SML_END + b'\x00\x00\x00', 0) == 8
+
+
+def test_find_frame_start(sml_data_1) -> None:
+    assert find_frame_start(sml_data_1, 352) == 0
+    assert find_frame_start(sml_data_1 * 2, 704) == 352
+    assert find_frame_start(b'\x00' * 10 + sml_data_1, 362) == 10
+    assert find_frame_start(sml_data_1[8:], 344) == -1
+
+    # escaped escape sequence followed by 0x01010101 is no start
+    assert find_frame_start(SML_ESCAPE + SML_START, 12) == -1
+    assert find_frame_start(SML_START + SML_ESCAPE + SML_START, 20) == 0
+
+
+def test_timing() -> None:
+    t = ReadTiming(BYTE_TIME)
+    assert t.get_pause(0, 0) == ReadTiming.DEFAULT_PAUSE
+    assert t.get_pause(0, 100) == ReadTiming.DEFAULT_PAUSE
+
+    # first frame: size is learned
+    t.on_frame(352, 0.4)
+    assert t.frame_size == 352
+    assert t.frame_period is None
+    assert t.get_pause(0.4, 0) == ReadTiming.DEFAULT_PAUSE
+
+    # pause until the rest of the frame is transferred
+    assert t.get_pause(1.1, 52) == pytest.approx(300 * BYTE_TIME)
+    assert t.get_pause(1.1, 400) == ReadTiming.MIN_PAUSE
+
+    # second frame: period is learned
+    t.on_frame(352, 1.4)
+    assert t.frame_period == pytest.approx(1)
+    t.on_frame(352, 2.6)
+    assert t.frame_period == pytest.approx(1.05)
+
+    # resume shortly before the start of the next frame
+    assert t.get_pause(2.6, 0) == pytest.approx(1.05 - 352 * BYTE_TIME - 0.105)
+    assert t.get_pause(3.6, 0) == ReadTiming.MIN_PAUSE
+    assert repr(t) == '<ReadTiming byte_time=1.042ms frame_size=352 frame_period=1.050s>'
+
+
+async def test_serial_source(device_mock, sml_data_1) -> None:
+    source = SerialSource(device_mock, 'COM1', BYTE_TIME)
+    source.connection_made(transport := Mock())
+    assert transport._max_read_size == 10_240
+    source.start()
+
+    source.data_received(sml_data_1[:100])
+    transport.pause_reading.assert_called_once()
+    device_mock.on_source_data.assert_not_called()
+
+    await asyncio.sleep(ReadTiming.DEFAULT_PAUSE - 0.05)
+    transport.resume_reading.assert_not_called()
+    await asyncio.sleep(0.1)
+    transport.resume_reading.assert_called_once()
+
+    # the frame size is known -> pause only until the rest of the frame is transferred
+    source.data_received(sml_data_1[100:])
+    device_mock.on_source_data.assert_called_once_with(sml_data_1)
+    source.data_received(sml_data_1[:52])
+    await asyncio.sleep(300 * BYTE_TIME + 0.05)
+    assert transport.resume_reading.call_count == 2
+    device_mock.on_source_data.assert_called_once()
+
+    await source.cancel_and_wait()
+
+
+def test_serial_source_frames(device_mock, sml_data_1) -> None:
+    source = SerialSource(device_mock, 'COM1', BYTE_TIME)
+    source.connection_made(Mock())
+
+    # data is passed on only up to the end of the last complete frame
+    source.data_received(b'\x00' * 10 + sml_data_1 * 2 + sml_data_1[:100])
+    device_mock.on_source_data.assert_called_once_with(b'\x00' * 10 + sml_data_1 * 2)
+    # only the size of the last frame is learned
+    assert source.timing.frame_size == len(sml_data_1)
+
+    # the end sequence is split across the chunks
+    for pos in range(100, len(sml_data_1), 3):
+        source.data_received(sml_data_1[pos: pos + 3])
+    assert device_mock.on_source_data.call_count == 2
+    device_mock.on_source_data.assert_called_with(sml_data_1)
+
+
+def test_serial_source_no_frame(monkeypatch, device_mock) -> None:
+    source = SerialSource(device_mock, 'COM1', BYTE_TIME)
+    monkeypatch.setattr(source, 'max_buffer', 1000)
+    source.connection_made(Mock())
+
+    # if there is no end of a frame the data is passed on when the buffer is full
+    for _ in range(9):
+        source.data_received(b'\x00' * 100)
+    device_mock.on_source_data.assert_not_called()
+    source.data_received(b'\x00' * 100)
+    device_mock.on_source_data.assert_called_once_with(b'\x00' * 1000)
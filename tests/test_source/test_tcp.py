@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from sml2mqtt.sml_source.tcp import TcpSource
+
+
+@pytest.fixture
+async def server(sml_data_1):
+    connections = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connections.append(writer)
+        # the bridge passes the data in chunks
+        for pos in range(0, len(sml_data_1), 100):
+            writer.write(sml_data_1[pos: pos + 100])
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        writer.close()
+
+    srv = await asyncio.start_server(handle, '127.0.0.1', 0)
+    yield srv.sockets[0].getsockname()[1], connections
+
+    srv.close()
+    await srv.wait_closed()
+
+
+async def test_tcp(device_mock, server, sml_data_1) -> None:
+    port, connections = server
+    source = TcpSource(device_mock, '127.0.0.1', port)
+    assert repr(source) == f'<TcpSource 127.0.0.1:{port:d}>'
+
+    source.start()
+    try:
+        # the connection is closed by the server and reestablished without delay
+        while len(connections) < 2:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+    finally:
+        await source.cancel_and_wait()
+
+    data = b''.join(call.args[0] for call in device_mock.on_source_data.call_args_list)
+    assert data.startswith(sml_data_1 * 2)
+    assert device_mock.on_source_data.call_args_list[0].args[0] == sml_data_1[:100]
+
+    device_mock.on_source_failed.assert_not_called()
+    device_mock.on_error.assert_not_called()
+
+
+@pytest.mark.ignore_log_warnings
+async def test_reconnect(device_mock) -> None:
+    # get a free port where nobody listens
+    srv = await asyncio.start_server(lambda r, w: None, '127.0.0.1', 0)
+    port = srv.sockets[0].getsockname()[1]
+    srv.close()
+    await srv.wait_closed()
+
+    source = TcpSource(device_mock, '127.0.0.1', port, max_delay=4)
+    source.start()
+    try:
+        await asyncio.sleep(0.1)
+        assert source.delay.curr == 1
+        await asyncio.sleep(1)
+        assert source.delay.curr == 2
+    finally:
+        await source.cancel_and_wait()
+
+    device_mock.on_source_data.assert_not_called()
+    device_mock.on_source_failed.assert_not_called()
+    device_mock.on_error.assert_not_called()
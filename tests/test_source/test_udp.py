@@ -0,0 +1,74 @@
+import asyncio
+import socket
+
+import pytest
+from tests.test_source.conftest import DeviceMock
+
+from sml2mqtt.config.inputs import UdpSourceSettings
+from sml2mqtt.sml_source import create_source
+from sml2mqtt.sml_source.udp import ENDPOINTS, UdpSource
+
+
+@pytest.fixture
+def port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def test_udp(port, sml_data_1) -> None:
+    device_a, device_b, device_c = DeviceMock(), DeviceMock(), DeviceMock()
+
+    source_a = await create_source(device_a, UdpSourceSettings(type='udp', port=port, sender='127.0.0.1'))
+    assert isinstance(source_a, UdpSource)
+    endpoint = source_a.endpoint
+    assert repr(source_a) == f'<UdpSource 127.0.0.1 on 0.0.0.0:{port:d}>'
+
+    source_b = UdpSource(device_b, endpoint, prefix=b'\x01')
+    source_c = UdpSource(device_c, endpoint, prefix=b'\x02\x03')
+    assert len(endpoint) == 3
+
+    # the data is passed by sender
+    endpoint.datagram_received(sml_data_1, ('127.0.0.1', 40000))
+    device_a.on_source_data.assert_called_once_with(sml_data_1)
+
+    # the data is passed by prefix, the prefix is removed
+    endpoint.datagram_received(b'\x02\x03' + sml_data_1, ('192.168.1.5', 40000))
+    device_c.on_source_data.assert_called_once_with(sml_data_1)
+    endpoint.datagram_received(b'\x01' + sml_data_1, ('192.168.1.5', 40000))
+    device_b.on_source_data.assert_called_once_with(sml_data_1)
+
+    # unknown packets are ignored
+    endpoint.datagram_received(b'\x02\x04' + sml_data_1, ('192.168.1.6', 40000))
+    assert endpoint.unknown == 1
+    for device in (device_a, device_b, device_c):
+        device.on_source_data.assert_called_once()
+
+    # the prefix or sender can only be used once
+    with pytest.raises(ValueError, match=f'Prefix 01 is already used on 0.0.0.0:{port:d}'):
+        UdpSource(DeviceMock(), endpoint, prefix=b'\x01')
+    with pytest.raises(ValueError, match=f'Sender 127.0.0.1 is already used on 0.0.0.0:{port:d}'):
+        UdpSource(DeviceMock(), endpoint, sender='127.0.0.1')
+
+    # the last source closes the socket
+    for source in (source_a, source_b):
+        await source.cancel_and_wait()
+    assert ENDPOINTS
+    await source_c.cancel_and_wait()
+    assert not ENDPOINTS
+    await asyncio.sleep(0)
+    assert endpoint.transport is None
+
+
+async def test_udp_socket(port, device_mock, sml_data_1) -> None:
+    source = await create_source(device_mock, UdpSourceSettings(type='udp', port=port, prefix='aa', bind='127.0.0.1'))
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.sendto(b'\xaa' + sml_data_1, ('127.0.0.1', port))
+        for _ in range(100):
+            if device_mock.on_source_data.called:
+                break
+            await asyncio.sleep(0.01)
+
+    device_mock.on_source_data.assert_called_once_with(sml_data_1)
+    await source.cancel_and_wait()
@@ -0,0 +1,108 @@
+import asyncio
+from queue import SimpleQueue
+
+import pytest
+
+import sml2mqtt
+from sml2mqtt.__args__ import CMD_ARGS
+from sml2mqtt.config.inputs import FileSourceSettings, UdpSourceSettings
+from sml2mqtt.workers import WorkerGroup, get_input_groups, get_shards
+from sml2mqtt.workers.worker import PublishForwarder, setup_worker_mqtt
+
+
+def test_shards() -> None:
+    assert get_shards(5, 2) == [[0, 2, 4], [1, 3]]
+    assert get_shards(2, 4) == [[0], [1]]
+    assert get_shards(3, 1) == [[0, 1, 2]]
+
+    # inputs of a group are on the same worker
+    assert get_shards(5, 2, [[1, 3]]) == [[0, 2], [1, 3, 4]]
+    assert get_shards(5, 2, [[0, 4], [1, 3]]) == [[0, 2, 4], [1, 3]]
+    assert get_shards(3, 4, [[0, 1, 2]]) == [[0, 1, 2]]
+
+
+def test_input_groups() -> None:
+    inputs = [
+        UdpSourceSettings(type='udp', port=5000, sender='192.168.1.1'),
+        FileSourceSettings(type='file', path='a.bin'),
+        UdpSourceSettings(type='udp', port=5001, sender='192.168.1.2'),
+        UdpSourceSettings(type='udp', port=5000, prefix='01'),
+    ]
+    assert get_input_groups(inputs) == [[0, 3]]
+
+
+async def test_publish_forwarder() -> None:
+    queue = SimpleQueue()
+    forwarder = PublishForwarder(queue)
+
+    forwarder.publish('a', b'1', 0, False)
+    forwarder.publish('b', b'2', 1, True)
+    assert queue.empty()
+
+    await asyncio.sleep(0)
+    assert queue.get_nowait() == [('a', b'1', 0, False), ('b', b'2', 1, True)]
+
+    forwarder.publish('c', b'3', 0, False)
+    await asyncio.sleep(0)
+    assert queue.get_nowait() == [('c', b'3', 0, False)]
+
+
+def test_setup_worker_mqtt(monkeypatch) -> None:
+    mqtt_cfg = sml2mqtt.config.CONFIG.mqtt
+    monkeypatch.setattr(mqtt_cfg.connection, 'identifier', 'sml2mqtt')
+    monkeypatch.setattr(mqtt_cfg.last_will, 'topic', 'status')
+    monkeypatch.setattr(mqtt_cfg.last_will, 'full_topic', None)
+
+    setup_worker_mqtt(1)
+    assert mqtt_cfg.connection.identifier == 'sml2mqtt-1'
+    assert mqtt_cfg.last_will.topic == 'status/worker_1'
+
+    monkeypatch.setattr(mqtt_cfg.last_will, 'full_topic', 'my/status')
+    setup_worker_mqtt(2)
+    assert mqtt_cfg.last_will.full_topic == 'my/status/worker_2'
+
+
+@pytest.mark.ignore_log_errors
+@pytest.mark.ignore_log_warnings
+async def test_worker_group(monkeypatch, caplog, tmp_path, sml_data_1) -> None:
+    for name in ('meter_a', 'meter_b'):
+        (tmp_path / f'{name:s}.bin').write_bytes(sml_data_1)
+
+    config = tmp_path / 'config.yml'
+    config.write_text(
+        'logging:\n'
+        '  level: DEBUG\n'
+        '  file: stdout\n'
+        'inputs:\n'
+        '  - type: file\n'
+        '    path: meter_a.bin\n'
+        '    speed: 0\n'
+        '  - type: file\n'
+        '    path: meter_b.bin\n'
+        '    speed: 0\n'
+    )
+    monkeypatch.setattr(CMD_ARGS, 'config', config)
+
+    published = []
+    monkeypatch.setattr(sml2mqtt.mqtt, 'publish', lambda *args: published.append(args))
+
+    group = WorkerGroup(2, shared_mqtt=True)
+    group.start(2)
+    try:
+        for _ in range(200):
+            if not any(p.is_alive() for p in group._processes):
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await group.cancel_and_wait()
+
+    assert [p.exitcode for p in group._processes] == [0, 0]
+
+    # both devices publish the values of the frame and their status
+    assert ('sml2mqtt/00000000000000000000/0100010800ff', b'450.09189911', 0, False) in published
+    assert sum(1 for topic, *_ in published if topic == 'sml2mqtt/00000000000000000000/status') == 4
+
+    # log entries of the workers are written in the main process
+    msgs = [r.getMessage() for r in caplog.records]
+    assert 'Source failed: Replay of meter_a.bin finished' in msgs
+    assert 'Source failed: Replay of meter_b.bin finished' in msgs